@@ -0,0 +1,13 @@
+"""Benchmark module.
+
+A reproducible rendering benchmark suite, to measure performance changes against a
+    baseline. Run it with `joop bench` (see `joop.cli`).
+
+Modules:
+    runner: Time scenarios, and report ops/sec, latency percentiles and peak memory.
+    scenarios: The benchmarked scenarios, from trivial components to Flask requests.
+
+"""
+
+from joop.bench.runner import BenchResult, run_scenario, write_results
+from joop.bench.scenarios import SCENARIOS, build_scenarios
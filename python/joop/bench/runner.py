@@ -0,0 +1,179 @@
+"""Benchmark runner for joop.
+
+Times a scenario (a callable performing one operation, ex. one render) and reports its
+    throughput, latency distribution and peak memory.
+
+Latencies are measured one operation at a time with `time.perf_counter_ns`, after a
+    warmup. Peak memory is measured in a separate pass under `tracemalloc`, so its
+    overhead does not skew the timings.
+
+Classes:
+    BenchResult:
+        The measurements of one scenario.
+
+Functions:
+    percentile(sorted_values, fraction) -> float:
+        Returns a percentile of sorted values (nearest rank).
+
+    run_scenario(name, operation, iterations=1000, warmup=100, memory_iterations=10) -> BenchResult:
+        Benchmarks one scenario.
+
+    write_results(path, results, parameters=None):
+        Writes results and their environment to a JSON file.
+
+"""
+
+import gc
+import json
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Iterable, Optional
+
+import joop
+
+class BenchResult:
+    """
+    The measurements of one scenario.
+
+    Attributes:
+        name (str): The scenario name.
+        iterations (int): The number of timed operations.
+        total_time (float): The total time of the timed operations, in seconds.
+        ops_per_sec (float): The throughput.
+        latencies (dict[str, float]): The latency statistics in seconds: min, mean,
+            p50, p90, p99 and max.
+        peak_memory (int): The peak memory allocated during one operation, in bytes.
+    """
+
+    def __init__(self, name: str, latencies: list[float], peak_memory: int):
+        """
+        Summarize the measurements of a scenario.
+
+        Args:
+            name (str): The scenario name.
+            latencies (list[float]): The latency of each timed operation, in seconds.
+            peak_memory (int): The peak memory allocated during one operation, in bytes.
+        """
+        _sorted = sorted(latencies)
+        self.name = name
+        self.iterations = len(_sorted)
+        self.total_time = sum(_sorted)
+        self.ops_per_sec = self.iterations / self.total_time if self.total_time else math.inf
+        self.latencies = {
+            'min': _sorted[0],
+            'mean': self.total_time / self.iterations,
+            'p50': percentile(_sorted, 0.50),
+            'p90': percentile(_sorted, 0.90),
+            'p99': percentile(_sorted, 0.99),
+            'max': _sorted[-1],
+        }
+        self.peak_memory = peak_memory
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the result to a JSON-serializable dictionary.
+
+        Returns:
+            dict[str, Any]: The measurements.
+        """
+        return {
+            'name': self.name,
+            'iterations': self.iterations,
+            'total_time': self.total_time,
+            'ops_per_sec': self.ops_per_sec,
+            'latencies': dict(self.latencies),
+            'peak_memory': self.peak_memory,
+        }
+
+    def format(self) -> str:
+        """
+        Format the result as one line of a report.
+
+        Returns:
+            str: The scenario name, throughput, latency percentiles and peak memory.
+        """
+        _us = {_key: _value * 1e6 for _key, _value in self.latencies.items()}
+        return (f"{self.name:<24} {self.ops_per_sec:>12,.1f} ops/s"
+                f"  p50 {_us['p50']:>10,.1f}us  p90 {_us['p90']:>10,.1f}us"
+                f"  p99 {_us['p99']:>10,.1f}us  peak {self.peak_memory / 1024:>10,.1f}KiB")
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    """
+    Return a percentile of sorted values, using the nearest-rank method.
+
+    Args:
+        sorted_values (list[float]): The values, sorted in ascending order.
+        fraction (float): The percentile, between 0 and 1.
+
+    Returns:
+        float: The smallest value with at least `fraction` of the values at or below it.
+    """
+    _rank = max(math.ceil(fraction * len(sorted_values)), 1)
+    return sorted_values[_rank - 1]
+
+def run_scenario(name: str, operation: Callable[[], Any],
+                 iterations: int = 1000, warmup: int = 100,
+                 memory_iterations: int = 10) -> BenchResult:
+    """
+    Benchmark one scenario.
+
+    Args:
+        name (str): The scenario name.
+        operation (Callable[[], Any]): Performs one operation.
+        iterations (int): The number of timed operations.
+        warmup (int): The number of untimed operations run first.
+        memory_iterations (int): The number of operations run under `tracemalloc`.
+
+    Returns:
+        BenchResult: The measurements.
+    """
+    for _ in range(warmup):
+        operation()
+    gc.collect()
+    _latencies = []
+    _clock = time.perf_counter_ns
+    for _ in range(max(iterations, 1)):
+        _start = _clock()
+        operation()
+        _latencies.append((_clock() - _start) / 1e9)
+
+    _peak = 0
+    _was_tracing = tracemalloc.is_tracing()
+    if not _was_tracing:
+        tracemalloc.start()
+    try:
+        for _ in range(max(memory_iterations, 1)):
+            tracemalloc.reset_peak()
+            _baseline = tracemalloc.get_traced_memory()[0]
+            operation()
+            _peak = max(_peak, tracemalloc.get_traced_memory()[1] - _baseline)
+    finally:
+        if not _was_tracing:
+            tracemalloc.stop()
+    return BenchResult(name, _latencies, _peak)
+
+def write_results(path: str, results: Iterable[BenchResult],
+                  parameters: Optional[dict[str, Any]] = None):
+    """
+    Write results and their environment to a JSON file.
+
+    Args:
+        path (str): The file to write.
+        results (Iterable[BenchResult]): The results.
+        parameters (Optional[dict[str, Any]]): The benchmark parameters, ex. tree depth.
+    """
+    _document = {
+        'joop_version': joop.__version__,
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'parameters': parameters or {},
+        'results': [_result.to_dict() for _result in results],
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(_document, f, indent=2)
@@ -0,0 +1,218 @@
+"""Benchmark scenarios for joop.
+
+Each scenario is a callable performing one operation, built once up front so that only
+    the operation itself is measured.
+
+Scenarios:
+    hello_world: Renders the trivial `HelloWorld` component.
+    hello_name: Renders the parameterised `HelloName` component.
+    nested_tree: Renders a tree of nested components of configurable depth and fan-out.
+    alpine_table: Renders an `AlpineTableComponent` table of N rows and M columns.
+    flask_view: Dispatches a `View` request through the Flask test client
+        (skipped when Flask is not installed).
+
+Variables:
+    SCENARIOS:
+        The names of the scenarios, in the order they are run.
+
+Functions:
+    build_scenarios(template_dir, depth=4, fanout=3, rows=100, columns=5, names=SCENARIOS) -> dict:
+        Builds the operations of the scenarios.
+
+"""
+
+import os
+from typing import Any, Callable, Iterable, Union
+
+import pydantic
+from jinja2 import ChoiceLoader, DictLoader, FileSystemLoader, Environment as JinjaEnvironment
+
+from joop.dao import DAO
+from joop.web.html import HTMLComponent
+from joop.web.components import AlpineTableComponent
+from joop.web.examples.hello import HelloWorld, HelloName
+from joop.web.examples.view import NameView
+from joop.web.templater import EnvironmentFactory
+
+SCENARIOS = ("hello_world", "hello_name", "nested_tree", "alpine_table", "flask_view")
+
+_TREE_TEMPLATE = "bench/tree_{}.html"
+
+def _render_operation(component_type: type, **inputs) -> Callable[[], str]:
+    """
+    Build an operation rendering a component the way a view does.
+    """
+    def _operation() -> str:
+        _component = component_type()
+        _component.inputs = component_type.Inputs(**inputs)
+        _component.subs = component_type.SubComponents()
+        return _component.render()
+
+    return _operation
+
+def _tree_templates(depth: int, fanout: int) -> dict[str, str]:
+    """
+    Build the templates of the tree levels; level 0 is the leaves.
+    """
+    _res = {}
+    for _level in range(depth):
+        _children = "" if _level == 0 else "".join(
+            f"{{{{ subcomponent('child_{_index}') }}}}" for _index in range(fanout))
+        _res[_TREE_TEMPLATE.format(_level)] = f"<div>{{{{ data('label') }}}}{_children}</div>"
+    return _res
+
+def _make_tree_type(env: JinjaEnvironment, depth: int, fanout: int) -> type:
+    """
+    Build the component classes of a tree, level by level, and return the root's.
+
+    Every node of a level has `fanout` subcomponents of the level below, like
+    `HelloSuperComponent` has a `HelloWorld`.
+    """
+    _child_type = None
+    for _level in range(depth):
+        _names = [] if _child_type is None else [f"child_{_index}" for _index in range(fanout)]
+        _label = f"level {_level}"
+
+        def _from_inputs(cls, inputs, _label = _label):
+            return cls(label = _label)
+
+        def _post_init(self, _names = _names, _child_type = _child_type):
+            for _name in _names:
+                setattr(self, _name, _child_type())
+
+        _data = type("Data", (HTMLComponent.Data,), {
+            '__annotations__': {'label': str},
+            'from_inputs': classmethod(_from_inputs),
+        })
+        _subs = type("SubComponents", (HTMLComponent.SubComponents,), {
+            '__annotations__': {_name: _child_type for _name in _names},
+            **{_name: None for _name in _names},
+            '__post_init__': _post_init,
+        })
+        _inputs = type("Inputs", (HTMLComponent.Inputs,), {})
+        _child_type = type(f"TreeLevel{_level}", (HTMLComponent,), {
+            '_jinja_env': env,
+            '_template_location': _TREE_TEMPLATE.format(_level),
+            '_register': False,
+            'Inputs': _inputs,
+            'Data': _data,
+            'SubComponents': _subs,
+        })
+    return _child_type
+
+def _make_table_type(env: JinjaEnvironment, rows: int, columns: int) -> type:
+    """
+    Build an `AlpineTableComponent` class rendering `rows` rows of `columns` columns.
+    """
+    _model = pydantic.create_model("BenchRow", **{f"col_{_index}": (str, ...)
+                                                  for _index in range(columns)})
+    _dao = type("BenchRowDAO", (DAO,), {'_modeltype': _model})
+    _rows = [_dao.from_model(_model(**{f"col_{_index}": f"r{_row}c{_index}"
+                                        for _index in range(columns)}))
+             for _row in range(rows)]
+
+    class BenchTable(AlpineTableComponent):
+        _jinja_env = env
+        _row_type = _dao
+        _register = False
+
+        class Inputs(AlpineTableComponent.Inputs):
+            pass
+
+        class Data(AlpineTableComponent.Data):
+            definition_name : str = "benchTable"
+
+            @classmethod
+            def from_inputs(cls, inputs):
+                return cls(rows = _rows, table_headers = cls._get_table_headers())
+
+        class SubComponents(AlpineTableComponent.SubComponents):
+            pass
+
+    return BenchTable
+
+def _make_flask_operation(env: JinjaEnvironment, name_type: type) -> Callable[[], Any]:
+    """
+    Build an operation sending a request to a `View` through the Flask test client.
+
+    Raises:
+        ImportError: If Flask is not installed.
+    """
+    from flask import Flask
+    from joop.flask.flask_view import FlaskView
+
+    class BenchNameView(NameView, FlaskView):
+        _component_type = name_type
+
+    _app = Flask("joop.bench")
+    _app.jinja_env = env
+    BenchNameView.add_to_app(_app)
+    _client = _app.test_client()
+
+    def _operation():
+        _response = _client.get("/hello/Justin/Rushin")
+        if _response.status_code != 200:
+            raise RuntimeError(f"Unexpected status code: {_response.status_code}")
+        return _response
+
+    return _operation
+
+def build_scenarios(template_dir: Union[str, os.PathLike],
+                    depth: int = 4, fanout: int = 3,
+                    rows: int = 100, columns: int = 5,
+                    names: Iterable[str] = SCENARIOS) -> dict[str, Callable[[], Any]]:
+    """
+    Build the operations of the scenarios.
+
+    Args:
+        template_dir (Union[str, os.PathLike]): The directory of the example templates.
+        depth (int): The number of levels of the nested tree.
+        fanout (int): The number of subcomponents of each inner node of the nested tree.
+        rows (int): The number of rows of the table.
+        columns (int): The number of columns of the table.
+        names (Iterable[str]): The scenarios to build.
+
+    Returns:
+        dict[str, Callable[[], Any]]: The operation of each scenario, by name. Scenarios
+        whose optional dependencies are missing are left out.
+
+    Raises:
+        ValueError: If a scenario name is unknown, or `depth` or `fanout` is smaller than 1.
+    """
+    names = tuple(names)
+    if depth < 1 or fanout < 1:
+        raise ValueError("depth and fanout must be at least 1.")
+    _unknown = set(names) - set(SCENARIOS)
+    if _unknown:
+        raise ValueError(f"Unknown scenario(s): {', '.join(sorted(_unknown))}")
+    # Without auto_reload, as in production: templates are pinned.
+    _env = EnvironmentFactory.create_environment(loader=ChoiceLoader([
+        DictLoader(_tree_templates(depth, fanout)),
+        FileSystemLoader(template_dir),
+    ]), auto_reload=False)
+
+    class BenchHello(HelloWorld):
+        _jinja_env = _env
+        _register = False
+
+    class BenchHelloName(HelloName):
+        _jinja_env = _env
+        _register = False
+
+    _builders = {
+        "hello_world": lambda: _render_operation(BenchHello),
+        "hello_name": lambda: _render_operation(BenchHelloName,
+                                                first_name = "Justin", last_name = "Rushin"),
+        "nested_tree": lambda: _render_operation(_make_tree_type(_env, depth, fanout)),
+        "alpine_table": lambda: _render_operation(_make_table_type(_env, rows, columns)),
+        "flask_view": lambda: _make_flask_operation(_env, BenchHelloName),
+    }
+    _res = {}
+    for _name in SCENARIOS:
+        if _name not in names:
+            continue
+        try:
+            _res[_name] = _builders[_name]()
+        except ImportError:
+            continue
+    return _res
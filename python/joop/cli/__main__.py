@@ -4,23 +4,30 @@ Includes:
 
 - A hello world for the CLI.
 - Start a Flask webserver for testing purposes using the `--flask-server` option.
+- Compile the templates of registered components ahead of time using the `compile-templates` command.
+- Benchmark rendering using the `bench` command.
 - Display a help menu with usage instructions using the `--help` or `-h` options.
 
 Usage:
     - Run the CLI normally: `python -m joop.cli`
     - Start the Flask webserver: `python -m joop.cli --flask-server`
+    - Precompile templates: `python -m joop.cli compile-templates build/templates -t ../templates/examples -m joop.web.examples.table --autoescape`
+    - Benchmark rendering: `python -m joop.cli bench -o bench.json`
     - Display the help menu: `python -m joop.cli --help`
 
 """
 import sys
+import importlib
 import click
-from joop.cli.test_flask import start_test_flask
+from jinja2 import FileSystemLoader
 
 from joop import hello_world
 
-@click.command(context_settings={"help_option_names": ["-h", "--help"]})
+@click.group(invoke_without_command=True,
+             context_settings={"help_option_names": ["-h", "--help"]})
 @click.option('--flask-server', is_flag=True, help="Spin up a Flask webserver for testing.")
-def main(flask_server, args=None):
+@click.pass_context
+def main(ctx, flask_server, args=None):
     """Console script for joop.
 
     Usage:
@@ -28,12 +35,97 @@ def main(flask_server, args=None):
       - Start the Flask webserver: `python -m joop.cli --flask-server`
       - Display the help menu: `python -m joop.cli --help`
     """
+    if ctx.invoked_subcommand is not None:
+        return 0
     if flask_server:
+        from joop.cli.test_flask import start_test_flask
         click.echo("Starting Flask webserver...")
         start_test_flask()
     else:
         click.echo(hello_world())
     return 0
 
+@main.command("compile-templates")
+@click.argument('target', type=click.Path(file_okay=False))
+@click.option('--templates', '-t', 'template_dirs', multiple=True, required=True,
+              type=click.Path(exists=True, file_okay=False),
+              help="A template directory to compile from. Can be repeated.")
+@click.option('--module', '-m', 'modules', multiple=True,
+              help="A module to import so that its components are registered. Can be repeated.")
+@click.option('--autoescape', is_flag=True,
+              help="Compile with autoescaping, for environments created with autoescape=True.")
+@click.option('--enable-async', is_flag=True,
+              help="Compile for environments created with enable_async=True.")
+@click.option('--trim-blocks', is_flag=True,
+              help="Compile for environments created with trim_blocks=True.")
+@click.option('--lstrip-blocks', is_flag=True,
+              help="Compile for environments created with lstrip_blocks=True.")
+def compile_templates(target, template_dirs, modules, autoescape, enable_async,
+                      trim_blocks, lstrip_blocks):
+    """Precompile the templates of registered components into TARGET.
+
+    Load them with `EnvironmentFactory.create_environment(precompiled_path=TARGET)`,
+    with the same options (ex. `autoescape=True` for `--autoescape`): a mismatch is
+    refused, since options such as autoescaping are fixed when compiling.
+    """
+    from joop.web.html import HTMLComponent
+    from joop.web.templater import EnvironmentFactory
+
+    for _module in modules:
+        importlib.import_module(_module)
+    _env = EnvironmentFactory.create_environment(loader=FileSystemLoader(list(template_dirs)),
+                                                 autoescape=autoescape,
+                                                 enable_async=enable_async,
+                                                 trim_blocks=trim_blocks,
+                                                 lstrip_blocks=lstrip_blocks)
+    _compiled = EnvironmentFactory.compile_templates(_env, target,
+                                                     HTMLComponent.get_registered_templates())
+    click.echo(f"Compiled {len(_compiled)} template(s) into {target}")
+    return 0
+
+@main.command("bench")
+@click.option('--scenario', '-s', 'scenarios', multiple=True,
+              help="A scenario to run (default: all). Can be repeated.")
+@click.option('--templates', '-t', 'template_dir', default="../templates/examples",
+              show_default=True, type=click.Path(exists=True, file_okay=False),
+              help="The directory of the example templates.")
+@click.option('--iterations', '-n', default=1000, show_default=True,
+              help="The number of timed operations per scenario.")
+@click.option('--warmup', default=100, show_default=True,
+              help="The number of untimed operations run first.")
+@click.option('--depth', default=4, show_default=True, type=click.IntRange(min=1),
+              help="The depth of the nested tree.")
+@click.option('--fanout', default=3, show_default=True, type=click.IntRange(min=1),
+              help="The fan-out of the nested tree.")
+@click.option('--rows', default=100, show_default=True, help="The number of table rows.")
+@click.option('--columns', default=5, show_default=True, help="The number of table columns.")
+@click.option('--output', '-o', type=click.Path(dir_okay=False),
+              help="Write the results as JSON to this file.")
+def bench(scenarios, template_dir, iterations, warmup, depth, fanout, rows, columns, output):
+    """Benchmark rendering: report ops/sec, latency percentiles and peak memory."""
+    from joop.bench import SCENARIOS, build_scenarios, run_scenario, write_results
+
+    _names = scenarios or SCENARIOS
+    try:
+        _operations = build_scenarios(template_dir, depth=depth, fanout=fanout,
+                                      rows=rows, columns=columns, names=_names)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint="--scenario")
+    _results = []
+    for _name in _names:
+        if _name not in _operations:
+            click.echo(f"{_name:<24} skipped (missing optional dependencies)")
+            continue
+        _result = run_scenario(_name, _operations[_name], iterations=iterations, warmup=warmup)
+        click.echo(_result.format())
+        _results.append(_result)
+    if output:
+        write_results(output, _results, {
+            'iterations': iterations, 'warmup': warmup, 'depth': depth,
+            'fanout': fanout, 'rows': rows, 'columns': columns,
+        })
+        click.echo(f"Wrote results to {output}")
+    return 0
+
 if __name__ == "__main__":
     main()
@@ -18,6 +18,7 @@ Usage:
 """
 
 from joop.tests.test_templater import environment
+from joop.web.pinning import watch_templates
 try:
     from joop.flask import app
 
@@ -27,6 +28,8 @@ try:
     def start_test_flask():
         global app
 
+        # Template edits should show up without a restart.
+        watch_templates(environment)
         app.run(debug=True)
 
 except ImportError as e:
@@ -12,13 +12,71 @@ Classes:
     SQLDAO:
         An abstract class for SQL models, extending the DAO class.
 
+    Page:
+        One page of SQLDAO instances, with the cursors of its neighbouring pages.
+
+Modules:
+    columnar: Columnar query results (`ColumnarResult`), with lazy row views.
+
 """
 
-from typing import List, Type, Optional
+import base64
+import binascii
+import datetime
+import decimal
+import json
+import threading
+import uuid
+import weakref
+from itertools import islice
+from typing import Any, Iterable, Iterator, List, Sequence, Type, Optional
 from dataclasses import dataclass
 import pydantic
+import sqlalchemy
 import sqlmodel
 
+from joop.dao.columnar import ColumnarResult
+
+class _ModelSerializer():
+    """
+    The serialization plan of a model class, compiled once (see `_get_serializer`).
+
+    Attributes:
+        names (tuple[str, ...]): The name of each field, in order.
+        aliases (tuple[str, ...]): The alias (or name) of each field, in order.
+        modeltype (Type[pydantic.BaseModel]): The model class.
+    """
+    __slots__ = ('names', 'aliases', 'modeltype', '_adapter')
+
+    def __init__(self, modeltype : Type[pydantic.BaseModel]):
+        self.modeltype = modeltype
+        self.names = tuple(modeltype.model_fields)
+        self.aliases = tuple(field.alias or name for name, field in modeltype.model_fields.items())
+        self._adapter = None
+
+    def dump_many(self, models : List[pydantic.BaseModel]) -> List[dict]:
+        """
+        Serialize models of exactly this class in one call of pydantic's serializer.
+        """
+        if self._adapter is None:
+            self._adapter = pydantic.TypeAdapter(List[self.modeltype])
+        return self._adapter.dump_python(models, by_alias = True)
+
+_serializers = weakref.WeakKeyDictionary() # model class -> _ModelSerializer
+_serializers_lock = threading.Lock()
+
+def _get_serializer(modeltype : Type[pydantic.BaseModel]) -> _ModelSerializer:
+    """
+    Return the serialization plan of a model class, compiling it on first use.
+    """
+    try:
+        return _serializers[modeltype]
+    except KeyError:
+        pass
+    _res = _ModelSerializer(modeltype)
+    with _serializers_lock:
+        return _serializers.setdefault(modeltype, _res)
+
 class DAO():
     """
     An abstract wrapper for a Pydantic model or any class derived from it.
@@ -40,6 +98,12 @@ class DAO():
         to_dict() -> dict:
             Converts the underlying model to a dictionary using aliases for field names.
 
+        to_dicts(rows: Iterable[DAO]) -> List[dict]:
+            Converts the models of many DAO instances to dictionaries in one pass.
+
+        iter_dicts(rows: Iterable[DAO], batch_size: int = 1000) -> Iterator[dict]:
+            Converts the models of DAO instances to dictionaries batch by batch, lazily.
+
         get_model_fields() -> List[str]:
             Retrieves the names of all fields defined in the `_modeltype`.
     """
@@ -54,6 +118,11 @@ class DAO():
     def model(self, value : pydantic.BaseModel):
         self._model = value
 
+    def __repr__(self) -> str:
+        # Stable across instances, so that render cache keys and ETags (see
+        #   `joop.web.cache.make_key`) digest the model's values.
+        return f"{type(self).__qualname__}({getattr(self, '_model', None)!r})"
+
     @classmethod
     def from_model(cls, model : pydantic.BaseModel) -> 'DAO':
         if model is None:
@@ -81,19 +150,60 @@ class DAO():
             raise ValueError("No model is set for this DAO instance.")
         
         # Ensure the model has the necessary fields and aliases
-        if not hasattr(self._model, '__fields__'):
+        if not isinstance(self._model, pydantic.BaseModel):
             raise TypeError("The model does not have Pydantic fields.")
         
-        # Use SQLModel's/Pydantic basemodel's dict() method to get the base dictionary
-        base_dict = self._model.dict()
-        
-        # Build the dictionary using aliases
-        result = {}
-        for field_name, field in self._model.__fields__.items():
-            alias = field.alias or field_name  # Use alias if defined, otherwise fallback to field name
-            result[alias] = base_dict[field_name]
-        
-        return result
+        # Pydantic's compiled serializer applies the aliases itself
+        return self._model.model_dump(by_alias = True)
+
+    @classmethod
+    def to_dicts(cls, rows : Iterable['DAO']) -> List[dict]:
+        """
+        Convert the models of many DAO instances to dictionaries in one pass.
+
+        When all the models are of the same class, they are serialized together in a
+        single call of pydantic's serializer; otherwise each falls back to `to_dict`.
+
+        Args:
+            rows (Iterable[DAO]): The DAO instances.
+
+        Returns:
+            List[dict]: A dictionary per DAO instance, in order, with aliases as keys.
+
+        Raises:
+            ValueError: If no model is set for one of the DAO instances.
+            TypeError: If one of the models does not have Pydantic fields.
+        """
+        rows = list(rows)
+        _models = [getattr(row, '_model', None) for row in rows]
+        _modeltype = type(_models[0]) if _models else None
+        if (isinstance(_modeltype, type) and issubclass(_modeltype, pydantic.BaseModel) and
+            _modeltype is not pydantic.BaseModel and
+            all(type(_model) is _modeltype for _model in _models)):
+            return _get_serializer(_modeltype).dump_many(_models)
+        return [row.to_dict() for row in rows]
+
+    @classmethod
+    def iter_dicts(cls, rows : Iterable['DAO'], batch_size : int = 1000) -> Iterator[dict]:
+        """
+        Convert the models of DAO instances to dictionaries batch by batch, lazily.
+
+        Like `to_dicts`, without consuming all of `rows` up front, so rows streamed from
+        the database (ex. `SQLDAO.iter_all`) stay streamed.
+
+        Args:
+            rows (Iterable[DAO]): The DAO instances.
+            batch_size (int): The number of DAO instances serialized at once.
+
+        Returns:
+            Iterator[dict]: A dictionary per DAO instance, in order, with aliases as keys.
+        """
+        _rows = iter(rows)
+        while True:
+            _batch = list(islice(_rows, batch_size))
+            if not _batch:
+                return
+            yield from cls.to_dicts(_batch)
     
     @classmethod
     def get_model_fields(cls) -> List[str]:
@@ -109,8 +219,7 @@ class DAO():
         if not issubclass(cls._modeltype, pydantic.BaseModel):
             raise TypeError("_modeltype must be a subclass of pydantic.BaseModel")
 
-        res = [field.alias if field.alias else name for name, field in cls._modeltype.__fields__.items()]
-        return res
+        return list(_get_serializer(cls._modeltype).aliases)
 
 class SQLDAO(DAO):
     """
@@ -121,20 +230,145 @@ class SQLDAO(DAO):
 
     Attributes:
         _modeltype (Type): The type of the model, defaulting to `sqlmodel.SQLModel`.
+        _trusted_rows (bool): Whether rows are trusted to be valid, ex. for read-only
+            listings: queries then select plain columns (a Core `select`, outside the
+            session's identity map) and build models with `model_construct`, without
+            validation. Models built this way are not attached to the session, so changes
+            to them are not saved.
+        _trusted_fields (Optional[Sequence[str]]): The fields selected for trusted rows;
+            all the model's columns if None. The primary key (and any order column) is
+            always selected; other fields keep their defaults, so fields without one
+            must be selected.
 
     Methods:
         get_all(session: sqlmodel.Session) -> List['SQLDAO']:
             Retrieves all records from the database for the given model type and returns
             them as a list of SQLDAO instances.
+
+        iter_all(session: sqlmodel.Session, batch_size: int = 1000) -> Iterator['SQLDAO']:
+            Streams all records from the database for the given model type, fetching them
+            in batches and wrapping them in SQLDAO instances as they are consumed.
+
+        get_page(session: sqlmodel.Session, cursor: Optional[str] = None, page_size: int = 50,
+                 order_by: Optional[Sequence[str]] = None, descending: bool = False,
+                 keyset: bool = True) -> Page:
+            Retrieves one page of records, after (or before) the page a cursor points to.
+
+        get_columnar(session: sqlmodel.Session, order_by: Optional[Sequence[str]] = None,
+                     limit: Optional[int] = None, use_numpy: bool = False) -> ColumnarResult:
+            Retrieves the records column by column, without creating a model per row.
     """
 
     _modeltype : Type = sqlmodel.SQLModel
+    _trusted_rows : bool = False
+    _trusted_fields : Optional[Sequence[str]] = None
+
+    @classmethod
+    def _check_model_type(cls):
+        """
+        Check that `_modeltype` is a SQLModel.
+
+        Raises:
+            TypeError: If `_modeltype` is not a subclass of `sqlmodel.SQLModel`.
+        """
+        if not issubclass(cls._modeltype, sqlmodel.SQLModel):
+            raise TypeError("_modeltype must be a subclass of sqlmodel.SQLModel")
+
+    @classmethod
+    def _select(cls, columns : Sequence = ()):
+        """
+        Build the select of the model: an ORM select, or a Core select of the trusted
+        fields (see `_trusted_rows`) and the given columns.
+
+        Raises:
+            ValueError: If a trusted field is not a column, or a required field (without
+                a default) is not selected.
+        """
+        if not cls._trusted_rows:
+            return sqlmodel.select(cls._modeltype)
+        _mapper = sqlalchemy.inspect(cls._modeltype)
+        _table = _mapper.local_table
+        try:
+            # Fields are mapped attributes, whose columns may be named otherwise.
+            _columns = ([_mapper.columns[_name] for _name in cls._trusted_fields]
+                        if cls._trusted_fields is not None else list(_table.columns))
+        except KeyError as e:
+            raise ValueError(f"Unknown trusted field: {e.args[0]}") from e
+        _names = {_column.name for _column in _columns}
+        for _column in (*_table.primary_key.columns, *columns):
+            if _column.name not in _names:
+                _names.add(_column.name)
+                _columns.append(_column)
+        # Unselected fields would be missing from the models (and `to_dict`).
+        _column_names = cls._get_column_names()
+        _missing = [_name for _name, _field in cls._modeltype.model_fields.items()
+                    if _field.is_required() and _column_names.get(_name, _name) not in _names]
+        if _missing:
+            raise ValueError(f"Required fields are not trusted fields: {', '.join(_missing)}")
+        return sqlalchemy.select(*_columns)
+
+    @classmethod
+    def _construct_model(cls, values : dict) -> pydantic.BaseModel:
+        """
+        Build a model from the values of a trusted row, without validating them.
+
+        Args:
+            values (dict): The column values by field alias (see `_get_row_keys`).
+
+        Returns:
+            pydantic.BaseModel: The model.
+        """
+        return cls._modeltype.model_construct(**values)
+
+    @classmethod
+    def _get_column_names(cls) -> dict[str, str]:
+        """
+        Return the column name of each mapped attribute of the model, by attribute name.
+        """
+        return {_key: _column.name
+                for _key, _column in sqlalchemy.inspect(cls._modeltype).columns.items()}
+
+    @classmethod
+    def _get_row_keys(cls, keys : Sequence[str]) -> List[str]:
+        """
+        Map the keys of trusted rows (column names) to the keys `_construct_model`
+        takes: the aliases of the model's fields (see `_ModelSerializer`).
+
+        Raises:
+            ValueError: If a key is not the column of a field of the model.
+        """
+        _plan = _get_serializer(cls._modeltype)
+        _aliases = dict(zip(_plan.names, _plan.aliases))
+        _fields = {_column: _name for _name, _column in cls._get_column_names().items()
+                   if _name in _aliases}
+        _unknown = [_key for _key in keys if _key not in _fields]
+        if _unknown:
+            raise ValueError(f"Columns are not fields of {cls._modeltype.__qualname__}: "
+                             f"{', '.join(_unknown)}")
+        return [_aliases[_fields[_key]] for _key in keys]
+
+    @classmethod
+    def _load_models(cls, result) -> Iterator[pydantic.BaseModel]:
+        """
+        Return the models of the result of a `_select` statement.
+
+        Raises:
+            ValueError: If a column of trusted rows is not the column of a model field.
+        """
+        if not cls._trusted_rows:
+            return result.scalars()
+        _keys = cls._get_row_keys(list(result.keys()))
+        _construct = cls._construct_model
+        return (_construct(dict(zip(_keys, _row))) for _row in result)
 
     @classmethod
     def get_all(cls, session: sqlmodel.Session) -> List['SQLDAO']:
         """
         Retrieve all records from the database for the given model type and return them as a list of SQLDAO instances.
 
+        With `_trusted_rows`, the rows are selected with a Core `select` and their models
+        built without validation.
+
         Args:
             session (sqlmodel.Session): The database session to use for the query.
 
@@ -144,8 +378,299 @@ class SQLDAO(DAO):
         Raises:
             TypeError: If `_modeltype` is not a subclass of `sqlmodel.SQLModel`.
         """
-        if not issubclass(cls._modeltype, sqlmodel.SQLModel):
-            raise TypeError("_modeltype must be a subclass of sqlmodel.SQLModel")
+        cls._check_model_type()
 
-        db_results = session.query(cls._modeltype).all()
+        if cls._trusted_rows:
+            db_results = cls._load_models(session.execute(cls._select()))
+        else:
+            db_results = session.query(cls._modeltype).all()
         return [cls.from_model(result) for result in db_results]
+
+    @classmethod
+    def iter_all(cls, session: sqlmodel.Session, batch_size: int = 1000) -> Iterator['SQLDAO']:
+        """
+        Stream all records from the database for the given model type, as SQLDAO instances.
+
+        Rows are fetched `batch_size` at a time (`yield_per`, with a server-side cursor
+        where the driver supports one) and wrapped as they are consumed, so memory stays
+        bounded by the batch size however large the table is. The session must stay open
+        until the iterator is exhausted; ex. hand it to a table component's `rows` and
+        render (or stream) the component inside the session.
+
+        Args:
+            session (sqlmodel.Session): The database session to use for the query.
+            batch_size (int): The number of rows fetched per round trip.
+
+        Returns:
+            Iterator[SQLDAO]: The SQLDAO instances for the model type, lazily.
+
+        Raises:
+            TypeError: If `_modeltype` is not a subclass of `sqlmodel.SQLModel`.
+            ValueError: If `batch_size` is smaller than 1.
+        """
+        cls._check_model_type()
+        if batch_size < 1:
+            raise ValueError("batch_size must be at least 1.")
+        return cls._iter_results(session, cls._select(), batch_size)
+
+    @classmethod
+    def _iter_results(cls, session: sqlmodel.Session, statement, batch_size: int) -> Iterator['SQLDAO']:
+        """
+        Execute a `_select` statement in batches, wrapping its models as they are consumed.
+        """
+        _result = session.execute(statement.execution_options(yield_per = batch_size))
+        try:
+            for _model in cls._load_models(_result):
+                yield cls.from_model(_model)
+        finally:
+            _result.close()
+
+    @classmethod
+    def _get_order_columns(cls, order_by: Optional[Sequence[str]]) -> list:
+        """
+        Return the columns of the page order: `order_by`, then the primary key columns
+        not in it, so that the order is total.
+
+        Raises:
+            ValueError: If a column does not exist.
+        """
+        _table = sqlalchemy.inspect(cls._modeltype).local_table
+        _names = list(order_by or [])
+        _names += [_column.name for _column in _table.primary_key.columns if _column.name not in _names]
+        try:
+            return [_table.columns[_name] for _name in _names]
+        except KeyError as e:
+            raise ValueError(f"Unknown order column: {e.args[0]}") from e
+
+    @classmethod
+    def get_page(cls, session: sqlmodel.Session, cursor: Optional[str] = None,
+                 page_size: int = 50, order_by: Optional[Sequence[str]] = None,
+                 descending: bool = False, keyset: bool = True) -> 'Page':
+        """
+        Retrieve one page of records, after (or before) the page a cursor points to.
+
+        Pages are ordered by the `order_by` columns, then by the primary key. With
+        `keyset` (the default), a cursor holds the order values of the first or last row
+        of a page, and the next page is found by comparing them to the order columns
+        (`WHERE (a, b) > (:a, :b)`), so deep pages cost as much as the first one given an
+        index on the order columns. Without `keyset`, cursors hold an offset instead.
+        Cursors are opaque: pass those of a returned `Page` back unchanged. Keyset order
+        columns should not be nullable, since NULLs do not compare.
+
+        Args:
+            session (sqlmodel.Session): The database session to use for the query.
+            cursor (Optional[str]): A cursor of a previous page; None for the first page.
+            page_size (int): The maximum number of rows of the page.
+            order_by (Optional[Sequence[str]]): The names of the columns to order by.
+            descending (bool): Whether to order the columns in descending order.
+            keyset (bool): Whether to seek with the order values instead of an offset.
+
+        Returns:
+            Page: The page.
+
+        Raises:
+            TypeError: If `_modeltype` is not a subclass of `sqlmodel.SQLModel`.
+            ValueError: If `page_size` is smaller than 1, an order column does not exist,
+                or the cursor is invalid or was made for another order.
+        """
+        cls._check_model_type()
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1.")
+        _columns = cls._get_order_columns(order_by)
+        _order = [_column.name for _column in _columns]
+        _state = _decode_cursor(cursor, _order, descending) if cursor is not None else None
+        if not keyset or (_state is not None and 'offset' in _state):
+            return cls._get_offset_page(session, _columns, descending, page_size,
+                                        0 if _state is None else _state['offset'])
+
+        _backward = _state is not None and _state['backward']
+        _statement = cls._select(_columns)
+        if _state is not None:
+            try:
+                _key = [_coerce_key_value(_column, _value)
+                        for _column, _value in zip(_columns, _state['key'])]
+            except (ValueError, decimal.InvalidOperation) as e:
+                raise ValueError("Invalid page cursor.") from e
+            _row_value = sqlalchemy.tuple_(*_columns)
+            _bound = sqlalchemy.tuple_(*(sqlalchemy.literal(_value, _column.type)
+                                         for _column, _value in zip(_columns, _key)))
+            _statement = _statement.where(_row_value < _bound if _backward != descending
+                                          else _row_value > _bound)
+        _statement = _statement.order_by(*(_column.desc() if _backward != descending
+                                           else _column.asc() for _column in _columns))
+        _models = list(cls._load_models(session.execute(_statement.limit(page_size + 1))))
+        _more = len(_models) > page_size
+        _models = _models[:page_size]
+        if _backward:
+            _models.reverse()
+
+        def _cursor(model, backward):
+            return _encode_cursor(_order, descending,
+                                  key = [getattr(model, _column.key) for _column in _columns],
+                                  backward = backward)
+
+        _has_next = _more if not _backward else True
+        _has_previous = _more if _backward else _state is not None
+        return Page(
+            rows = [cls.from_model(_model) for _model in _models],
+            page_size = page_size,
+            next_cursor = _cursor(_models[-1], False) if _models and _has_next else None,
+            previous_cursor = _cursor(_models[0], True) if _models and _has_previous else None,
+        )
+
+    @classmethod
+    def _get_offset_page(cls, session: sqlmodel.Session, columns: list, descending: bool,
+                         page_size: int, offset: int) -> 'Page':
+        """
+        Retrieve one page of records by offset (see `get_page`).
+        """
+        _order = [_column.name for _column in columns]
+        _statement = (cls._select(columns)
+                      .order_by(*(_column.desc() if descending else _column.asc() for _column in columns))
+                      .offset(offset).limit(page_size + 1))
+        _models = list(cls._load_models(session.execute(_statement)))
+        _more = len(_models) > page_size
+        return Page(
+            rows = [cls.from_model(_model) for _model in _models[:page_size]],
+            page_size = page_size,
+            next_cursor = (_encode_cursor(_order, descending, offset = offset + page_size)
+                           if _more else None),
+            previous_cursor = (_encode_cursor(_order, descending, offset = max(offset - page_size, 0))
+                               if offset > 0 else None),
+        )
+
+    @classmethod
+    def get_columnar(cls, session: sqlmodel.Session, order_by: Optional[Sequence[str]] = None,
+                     limit: Optional[int] = None, use_numpy: bool = False) -> ColumnarResult:
+        """
+        Retrieve the records column by column, without creating a model per row.
+
+        A Core `select` of the model's columns fetches plain row tuples, which are stored
+        as one list (or NumPy array) per column. Columns are named by field alias, like
+        the keys of `to_dict`, so the result can replace a list of SQLDAO instances in
+        read-only tables. Values are not validated by the model.
+
+        Args:
+            session (sqlmodel.Session): The database session to use for the query.
+            order_by (Optional[Sequence[str]]): The names of the columns to order by
+                (then the primary key).
+            limit (Optional[int]): The maximum number of rows.
+            use_numpy (bool): Whether to store numeric columns as NumPy arrays.
+
+        Returns:
+            ColumnarResult: The records.
+
+        Raises:
+            TypeError: If `_modeltype` is not a subclass of `sqlmodel.SQLModel`.
+            ValueError: If an order column does not exist.
+            ImportError: If `use_numpy` is set and NumPy is not installed.
+        """
+        cls._check_model_type()
+        _serializer = _get_serializer(cls._modeltype)
+        _table = sqlalchemy.inspect(cls._modeltype).local_table
+        _fields = [(_name, _alias) for _name, _alias in zip(_serializer.names, _serializer.aliases)
+                   if _name in _table.columns]
+        _statement = (sqlalchemy.select(*(_table.columns[_name] for _name, _ in _fields))
+                      .order_by(*cls._get_order_columns(order_by)))
+        if limit is not None:
+            _statement = _statement.limit(limit)
+        return ColumnarResult.from_rows([_alias for _, _alias in _fields],
+                                        session.execute(_statement), use_numpy = use_numpy)
+
+@dataclass
+class Page:
+    """
+    One page of SQLDAO instances, with the cursors of its neighbouring pages.
+
+    Attributes:
+        rows (List[SQLDAO]): The rows of the page, in order.
+        page_size (int): The maximum number of rows of a page.
+        next_cursor (Optional[str]): The cursor of the next page; None on the last page.
+        previous_cursor (Optional[str]): The cursor of the previous page; None on the first.
+    """
+    rows : List[SQLDAO]
+    page_size : int
+    next_cursor : Optional[str] = None
+    previous_cursor : Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+def _to_json_value(value: Any) -> Any:
+    """Convert a value the JSON encoder does not support (ex. an order value)."""
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (decimal.Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"Unsupported JSON value: {value!r}")
+
+def _coerce_key_value(column, value: Any) -> Any:
+    """Convert an order value decoded from JSON back to the type of its column."""
+    if value is None or not isinstance(value, str):
+        return value
+    try:
+        _type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if _type in (datetime.datetime, datetime.date, datetime.time):
+        return _type.fromisoformat(value)
+    if _type in (decimal.Decimal, uuid.UUID):
+        return _type(value)
+    return value
+
+_OFFSET_CURSOR_FIELDS = {'order', 'desc', 'offset'}
+_KEY_CURSOR_FIELDS = {'order', 'desc', 'key', 'backward'}
+_CURSOR_SCALARS = (str, int, float, type(None))
+
+def _encode_cursor(order: list[str], descending: bool, key: Optional[list] = None,
+                   backward: bool = False, offset: Optional[int] = None) -> str:
+    """
+    Encode a page cursor: the order it was made for, and either the key values to seek
+    from (and the direction) or an offset.
+    """
+    _state = {'order': order, 'desc': descending}
+    if offset is not None:
+        _state['offset'] = offset
+    else:
+        _state['key'] = key
+        _state['backward'] = backward
+    try:
+        _json = json.dumps(_state, separators=(",", ":"), default=_to_json_value)
+    except TypeError as e:
+        raise ValueError(f"Cannot encode the order values {key!r} in a page cursor: the "
+                         "supported types are JSON scalars, date/time, Decimal and UUID.") from e
+    return base64.urlsafe_b64encode(_json.encode("utf-8")).decode("ascii").rstrip("=")
+
+def _decode_cursor(cursor: str, order: list[str], descending: bool) -> dict:
+    """
+    Decode a page cursor made by `_encode_cursor` for the given order.
+
+    Raises:
+        ValueError: If the cursor is invalid or was made for another order.
+    """
+    try:
+        _json = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        _state = json.loads(_json)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid page cursor.") from e
+    if (not isinstance(_state, dict) or _state.get('order') != order or
+        _state.get('desc') != descending):
+        raise ValueError("The page cursor was made for another order.")
+    if set(_state) == _OFFSET_CURSOR_FIELDS:
+        _offset = _state['offset']
+        if type(_offset) is not int or _offset < 0:
+            raise ValueError("Invalid page cursor.")
+    elif set(_state) == _KEY_CURSOR_FIELDS:
+        _key = _state['key']
+        if (type(_state['backward']) is not bool or not isinstance(_key, list) or
+            len(_key) != len(order) or
+            not all(isinstance(_value, _CURSOR_SCALARS) for _value in _key)):
+            raise ValueError("Invalid page cursor.")
+    else:
+        raise ValueError("Invalid page cursor.")
+    return _state
@@ -0,0 +1,272 @@
+"""Columnar (struct-of-arrays) query results for joop.
+
+A list of DAOs costs several objects per row: the DAO, its model, and the model's
+    field storage. A `ColumnarResult` holds one list per column instead (or one NumPy
+    array, for numeric columns when NumPy is installed), and only creates a lightweight
+    `RowView` when a row is accessed. Slicing it returns a window over the same columns,
+    without copying them.
+
+It is meant for read-only pages: it plugs into table components as their `rows` (see
+    `AlpineTableComponent`), and exports to dictionaries or JSON directly from the columns.
+
+Classes:
+    ColumnarResult:
+        Query results stored column by column, with lazy row views.
+
+    RowView:
+        A read-only view of one row of a ColumnarResult.
+
+"""
+
+import hashlib
+import json
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+def _to_list(column: Any) -> list:
+    """Return a column as a list of Python values (NumPy scalars are converted)."""
+    if numpy is not None and isinstance(column, numpy.ndarray):
+        return column.tolist()
+    return list(column)
+
+def _to_array(values: list) -> Any:
+    """Convert a column to a NumPy array if all its values are numbers, else keep it."""
+    if values and all(type(_value) in (int, float, bool) for _value in values):
+        return numpy.asarray(values)
+    return values
+
+class RowView:
+    """
+    A read-only view of one row of a ColumnarResult.
+
+    Values are read from the columns on access, by name (`row['name']`) or as attributes
+    (`row.name`).
+
+    Methods:
+        keys() -> Sequence[str]:
+            Returns the column names.
+
+        to_dict() -> dict:
+            Converts the row to a dictionary.
+    """
+    __slots__ = ('_result', '_index')
+
+    def __init__(self, result: 'ColumnarResult', index: int):
+        self._result = result
+        self._index = index
+
+    def __getitem__(self, name: str) -> Any:
+        return self._result._columns[name][self._index]
+
+    def __getattr__(self, name: str) -> Any:
+        # Private names are the slots: they are only looked up here while unset (ex. on
+        #   an instance created by `copy` or `pickle`), and reading them would recurse.
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._result._columns[name][self._index]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def keys(self) -> Sequence[str]:
+        """
+        Return the column names.
+
+        Returns:
+            Sequence[str]: The column names, in order.
+        """
+        return self._result.names
+
+    def to_dict(self) -> dict:
+        """
+        Convert the row to a dictionary.
+
+        Returns:
+            dict: The values of the row by column name.
+        """
+        return {_name: self[_name] for _name in self._result.names}
+
+    def __repr__(self) -> str:
+        return f"RowView({self.to_dict()!r})"
+
+class ColumnarResult:
+    """
+    Query results stored column by column, with lazy row views.
+
+    A result is a window (`start` to `stop`) over its columns: slicing with a step of 1
+    shares the columns, so pages of a large result cost nothing to take.
+
+    Attributes:
+        names (tuple[str, ...]): The column names, in order.
+
+    Methods:
+        from_rows(names, rows, use_numpy=False) -> ColumnarResult:
+            Builds a result from row tuples.
+
+        column(name) -> Sequence:
+            Returns the values of one column in the window.
+
+        to_columns() -> dict[str, list]:
+            Returns the columns of the window as lists.
+
+        to_dicts() -> List[dict]:
+            Converts the rows of the window to dictionaries.
+
+        iter_dicts() -> Iterator[dict]:
+            Converts the rows of the window to dictionaries, lazily.
+
+        to_json(**kwargs) -> str:
+            Returns the rows of the window as a JSON array of objects.
+
+        digest() -> str:
+            Digests the column names and values of the window.
+    """
+    __slots__ = ('names', '_columns', '_start', '_stop')
+
+    def __init__(self, columns: dict[str, Sequence], start: int = 0, stop: Optional[int] = None):
+        """
+        Initialize the result.
+
+        Args:
+            columns (dict[str, Sequence]): The values of each column by name; all of the
+                same length.
+            start (int): The first row of the window.
+            stop (Optional[int]): The end of the window; the end of the columns if None.
+
+        Raises:
+            ValueError: If the columns are not all of the same length.
+        """
+        _lengths = {len(_column) for _column in columns.values()}
+        if len(_lengths) > 1:
+            raise ValueError("All columns must have the same length.")
+        _length = _lengths.pop() if _lengths else 0
+        self.names = tuple(columns)
+        self._columns = columns
+        self._start = start
+        self._stop = _length if stop is None else stop
+
+    @classmethod
+    def from_rows(cls, names: Sequence[str], rows: Iterable[Sequence],
+                  use_numpy: bool = False) -> 'ColumnarResult':
+        """
+        Build a result from row tuples, ex. the rows of a Core `select`.
+
+        Args:
+            names (Sequence[str]): The column names, in the order of the row values.
+            rows (Iterable[Sequence]): The rows.
+            use_numpy (bool): Whether to store numeric columns as NumPy arrays.
+
+        Returns:
+            ColumnarResult: The result.
+
+        Raises:
+            ImportError: If `use_numpy` is set and NumPy is not installed.
+        """
+        if use_numpy and numpy is None:
+            raise ImportError("use_numpy requires NumPy to be installed.")
+        _columns = [list(_column) for _column in zip(*rows)] or [[] for _ in names]
+        if use_numpy:
+            _columns = [_to_array(_column) for _column in _columns]
+        return cls(dict(zip(names, _columns)))
+
+    def __len__(self) -> int:
+        return self._stop - self._start
+
+    def __iter__(self) -> Iterator[RowView]:
+        return (RowView(self, _index) for _index in range(self._start, self._stop))
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[RowView, 'ColumnarResult']:
+        _range = range(self._start, self._stop)[index]
+        if isinstance(index, slice):
+            if _range.step == 1:
+                # An empty slice (ex. `[2:1]`) may stop before it starts.
+                return ColumnarResult(self._columns, _range.start, max(_range.stop, _range.start))
+            _slice = slice(_range.start, _range.stop if _range.stop >= 0 else None, _range.step)
+            return ColumnarResult({_name: _column[_slice] for _name, _column in self._columns.items()})
+        return RowView(self, _range)
+
+    def column(self, name: str) -> Sequence:
+        """
+        Return the values of one column in the window.
+
+        Args:
+            name (str): The column name.
+
+        Returns:
+            Sequence: The values; a view for NumPy arrays, a copy for lists.
+        """
+        return self._columns[name][self._start:self._stop]
+
+    def to_columns(self) -> dict[str, list]:
+        """
+        Return the columns of the window as lists, ex. for a columnar JSON export.
+
+        Returns:
+            dict[str, list]: The values of each column by name, as Python values.
+        """
+        return {_name: _to_list(self.column(_name)) for _name in self.names}
+
+    def to_dicts(self) -> List[dict]:
+        """
+        Convert the rows of the window to dictionaries.
+
+        Returns:
+            List[dict]: A dictionary per row, with the column names as keys.
+        """
+        _names = self.names
+        return [dict(zip(_names, _values))
+                for _values in zip(*(self.to_columns().values()))] if _names else []
+
+    def iter_dicts(self, batch_size: int = 1000) -> Iterator[dict]:
+        """
+        Convert the rows of the window to dictionaries, batch by batch.
+
+        Args:
+            batch_size (int): The number of rows converted at once.
+
+        Returns:
+            Iterator[dict]: A dictionary per row, with the column names as keys.
+        """
+        for _start in range(0, len(self), batch_size):
+            yield from self[_start:_start + batch_size].to_dicts()
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Return the rows of the window as a JSON array of objects.
+
+        Dates, times, decimals and UUIDs are converted to strings, as in page cursors
+        (see `SQLDAO.get_page`), unless another `default` is given.
+
+        Args:
+            **kwargs: Keyword arguments passed on to `json.dumps`.
+
+        Returns:
+            str: The rows as JSON.
+
+        Raises:
+            TypeError: If a value cannot be converted to JSON.
+        """
+        from joop.dao import _to_json_value # joop.dao imports this module.
+        kwargs.setdefault('default', _to_json_value)
+        return json.dumps(self.to_dicts(), **kwargs)
+
+    def digest(self) -> str:
+        """
+        Digest the column names and values of the window, so that equal results give
+        equal render cache keys and ETags (see `joop.web.cache.make_key`).
+
+        Returns:
+            str: The hexadecimal SHA-256 digest.
+        """
+        _values = repr((self.names, self.to_columns()))
+        return hashlib.sha256(_values.encode("utf-8", "surrogatepass")).hexdigest()
+
+    # Read by `joop.web.cache.make_key`, which does not import this module.
+    _joop_digest = digest
+
+    def __repr__(self) -> str:
+        return f"ColumnarResult(names={self.names!r}, rows={len(self)})"
@@ -12,8 +12,8 @@ Classes:
         A base class for creating Flask-compatible views from joop View classes.
 """
 
-from typing import Optional
-from flask import Flask, current_app
+from typing import Iterator, Optional, Union
+from flask import Flask, Response, current_app, request, stream_with_context
 
 from joop.web.view import View, Component
 
@@ -35,6 +35,18 @@ class FlaskView(View):
 
         _get_jinja_env():
             Retrieves the Jinja2 environment from the current Flask application context.
+
+        _stream_response(chunks: Iterator[str]) -> Response:
+            Wraps a stream of HTML chunks in a streaming Flask response.
+
+        _get_request_header(name: str) -> Optional[str]:
+            Retrieves a header of the current Flask request.
+
+        _make_response(body: Union[str, bytes], status: int, headers: dict) -> Response:
+            Builds a Flask response.
+
+        _get_request_arg(name: str) -> Optional[str]:
+            Retrieves a query parameter of the current Flask request.
     """
 
     @classmethod
@@ -68,4 +80,59 @@ class FlaskView(View):
         This method allows joop views to access the Jinja2 environment configured
         for the Flask application.
         """
-        return current_app.jinja_env
\ No newline at end of file
+        return current_app.jinja_env
+
+    @classmethod
+    def _stream_response(cls, chunks: Iterator[str]) -> Response:
+        """
+        Wrap a stream of HTML chunks in a streaming Flask response.
+
+        Args:
+            chunks (Iterator[str]): The rendered output, chunk by chunk.
+
+        Returns:
+            Response: A response that sends the chunks as they are rendered, with the
+            request context kept alive until the stream is exhausted.
+        """
+        return Response(stream_with_context(chunks), mimetype="text/html")
+
+    @classmethod
+    def _get_request_header(cls, name: str) -> Optional[str]:
+        """
+        Retrieve a header of the current Flask request.
+
+        Args:
+            name (str): The header name, ex. `If-None-Match`.
+
+        Returns:
+            Optional[str]: The header value, or None if the request does not have it.
+        """
+        return request.headers.get(name)
+
+    @classmethod
+    def _make_response(cls, body: Union[str, bytes], status: int, headers: dict) -> Response:
+        """
+        Build a Flask response.
+
+        Args:
+            body (Union[str, bytes]): The rendered output (empty for `304 Not Modified`).
+            status (int): The HTTP status code.
+            headers (dict): The response headers.
+
+        Returns:
+            Response: The HTML response.
+        """
+        return Response(body, status=status, headers=headers, mimetype="text/html")
+
+    @classmethod
+    def _get_request_arg(cls, name: str) -> Optional[str]:
+        """
+        Retrieve a query parameter of the current Flask request.
+
+        Args:
+            name (str): The parameter name.
+
+        Returns:
+            Optional[str]: The parameter value, or None if the request does not have it.
+        """
+        return request.args.get(name)
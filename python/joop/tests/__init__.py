@@ -4,3 +4,19 @@
 from joop.tests.test_web import TestHTMLComponent
 from joop.tests.test_view import TestView
 from joop.tests.test_sql import TestORMSQLConfig, TestSQLConfig
+from joop.tests.test_cache import TestRenderCache
+from joop.tests.test_parallel import TestParallelRender
+from joop.tests.test_async import TestAsyncRender
+from joop.tests.test_pinning import TestTemplatePinning
+from joop.tests.test_fragment_cache import TestFragmentCache
+from joop.tests.test_subcomponents import TestReferencedSubComponents
+from joop.tests.test_incremental import TestIncrementalRender
+from joop.tests.test_flatten import TestFlattenedRender
+from joop.tests.test_compact import TestCompactDataclasses
+from joop.tests.test_pool import TestComponentPool
+from joop.tests.test_profiler import TestRenderProfiler
+from joop.tests.test_iterative import TestIterativeRender
+from joop.tests.test_etag import TestETag
+from joop.tests.test_compression import TestCompressedBody
+from joop.tests.test_partial import TestPartialRender
+from joop.tests.test_dao import TestDAO, TestColumnarResult, TestSQLDAO
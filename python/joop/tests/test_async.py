@@ -0,0 +1,87 @@
+"""Unit tests for the asynchronous render path."""
+
+import asyncio
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent, View
+from joop.web.templater import EnvironmentFactory
+from joop.tests.test_web import MyHelloName
+
+environment = EnvironmentFactory.create_environment(
+        enable_async=True,
+        loader=DictLoader({
+            "slow.html": "<p>{{ data('label') }}</p>",
+            "page.html": "{{ subcomponent('first') }}{{ subcomponent('second') }}",
+        })
+    )
+
+_events = []
+
+class SlowPanel(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "slow.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+        label: str
+
+        @classmethod
+        async def from_inputs(cls, inputs):
+            _events.append("start")
+            await asyncio.sleep(0.01)
+            _events.append("end")
+            return cls(label = "slow")
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class SlowPage(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "page.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        first: SlowPanel = None
+        second: SlowPanel = None
+
+        def __post_init__(self):
+            self.first = SlowPanel()
+            self.second = SlowPanel()
+
+class SlowView(View):
+    _component_type = SlowPage
+
+class NameView(View):
+    _component_type = MyHelloName
+
+class TestAsyncRender(unittest.TestCase):
+
+    def setUp(self):
+        _events.clear()
+
+    def test_000_gathered_subcomponents(self):
+        _html = asyncio.run(SlowView.render_async())
+        assert _html == "<p>slow</p><p>slow</p>"
+        # Both panels started before either finished.
+        assert _events == ["start", "start", "end", "end"]
+
+    def test_001_sync_environment(self):
+        _html = asyncio.run(NameView.render_async(first_name = "Justin", last_name = "Rushin"))
+        assert _html == "<p>Hello, Justin Rushin!</p>"
+
+    def test_002_sync_render_rejects_coroutines(self):
+        _panel = SlowPanel()
+        _panel.inputs = SlowPanel.Inputs()
+        with self.assertRaises(TypeError):
+            _panel.render()
@@ -0,0 +1,85 @@
+"""Unit tests for joop render caching.
+
+We're testing both the cache itself and its use by HTML components.
+"""
+
+import unittest
+from unittest import mock
+
+from joop.web.cache import RenderCache, make_key
+from joop.tests.test_web import MyHelloName
+
+class MyCachedHelloName(MyHelloName):
+    _render_cache = RenderCache(max_entries=2)
+
+class TestRenderCache(unittest.TestCase):
+
+    def setUp(self):
+        MyCachedHelloName._render_cache = RenderCache(max_entries=2)
+
+    def _render_name(self, first_name, last_name):
+        _component = MyCachedHelloName()
+        _component.inputs = MyCachedHelloName.Inputs(first_name = first_name,
+                                                      last_name = last_name)
+        _component.subs = MyCachedHelloName.SubComponents()
+        return _component.render()
+
+    def test_000_make_key(self):
+        _a = MyHelloName.Inputs(first_name = "Justin", last_name = "Rushin")
+        _b = MyHelloName.Inputs(first_name = "Justin", last_name = "Rushin")
+        assert make_key(_a) == make_key(_b)
+        assert hash(make_key(_a)) == hash(make_key(_b))
+        assert make_key({"a": [1, 2]}) != make_key({"a": [2, 1]})
+
+    def test_001_lru_eviction(self):
+        _cache = RenderCache(max_entries=2)
+        _cache.set("a", "1")
+        _cache.set("b", "2")
+        assert _cache.get("a") == "1"
+        _cache.set("c", "3")
+        assert _cache.get("b") is None
+        assert _cache.get("a") == "1"
+        assert _cache.stats() == {'entries': 2, 'bytes': 2, 'hits': 2,
+                                  'misses': 1, 'evictions': 1}
+
+    def test_002_byte_bound(self):
+        _cache = RenderCache(max_entries=10, max_bytes=5)
+        _cache.set("a", "123")
+        _cache.set("b", "456")
+        assert _cache.get("a") is None
+        assert _cache.current_bytes == 3
+        _cache.set("c", "too long")
+        assert _cache.get("c") is None
+
+    def test_003_ttl(self):
+        _cache = RenderCache(ttl=10)
+        with mock.patch("joop.web.cache.time.monotonic", return_value=0):
+            _cache.set("a", "1")
+            _cache.set("b", "2", ttl=100)
+        with mock.patch("joop.web.cache.time.monotonic", return_value=50):
+            assert _cache.get("a") is None
+            assert _cache.get("b") == "2"
+        assert _cache.current_bytes == 1
+
+    def test_004_component_cache(self):
+        _tgt_html = "<p>Hello, Justin Rushin!</p>"
+        with mock.patch.object(MyCachedHelloName.Data, "from_inputs",
+                               wraps=MyCachedHelloName.Data.from_inputs) as _from_inputs:
+            assert self._render_name("Justin", "Rushin") == _tgt_html
+            assert self._render_name("Justin", "Rushin") == _tgt_html
+            assert _from_inputs.call_count == 1
+            assert self._render_name("Jane", "Doe") == "<p>Hello, Jane Doe!</p>"
+            assert _from_inputs.call_count == 2
+        _stats = MyCachedHelloName._render_cache.stats()
+        assert _stats['hits'] == 1
+        assert _stats['misses'] == 2
+
+    def test_005_scalar_types(self):
+        assert len({make_key(1), make_key(True), make_key(1.0)}) == 3
+        assert make_key((1,)) != make_key((True,))
+        assert make_key({"a": 1}) != make_key({"a": 1.0})
+        MyCachedHelloName._render_cache = RenderCache(max_entries=8)
+        # Equal, but not the same: each renders on its own.
+        assert self._render_name(1, "x") == "<p>Hello, 1 x!</p>"
+        assert self._render_name(True, "x") == "<p>Hello, True x!</p>"
+        assert self._render_name(1.0, "x") == "<p>Hello, 1.0 x!</p>"
@@ -0,0 +1,116 @@
+"""Unit tests for compact (slots) and frozen component dataclasses."""
+
+import unittest
+from dataclasses import FrozenInstanceError
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent, RenderCache
+from joop.web.cache import make_key
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "row.html": "<tr><td>{{ data('label') }}</td>{{ subcomponent('cell') }}</tr>",
+            "cell.html": "<td>{{ data('value') }}</td>",
+        })
+    )
+
+class Cell(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "cell.html"
+    _compact = True
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+        value: int = 0
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls()
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class Row(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "row.html"
+    _compact = True
+    _frozen = True
+
+    class Inputs(HTMLComponent.Inputs):
+        label: str = ""
+
+    class Data(HTMLComponent.Data):
+        label: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls(label = inputs.label.upper())
+
+    class SubComponents(HTMLComponent.SubComponents):
+        cell: Cell = None
+
+        def __post_init__(self):
+            self.cell = Cell()
+
+class CachedRow(Row):
+    _render_cache = RenderCache()
+
+class TestCompactDataclasses(unittest.TestCase):
+
+    def _render(self, component_type, label):
+        _row = component_type()
+        _row.inputs = component_type.Inputs(label = label)
+        _row.subs = component_type.SubComponents()
+        return _row, _row.render()
+
+    def test_000_slots(self):
+        _row, _res = self._render(Row, "a")
+        assert _res == "<tr><td>A</td><td>0</td></tr>"
+        for _value in (_row.inputs, _row.data, _row.subs, _row.subs.cell.data):
+            assert not hasattr(_value, '__dict__')
+        with self.assertRaises(AttributeError):
+            _row.subs.cell.data.other = 1
+
+    def test_001_frozen(self):
+        _inputs = Row.Inputs(label = "a")
+        with self.assertRaises(FrozenInstanceError):
+            _inputs.label = "b"
+        assert hash(_inputs) == hash(Row.Inputs(label = "a"))
+        assert make_key(_inputs) is _inputs
+        # Equal values of different types get different keys.
+        assert make_key(Row.Inputs(label = 1)) != make_key(Row.Inputs(label = True))
+        # Subcomponents are not frozen, so their defaults can be set after init.
+        Row.SubComponents().cell = None
+
+    def test_002_inherited(self):
+        assert CachedRow.Inputs is Row.Inputs
+        assert self._render(CachedRow, "a")[1] == "<tr><td>A</td><td>0</td></tr>"
+        assert self._render(CachedRow, "a")[1] == "<tr><td>A</td><td>0</td></tr>"
+        assert CachedRow._render_cache.stats()['hits'] == 1
+
+    def test_003_super(self):
+        class SuperCell(Cell):
+
+            class Data(Cell.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return super()._from_inputs(inputs)
+
+        class SlottedCell(Cell):
+
+            class Data(Cell.Data):
+                __slots__ = ('extra',)
+
+        # Classes using zero-argument `super()` are not re-created with slots.
+        _cell = SuperCell()
+        _cell.inputs = SuperCell.Inputs()
+        _cell.subs = SuperCell.SubComponents()
+        assert _cell.render() == "<td>0</td>"
+        assert hasattr(_cell.data, '__dict__')
+        # Classes declaring their own slots are still made dataclasses.
+        assert '__dataclass_fields__' in SlottedCell.Data.__dict__
+        assert not hasattr(SlottedCell.Data(value = 2), '__dict__')
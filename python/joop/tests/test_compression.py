@@ -0,0 +1,43 @@
+"""Unit tests for pre-compressed rendered output."""
+
+import gzip
+import unittest
+import zlib
+
+from joop.web.cache import RenderCache
+from joop.web.compression import CompressedBody, choose_encoding
+
+_HTML = "<table>" + "<tr><td>row</td><td>value</td></tr>" * 200 + "</table>"
+
+class TestCompressedBody(unittest.TestCase):
+
+    def test_000_variants(self):
+        _body = CompressedBody(_HTML)
+        assert list(_body.variants) == ["identity", "gzip", "deflate"]
+        assert _body.variants["identity"] == _HTML.encode("utf-8")
+        assert gzip.decompress(_body.variants["gzip"]).decode("utf-8") == _HTML
+        assert zlib.decompress(_body.variants["deflate"]).decode("utf-8") == _HTML
+        assert len(_body.variants["gzip"]) * 10 < len(_HTML)
+        # Compression is deterministic, and each variant has its own ETag.
+        assert CompressedBody(_HTML).variants == _body.variants
+        assert len({_body.get_etag(_encoding) for _encoding in _body.variants}) == 3
+
+    def test_001_small_output(self):
+        _body = CompressedBody("<p>hi</p>")
+        assert list(_body.variants) == ["identity"]
+        assert _body.nbytes == len("<p>hi</p>")
+        _cache = RenderCache(max_bytes = 1024)
+        _cache.set("key", _body)
+        assert _cache.current_bytes == _body.nbytes
+
+    def test_002_accept_encoding(self):
+        _available = ["identity", "gzip", "deflate"]
+        assert choose_encoding(None, _available) == "identity"
+        assert choose_encoding("gzip, deflate, br", _available) == "gzip"
+        assert choose_encoding("deflate, gzip", _available) == "gzip"
+        assert choose_encoding("gzip;q=0.5, deflate", _available) == "deflate"
+        assert choose_encoding("gzip;q=0, deflate;q=0", _available) == "identity"
+        assert choose_encoding("*", _available) == "gzip"
+        assert choose_encoding("br", _available) == "identity"
+        assert choose_encoding("gzip", ["identity"]) == "identity"
+        assert choose_encoding("identity;q=0.5, deflate;q=0.1", _available) == "identity"
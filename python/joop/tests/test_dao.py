@@ -0,0 +1,423 @@
+"""Unit tests for DAOs over SQLModel tables."""
+
+import base64
+import copy
+import datetime
+import decimal
+import json
+import pickle
+import types
+import unittest
+import uuid
+from typing import Optional
+
+import pydantic
+import sqlalchemy
+import sqlmodel
+from jinja2 import DictLoader
+
+from joop.dao import DAO, SQLDAO, Page, _decode_cursor, _encode_cursor
+from joop.dao.columnar import ColumnarResult, numpy
+from joop.web.components import AlpineTableComponent
+from joop.web.etag import make_etag
+from joop.web.templater import EnvironmentFactory
+
+class AuditRow(sqlmodel.SQLModel, table=True):
+    __tablename__ = "joop_test_audit_row"
+
+    id: Optional[int] = sqlmodel.Field(default=None, primary_key=True)
+    action: str
+    actor: str = "system"
+
+class AuditDAO(SQLDAO):
+    _modeltype = AuditRow
+
+class TrustedAuditDAO(AuditDAO):
+    _trusted_rows = True
+
+class NoteRow(sqlmodel.SQLModel, table=True):
+    __tablename__ = "joop_test_note_row"
+
+    id: Optional[int] = sqlmodel.Field(default=None, primary_key=True)
+    text: str = sqlmodel.Field(sa_column=sqlalchemy.Column("note_text", sqlalchemy.String,
+                                                           nullable=False))
+
+class TrustedNoteDAO(SQLDAO):
+    _modeltype = NoteRow
+    _trusted_rows = True
+
+class Person(pydantic.BaseModel):
+    name: str = pydantic.Field(alias="Name")
+    age: int
+
+class PersonDAO(DAO):
+    _modeltype = Person
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "rows.html": "{% for row in data('rows') %}{{ row.to_dict()['action'] }};{% endfor %}",
+            "dicts.html": ("{% for row in data('rows') | row_dicts %}{{ row['action'] }};{% endfor %}"
+                           "{% for row in data('rows') | row_dicts %}{{ row['actor'] }};{% endfor %}"),
+            "page.html": ("{% for row in data('rows') %}{{ row.to_dict()['action'] }};{% endfor %}"
+                          "{% if data('next_cursor') %}next{% endif %}"),
+        })
+    )
+
+class TestDAO(unittest.TestCase):
+
+    def _people(self, count = 3):
+        return [PersonDAO.from_model(Person(Name=f"p{_index}", age=_index)) for _index in range(count)]
+
+    def test_000_to_dict(self):
+        assert self._people(1)[0].to_dict() == {"Name": "p0", "age": 0}
+        assert PersonDAO.get_model_fields() == ["Name", "age"]
+        with self.assertRaises(ValueError):
+            PersonDAO().to_dict()
+
+    def test_001_to_dicts(self):
+        _people = self._people()
+        assert PersonDAO.to_dicts(_people) == [_person.to_dict() for _person in _people]
+        assert PersonDAO.to_dicts([]) == []
+
+        class Other(pydantic.BaseModel):
+            x: int
+
+        _mixed = [*_people, DAO.from_model(Other(x=1))]
+        assert DAO.to_dicts(_mixed)[-1] == {"x": 1}
+
+    def test_002_iter_dicts(self):
+        _consumed = []
+
+        def _rows():
+            for _person in self._people(5):
+                _consumed.append(_person)
+                yield _person
+
+        _dicts = DAO.iter_dicts(_rows(), batch_size=2)
+        assert next(_dicts) == {"Name": "p0", "age": 0}
+        assert len(_consumed) == 2
+        assert [_dict["Name"] for _dict in _dicts] == ["p1", "p2", "p3", "p4"]
+
+    def test_003_render_row_dicts(self):
+        _people = self._people()
+
+        class PersonTable(AlpineTableComponent):
+            _jinja_env = EnvironmentFactory.create_environment(loader=DictLoader({
+                "people.html": ("{% for row in data('rows') | row_dicts %}{{ row['Name'] }};{% endfor %}"
+                                "{% for row in data('rows') | row_dicts %}{{ row['age'] }};{% endfor %}"),
+            }))
+            _template_location = "people.html"
+            _row_type = PersonDAO
+
+            class Inputs(AlpineTableComponent.Inputs):
+                pass
+
+            class Data(AlpineTableComponent.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return cls(rows = _people, table_headers = cls._get_table_headers())
+
+            class SubComponents(AlpineTableComponent.SubComponents):
+                pass
+
+        def _table():
+            _res = PersonTable()
+            _res.inputs = PersonTable.Inputs()
+            _res.subs = PersonTable.SubComponents()
+            return _res
+
+        # The rows can be iterated more than once, and the ETag only depends on them.
+        assert _table().render() == "p0;p1;p2;0;1;2;"
+        assert list(EnvironmentFactory.row_dicts(iter(_people))) == PersonDAO.to_dicts(_people)
+        assert list(EnvironmentFactory.row_dicts([])) == []
+        assert _table().get_etag() == _table().get_etag()
+        _etag = _table().get_etag()
+        _people[0] = PersonDAO.from_model(Person(Name="changed", age=0))
+        assert _table().get_etag() != _etag
+
+class TestColumnarResult(unittest.TestCase):
+
+    def _result(self, **kwargs):
+        return ColumnarResult.from_rows(["id", "Name"], [(_index, f"n{_index}") for _index in range(10)],
+                                        **kwargs)
+
+    def test_000_rows(self):
+        _result = self._result()
+        assert len(_result) == 10
+        assert _result[3]["Name"] == "n3" and _result[3].id == 3
+        assert _result[-1].to_dict() == {"id": 9, "Name": "n9"}
+        assert [_row.id for _row in _result] == list(range(10))
+        with self.assertRaises(IndexError):
+            _result[10]
+        assert ColumnarResult.from_rows(["id"], []).to_dicts() == []
+
+    def test_001_slices(self):
+        _result = self._result()
+        _window = _result[2:8][1:3]
+        assert _window._columns is _result._columns # No copy.
+        assert _window.to_dicts() == [{"id": 3, "Name": "n3"}, {"id": 4, "Name": "n4"}]
+        assert _window.column("Name") == ["n3", "n4"]
+        assert [_row.id for _row in _result[::-3]] == [9, 6, 3, 0]
+        assert list(_result[5:].iter_dicts(batch_size=2)) == _result[5:].to_dicts()
+        assert _result[8:].to_json() == '[{"id": 8, "Name": "n8"}, {"id": 9, "Name": "n9"}]'
+        assert len(_result[2:1]) == 0 and _result[2:1].to_dicts() == []
+        assert len(_result[5:8][2:0]) == 0
+
+    @unittest.skipIf(numpy is None, "numpy is not available")
+    def test_002_numpy(self):
+        _result = self._result(use_numpy=True)
+        assert isinstance(_result._columns["id"], numpy.ndarray)
+        assert isinstance(_result._columns["Name"], list)
+        assert _result[4:6].to_dicts() == [{"id": 4, "Name": "n4"}, {"id": 5, "Name": "n5"}]
+        assert type(_result.to_dicts()[0]["id"]) is int
+
+    @unittest.skipIf(numpy is not None, "numpy is available")
+    def test_003_without_numpy(self):
+        with self.assertRaises(ImportError):
+            self._result(use_numpy=True)
+
+    def test_004_json_values(self):
+        _result = ColumnarResult({"day": [datetime.date(2026, 1, 2)],
+                                  "price": [decimal.Decimal("1.50")]})
+        assert _result.to_json() == '[{"day": "2026-01-02", "price": "1.50"}]'
+        # Equal values give equal ETags, whatever the instance.
+        assert make_etag(_result) == make_etag(ColumnarResult(_result.to_columns()))
+        assert make_etag(_result) != make_etag(_result[:0])
+
+    def test_005_copy_and_repr(self):
+        _result = self._result()
+        for _row in (copy.copy(_result[3]), pickle.loads(pickle.dumps(_result[3]))):
+            assert _row.to_dict() == {"id": 3, "Name": "n3"}
+        with self.assertRaises(AttributeError):
+            _result[3].missing
+        # The repr stays short; ETags digest the values instead.
+        assert repr(_result) == "ColumnarResult(names=('id', 'Name'), rows=10)"
+        assert _result.digest() == self._result().digest()
+        assert _result.digest() != _result[1:].digest()
+        assert make_etag(_result[:2]) != make_etag(ColumnarResult.from_rows(
+            ["id", "Name"], [(0, "n0"), (1, "other")]))
+
+class TestSQLDAO(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.engine = sqlmodel.create_engine("sqlite://")
+        AuditRow.metadata.create_all(cls.engine, tables=[AuditRow.__table__, NoteRow.__table__])
+        with sqlmodel.Session(cls.engine) as session:
+            session.add_all(AuditRow(action=f"a{_index}", actor=f"u{_index % 3}")
+                            for _index in range(25))
+            session.add(NoteRow(text="note"))
+            session.commit()
+
+    def test_000_get_all(self):
+        with sqlmodel.Session(self.engine) as session:
+            _rows = AuditDAO.get_all(session)
+        assert [_row.model.action for _row in _rows] == [f"a{_index}" for _index in range(25)]
+
+    def test_001_iter_all(self):
+        with sqlmodel.Session(self.engine) as session:
+            _rows = AuditDAO.iter_all(session, batch_size=10)
+            assert isinstance(_rows, types.GeneratorType)
+            _first = next(_rows)
+            assert isinstance(_first, AuditDAO) and _first.model.action == "a0"
+            assert [_row.model.action for _row in _rows] == [f"a{_index}" for _index in range(1, 25)]
+        with self.assertRaises(ValueError):
+            AuditDAO.iter_all(None, batch_size=0)
+
+    def test_002_render_streamed_rows(self):
+        class AuditTable(AlpineTableComponent):
+            _jinja_env = environment
+            _template_location = "rows.html"
+            _row_type = AuditDAO
+
+            class Inputs(AlpineTableComponent.Inputs):
+                pass
+
+            class Data(AlpineTableComponent.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return cls(rows = AuditDAO.iter_all(session, batch_size=4),
+                               table_headers = cls._get_table_headers())
+
+            class SubComponents(AlpineTableComponent.SubComponents):
+                pass
+
+        with sqlmodel.Session(self.engine) as session:
+            _table = AuditTable()
+            _table.inputs = AuditTable.Inputs()
+            _table.subs = AuditTable.SubComponents()
+            assert _table.render() == "".join(f"a{_index};" for _index in range(25))
+
+    def _walk(self, session, **kwargs):
+        """Page through the table forward, then back, and return the actions of each page."""
+        _forward, _backward = [], []
+        _page = AuditDAO.get_page(session, page_size=10, **kwargs)
+        _forward.append([_row.model.action for _row in _page.rows])
+        assert not _page.has_previous
+        while _page.has_next:
+            _page = AuditDAO.get_page(session, cursor=_page.next_cursor, page_size=10, **kwargs)
+            _forward.append([_row.model.action for _row in _page.rows])
+        while _page.has_previous:
+            _page = AuditDAO.get_page(session, cursor=_page.previous_cursor, page_size=10, **kwargs)
+            _backward.insert(0, [_row.model.action for _row in _page.rows])
+        return _forward, _backward
+
+    def test_003_keyset_pages(self):
+        with sqlmodel.Session(self.engine) as session:
+            _forward, _backward = self._walk(session)
+            assert [len(_actions) for _actions in _forward] == [10, 10, 5]
+            assert sum(_forward, []) == [f"a{_index}" for _index in range(25)]
+            assert _backward == _forward[:-1]
+
+            # Multi-column, descending order.
+            _forward, _backward = self._walk(session, order_by=["actor"], descending=True)
+            _expected = sorted(session.exec(sqlmodel.select(AuditRow)).all(),
+                               key=lambda _row: (_row.actor, _row.id), reverse=True)
+            assert sum(_forward, []) == [_row.action for _row in _expected]
+            assert _backward == _forward[:-1]
+
+    def test_004_offset_pages(self):
+        with sqlmodel.Session(self.engine) as session:
+            _forward, _backward = self._walk(session, keyset=False)
+            assert sum(_forward, []) == [f"a{_index}" for _index in range(25)]
+            assert _backward == _forward[:-1]
+
+    def test_005_invalid_cursor(self):
+        with sqlmodel.Session(self.engine) as session:
+            _cursor = AuditDAO.get_page(session, page_size=10).next_cursor
+            with self.assertRaises(ValueError):
+                AuditDAO.get_page(session, cursor=_cursor, order_by=["actor"])
+            with self.assertRaises(ValueError):
+                AuditDAO.get_page(session, cursor="not a cursor")
+            with self.assertRaises(ValueError):
+                AuditDAO.get_page(session, order_by=["missing"])
+            for _state in ({'order': ["id"], 'desc': False, 'key': [3]},
+                           {'order': ["id"], 'desc': False, 'key': [3], 'backward': 1},
+                           {'order': ["id"], 'desc': False, 'key': [[3]], 'backward': False},
+                           {'order': ["id"], 'desc': False, 'offset': True},
+                           {'order': ["id"], 'desc': False, 'offset': 0, 'key': [3]}):
+                _json = json.dumps(_state).encode()
+                with self.assertRaises(ValueError):
+                    AuditDAO.get_page(session, cursor=base64.urlsafe_b64encode(_json).decode())
+        # Order values JSON does not support round-trip as strings; others are rejected.
+        _key = [datetime.datetime(2026, 1, 2, 3, 4), decimal.Decimal("1.50"), uuid.UUID(int=7)]
+        _cursor = _encode_cursor(["at", "price", "ref"], False, key=_key)
+        assert _decode_cursor(_cursor, ["at", "price", "ref"], False)['key'] == [
+            "2026-01-02T03:04:00", "1.50", "00000000-0000-0000-0000-000000000007"]
+        with self.assertRaises(ValueError):
+            _encode_cursor(["blob"], False, key=[object()])
+
+    def test_006_render_page(self):
+        class AuditPageTable(AlpineTableComponent):
+            _jinja_env = environment
+            _template_location = "page.html"
+            _row_type = AuditDAO
+
+            class Inputs(AlpineTableComponent.Inputs):
+                cursor: Optional[str] = None
+
+            class Data(AlpineTableComponent.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return cls._from_page(AuditDAO.get_page(session, cursor=inputs.cursor,
+                                                            page_size=20))
+
+            class SubComponents(AlpineTableComponent.SubComponents):
+                pass
+
+        with sqlmodel.Session(self.engine) as session:
+            _table = AuditPageTable()
+            _table.inputs = AuditPageTable.Inputs()
+            _table.subs = AuditPageTable.SubComponents()
+            assert _table.render() == "".join(f"a{_index};" for _index in range(20)) + "next"
+            _cursor = _table.data.next_cursor
+            _table.inputs = AuditPageTable.Inputs(cursor=_cursor)
+            assert _table.render() == "".join(f"a{_index};" for _index in range(20, 25))
+            assert isinstance(AuditDAO.get_page(session), Page)
+
+    def test_007_get_columnar(self):
+        with sqlmodel.Session(self.engine) as session:
+            _result = AuditDAO.get_columnar(session, order_by=["actor"], limit=10)
+            _expected = [_row.to_dict() for _row in AuditDAO.get_all(session)]
+        _expected.sort(key=lambda _row: (_row["actor"], _row["id"]))
+        assert _result.names == ("id", "action", "actor")
+        assert _result.to_dicts() == _expected[:10]
+
+        class AuditTable(AlpineTableComponent):
+            _jinja_env = environment
+            _template_location = "dicts.html"
+            _row_type = AuditDAO
+
+            class Inputs(AlpineTableComponent.Inputs):
+                pass
+
+            class Data(AlpineTableComponent.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return cls(rows = _result[:3], table_headers = cls._get_table_headers())
+
+            class SubComponents(AlpineTableComponent.SubComponents):
+                pass
+
+        _table = AuditTable()
+        _table.inputs = AuditTable.Inputs()
+        _table.subs = AuditTable.SubComponents()
+        assert _table.render() == ("".join(f"{_row['action']};" for _row in _expected[:3]) +
+                                   "".join(f"{_row['actor']};" for _row in _expected[:3]))
+
+    def test_008_trusted_rows(self):
+        with sqlmodel.Session(self.engine) as session:
+            _expected = [_row.to_dict() for _row in AuditDAO.get_all(session)]
+        with sqlmodel.Session(self.engine) as session:
+            _rows = TrustedAuditDAO.get_all(session)
+            assert [_row.to_dict() for _row in _rows] == _expected
+            assert isinstance(_rows[0].model, AuditRow)
+            assert len(session.identity_map) == 0 # Not tracked by the ORM.
+            assert [_row.to_dict() for _row in TrustedAuditDAO.iter_all(session, batch_size=7)] == _expected
+            _page = TrustedAuditDAO.get_page(session, page_size=10, order_by=["actor"])
+            _page = TrustedAuditDAO.get_page(session, cursor=_page.next_cursor, page_size=10,
+                                             order_by=["actor"])
+            _sorted = sorted(_expected, key=lambda _row: (_row["actor"], _row["id"]))
+            assert [_row.to_dict() for _row in _page.rows] == _sorted[10:20]
+
+    def test_009_trusted_fields(self):
+        class ActionDAO(TrustedAuditDAO):
+            _trusted_fields = ["action"]
+
+        with sqlmodel.Session(self.engine) as session:
+            _rows = ActionDAO.get_all(session)
+            # The primary key is always selected; unselected fields keep their defaults.
+            assert _rows[1].to_dict() == {"id": 2, "action": "a1", "actor": "system"}
+            _page = ActionDAO.get_page(session, page_size=5, order_by=["actor"])
+            assert _page.rows[0].model.actor == "u0"
+
+            class WrongDAO(TrustedAuditDAO):
+                _trusted_fields = ["missing"]
+
+            with self.assertRaises(ValueError):
+                WrongDAO.get_all(session)
+
+            # `action` has no default, so it must be selected.
+            class ActorDAO(TrustedAuditDAO):
+                _trusted_fields = ["actor"]
+
+            with self.assertRaises(ValueError):
+                ActorDAO.get_all(session)
+
+    def test_010_trusted_column_names(self):
+        class TextDAO(TrustedNoteDAO):
+            _trusted_fields = ["text"]
+
+        with sqlmodel.Session(self.engine) as session:
+            # Columns are mapped to the fields they belong to, whatever their names.
+            assert [_row.to_dict() for _row in TrustedNoteDAO.get_all(session)] == [
+                {"id": 1, "text": "note"}]
+            assert TextDAO.get_all(session)[0].model.text == "note"
+            _result = session.execute(sqlalchemy.select(NoteRow.__table__.c.id,
+                                                        sqlalchemy.literal(1).label("other")))
+            with self.assertRaises(ValueError):
+                TrustedNoteDAO._load_models(_result)
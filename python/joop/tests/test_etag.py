@@ -0,0 +1,168 @@
+"""Unit tests for computing ETags of component output without rendering it."""
+
+import tempfile
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent, RenderCache, invalidate_templates
+from joop.web.etag import etag_matches, make_etag
+from joop.web.templater import EnvironmentFactory
+
+_templates = {
+    "item.html": "<li>{{ data('label') }}</li>",
+    "list.html": "<ul>{{ subcomponent('first') }}{% include 'footer.html' %}</ul>",
+    "footer.html": "<hr>",
+    "part.html": "{{ subcomponent('first') }}",
+    "dynamic_include.html": "<ul>{% set p = 'part.html' %}{% include p %}</ul>",
+    "joop_sc.html": "<ul>{{ joop.sc['first'] }}</ul>",
+}
+environment = EnvironmentFactory.create_environment(loader=DictLoader(_templates))
+
+_from_inputs = []
+
+class Item(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "item.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        label: str = "default"
+
+    class Data(HTMLComponent.Data):
+        label: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _from_inputs.append(inputs.label)
+            return cls(label = inputs.label)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class CustomItem(Item):
+
+    def render(self, as_subcomponent = False, **kwargs):
+        return super().render(as_subcomponent, **kwargs).upper()
+
+class List(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "list.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        first: Item = None
+
+        def __post_init__(self):
+            self.first = Item()
+
+_stored = {"label": "stored"}
+
+class StoredItem(Item):
+    _render_cache = RenderCache()
+
+    class Data(Item.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _from_inputs.append(_stored["label"])
+            return cls(label = _stored["label"])
+
+class TestETag(unittest.TestCase):
+
+    def _item(self, label, component_type = Item):
+        _item = component_type()
+        _item.inputs = component_type.Inputs(label = label)
+        _item.subs = component_type.SubComponents()
+        return _item
+
+    def _list(self, component_type = List):
+        _list = component_type()
+        _list.inputs = component_type.Inputs()
+        _list.subs = component_type.SubComponents()
+        return _list
+
+    def test_000_data_digest(self):
+        _etag = self._item("a").get_etag()
+        assert _etag.startswith('"') and _etag.endswith('"')
+        assert self._item("a").get_etag() == _etag
+        assert self._item("b").get_etag() != _etag
+        assert self._item("a", CustomItem).get_etag() is None
+
+    def test_001_no_template_render(self):
+        _list = self._list()
+        _etag = _list.get_etag()
+        # The subcomponent's data is processed to compute the ETag.
+        assert _from_inputs[-1] == "default"
+        assert _list.render() == "<ul><li>default</li><hr></ul>"
+        assert self._list().get_etag() == _etag
+
+    def test_002_template_version(self):
+        _etag = self._list().get_etag()
+        _templates["footer.html"] = "<hr/>"
+        try:
+            invalidate_templates(environment)
+            assert self._list().get_etag() != _etag
+        finally:
+            _templates["footer.html"] = "<hr>"
+            invalidate_templates(environment)
+        assert self._list().get_etag() == _etag
+
+    def test_003_if_none_match(self):
+        _etag = make_etag("<p>body</p>")
+        assert etag_matches(_etag, _etag)
+        assert etag_matches(f'"other", W/{_etag}', _etag)
+        assert etag_matches("*", _etag)
+        assert not etag_matches('"other"', _etag)
+        assert not etag_matches(None, _etag)
+
+    def test_004_unresolvable_references(self):
+        for _template_name in ("dynamic_include.html", "joop_sc.html"):
+            class DynamicList(List):
+                _template_location = _template_name
+
+                class SubComponents(List.SubComponents):
+
+                    def __post_init__(self):
+                        self.first = StoredItem()
+
+            _etag = self._list(DynamicList).get_etag()
+            _stored["label"] = "changed"
+            try:
+                assert self._list(DynamicList).get_etag() != _etag
+            finally:
+                _stored["label"] = "stored"
+
+        with tempfile.TemporaryDirectory() as target:
+            EnvironmentFactory.compile_templates(environment, target, ["list.html"])
+
+            class PrecompiledList(List):
+                _jinja_env = EnvironmentFactory.create_environment(precompiled_path = target)
+
+            assert self._list(PrecompiledList).get_etag() == self._list(PrecompiledList).get_etag()
+
+    def test_005_render_processed_tree(self):
+        _from_inputs.clear()
+        _tree = self._list().process_tree()
+        _etag = _tree.get_etag()
+        assert _tree.render() == "<ul><li>default</li><hr></ul>"
+        assert _from_inputs == ["default"]
+        assert _tree.get_etag() == _etag
+
+    def test_006_render_cache_bypassed(self):
+        _item = self._item("a", StoredItem)
+        assert _item.render() == "<li>stored</li>"
+        _etag = _item.get_etag()
+        _stored["label"] = "changed"
+        try:
+            _tree = self._item("a", StoredItem).process_tree()
+            assert _tree.get_etag() != _etag
+            assert _tree.render() == "<li>changed</li>"
+        finally:
+            _stored["label"] = "stored"
@@ -0,0 +1,220 @@
+"""Unit tests for flattened rendering of component trees."""
+
+import tempfile
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent, invalidate_templates
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "card.html": "<p>{{ data('title') }}</p>",
+            "section.html": ("<section>{% for i in range(2) %}{{ subcomponent('card') }}{% endfor %}"
+                             "{% cache 'footer' %}<i>{{ data('name') }}</i>{% endcache %}</section>"),
+            "page.html": ("<main>{{ data('name') }}{{ subcomponent('first') }}"
+                          "{% if data('show') %}{{ subcomponent('second') }}{% endif %}"
+                          "{{ subcomponent('other') }}</main>"),
+            "other.html": "{% include 'card.html' %}",
+            "alpha.html": "{% cache 'rows' %}A{{ data('name') }}{% endcache %}{{ subcomponent('card') }}",
+            "beta.html": "{% cache 'rows' %}B{{ data('name') }}{% endcache %}{{ subcomponent('card') }}",
+        }),
+        autoescape=True,
+    )
+
+class Card(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "card.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+        title: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls(title = "<card>")
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class Section(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "section.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+        name: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls(name = "section")
+
+    class SubComponents(HTMLComponent.SubComponents):
+        card: Card = None
+
+        def __post_init__(self):
+            self.card = Card()
+
+class Other(Card):
+    # Includes another template, so it is rendered the usual way.
+    _template_location = "other.html"
+
+class Page(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "page.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        show: bool = True
+
+    class Data(HTMLComponent.Data):
+        name: str
+        show: bool
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls(name = "page", show = inputs.show)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        first: Section = None
+        second: Section = None
+        other: Other = None
+
+        def __post_init__(self):
+            self.first = Section()
+            self.second = Section()
+            self.other = Other()
+
+class FlatPage(Page):
+    _flatten = True
+
+_EXPECTED = ("<main>page"
+             "<section><p>&lt;card&gt;</p><p>&lt;card&gt;</p><i>section</i></section>"
+             "<section><p>&lt;card&gt;</p><p>&lt;card&gt;</p><i>section</i></section>"
+             "<p>&lt;card&gt;</p></main>")
+
+class TestFlattenedRender(unittest.TestCase):
+
+    def _make(self, component_type, show = True):
+        _page = component_type()
+        _page.inputs = component_type.Inputs(show = show)
+        _page.subs = component_type.SubComponents()
+        return _page
+
+    def test_000_same_output(self):
+        assert self._make(Page).render() == _EXPECTED
+        assert self._make(FlatPage).render() == _EXPECTED
+        assert "".join(self._make(FlatPage).stream()) == _EXPECTED
+
+    def test_001_single_template_pass(self):
+        _page = self._make(FlatPage)
+        _page.render()
+        # Inlined subcomponents never load a template of their own.
+        assert not hasattr(_page.subs.first, '_loaded_template')
+        assert not hasattr(_page.subs.first.subs.card, '_loaded_template')
+        assert _page.subs.first.data.name == "section"
+        # Templates that are not self-contained are rendered separately.
+        assert hasattr(_page.subs.other, '_loaded_template')
+
+    def test_002_lazy_and_fallback(self):
+        _page = self._make(FlatPage, show = False)
+        _page.render()
+        assert not hasattr(_page.subs.second, 'data')
+
+        class CustomSection(Section):
+            _template_location = "card.html"
+
+        # An instance of another type than the annotated one is rendered the usual way.
+        _page = self._make(FlatPage)
+        _page.subs.second = CustomSection()
+        assert _page.render() == ("<main>page"
+            "<section><p>&lt;card&gt;</p><p>&lt;card&gt;</p><i>section</i></section>"
+            "<p></p><p>&lt;card&gt;</p></main>")
+        assert hasattr(_page.subs.second, '_loaded_template')
+
+    def test_003_invalidate(self):
+        class PinnedPage(FlatPage):
+            _pin_template = True
+
+        _first = self._make(PinnedPage)
+        _first.render()
+        invalidate_templates(environment, ["card.html"])
+        _second = self._make(PinnedPage)
+        assert _second.render() == _EXPECTED
+        assert _second._loaded_template is not _first._loaded_template
+
+    def test_004_cache_keys_per_template(self):
+        class Alpha(Section):
+            _template_location = "alpha.html"
+            _flatten = True
+
+            class Inputs(Page.Inputs):
+                pass
+
+            class Data(Section.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return cls(name = "alpha")
+
+        class Beta(Alpha):
+            _template_location = "beta.html"
+
+            class Data(Section.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return cls(name = "beta")
+
+        assert self._make(Alpha).render() == "Aalpha<p>&lt;card&gt;</p>"
+        assert self._make(Beta).render() == "Bbeta<p>&lt;card&gt;</p>"
+
+    def test_005_precompiled(self):
+        with tempfile.TemporaryDirectory() as target:
+            EnvironmentFactory.compile_templates(environment, target, ["page.html"])
+            _env = EnvironmentFactory.create_environment(precompiled_path = target,
+                                                         autoescape = True)
+
+            class PrecompiledPage(FlatPage):
+                _jinja_env = _env
+
+            # Templates without a source are rendered the usual way.
+            assert self._make(PrecompiledPage).render() == _EXPECTED
+
+    def test_006_auto_reload(self):
+        _templates = {"item.html": "<b>{{ data('title') }}</b>",
+                      "list.html": "<ul>{{ subcomponent('item') }}</ul>"}
+        _env = EnvironmentFactory.create_environment(loader = DictLoader(_templates),
+                                                     auto_reload = True)
+
+        class Item(Card):
+            _jinja_env = _env
+            _template_location = "item.html"
+
+        class List(Section):
+            _jinja_env = _env
+            _template_location = "list.html"
+            _flatten = True
+
+            class Inputs(Page.Inputs):
+                pass
+
+            class SubComponents(HTMLComponent.SubComponents):
+                item: Item = None
+
+                def __post_init__(self):
+                    self.item = Item()
+
+        _first = self._make(List)
+        assert _first.render() == "<ul><b><card></b></ul>"
+        _same = self._make(List)
+        _same.render()
+        assert _same._loaded_template is _first._loaded_template
+        # Without pinning, edits to any template of the tree show up, as with `auto_reload`.
+        _templates["item.html"] = "<i>{{ data('title') }}</i>"
+        _second = self._make(List)
+        assert _second.render() == "<ul><i><card></i></ul>"
+        assert _second._loaded_template is not _first._loaded_template
@@ -0,0 +1,65 @@
+"""Unit tests for the `cache` fragment cache tag."""
+
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+from jinja2 import DictLoader
+
+from joop.web.templater import EnvironmentFactory
+from joop.web.fragment_cache import DiskFragmentCache
+
+_TEMPLATES = {
+    "fragment.html": ("<h1>{{ data('title') }}</h1>"
+                      "{% cache 'rows-' ~ data('name'), 60 %}<p>{{ counter() }}</p>{% endcache %}"),
+}
+
+class TestFragmentCache(unittest.TestCase):
+
+    def _make_env(self, **kwargs):
+        _env = EnvironmentFactory.create_environment(loader=DictLoader(_TEMPLATES), **kwargs)
+        self._count = 0
+
+        def counter():
+            self._count += 1
+            return self._count
+
+        _env.globals['counter'] = counter
+        return _env
+
+    def _render(self, env, title, name):
+        return env.get_template("fragment.html").render(
+            joop={'data': {'title': title, 'name': name}})
+
+    def test_000_memory_backend(self):
+        _env = self._make_env()
+        assert self._render(_env, "a", "x") == "<h1>a</h1><p>1</p>"
+        # The surrounding markup stays dynamic; the fragment is cached per key.
+        assert self._render(_env, "b", "x") == "<h1>b</h1><p>1</p>"
+        assert self._render(_env, "b", "y") == "<h1>b</h1><p>2</p>"
+        assert _env.fragment_cache.stats()['hits'] == 1
+
+    def test_001_ttl(self):
+        _env = self._make_env()
+        with mock.patch("joop.web.cache.time.monotonic", return_value=0):
+            assert self._render(_env, "a", "x") == "<h1>a</h1><p>1</p>"
+        with mock.patch("joop.web.cache.time.monotonic", return_value=61):
+            assert self._render(_env, "a", "x") == "<h1>a</h1><p>2</p>"
+
+    def test_002_disk_backend(self):
+        with tempfile.TemporaryDirectory() as _dir:
+            _env = self._make_env(fragment_cache=DiskFragmentCache(_dir))
+            assert self._render(_env, "a", "x") == "<h1>a</h1><p>1</p>"
+            # A second environment (ex. another worker) shares the fragments.
+            _other_env = self._make_env(fragment_cache=DiskFragmentCache(_dir))
+            assert self._render(_other_env, "b", "x") == "<h1>b</h1><p>1</p>"
+            _other_env.fragment_cache.clear()
+            assert self._render(_other_env, "b", "x") == "<h1>b</h1><p>1</p>"
+            assert self._count == 1
+
+    def test_003_async(self):
+        _env = self._make_env(enable_async=True)
+        _template = _env.get_template("fragment.html")
+        _joop = {'data': {'title': "a", 'name': "x"}}
+        assert asyncio.run(_template.render_async(joop=_joop)) == "<h1>a</h1><p>1</p>"
+        assert asyncio.run(_template.render_async(joop=_joop)) == "<h1>a</h1><p>1</p>"
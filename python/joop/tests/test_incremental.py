@@ -0,0 +1,98 @@
+"""Unit tests for incremental re-rendering of long-lived component trees."""
+
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "widget.html": "<li>{{ data('label') }}</li>",
+            "page.html": "<ul>{{ subcomponent('first') }}{{ subcomponent('second') }}</ul>",
+        })
+    )
+
+_rendered = []
+
+class Widget(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "widget.html"
+    _incremental = True
+
+    class Inputs(HTMLComponent.Inputs):
+        label: str = ""
+
+    class Data(HTMLComponent.Data):
+        label: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _rendered.append(inputs.label)
+            return cls(label = inputs.label)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class Page(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "page.html"
+    _incremental = True
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _rendered.append("page")
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        first: Widget = None
+        second: Widget = None
+
+class TestIncrementalRender(unittest.TestCase):
+
+    def setUp(self):
+        _rendered.clear()
+        self.first = Widget()
+        self.first.inputs = Widget.Inputs(label = "a")
+        self.first.subs = Widget.SubComponents()
+        self.second = Widget()
+        self.second.inputs = Widget.Inputs(label = "b")
+        self.second.subs = Widget.SubComponents()
+        self.page = Page()
+        self.page.inputs = Page.Inputs()
+        self.page.subs = Page.SubComponents(first = self.first, second = self.second)
+
+    def test_000_clean_tree_reused(self):
+        assert self.page.render() == "<ul><li>a</li><li>b</li></ul>"
+        assert _rendered == ["page", "a", "b"]
+        assert self.page.render() == "<ul><li>a</li><li>b</li></ul>"
+        assert _rendered == ["page", "a", "b"]
+
+    def test_001_dirty_path_only(self):
+        self.page.render()
+        _rendered.clear()
+        self.second.inputs = Widget.Inputs(label = "c")
+        assert self.page.render() == "<ul><li>a</li><li>c</li></ul>"
+        # Only the changed widget and its ancestors are rendered again.
+        assert _rendered == ["page", "c"]
+
+    def test_002_mark_dirty(self):
+        self.page.render()
+        _rendered.clear()
+        self.first.inputs.label = "d"
+        assert self.page.render() == "<ul><li>a</li><li>b</li></ul>"
+        self.first.mark_dirty()
+        assert self.page.render() == "<ul><li>d</li><li>b</li></ul>"
+        assert _rendered == ["page", "d"]
+
+    def test_003_no_subcomponents(self):
+        self.page.render()
+        # Ex. views with `_get_default_subs = False` assign None.
+        self.page.subs = None
+        assert self.page.subs is None
+        assert self.page._dirty
@@ -0,0 +1,150 @@
+"""Unit tests for iterative, recursion-free rendering of deep component trees."""
+
+import sys
+import tempfile
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "leaf.html": "<i>{{ data('n') }}</i>",
+            "node.html": "<div>{{ data('n') }}{{ subcomponent('child') }}</div>",
+            "custom.html": "<b>custom</b>",
+            "page.html": ("<main>{{ subcomponent('first') }}"
+                          "{% if false %}{{ subcomponent('hidden') }}{% endif %}"
+                          "{{ subcomponent('custom') }}{{ subcomponent('second') }}</main>"),
+            "part.html": "{{ subcomponent('first') }}",
+            "dynamic_include.html": "{% set p = 'part.html' %}[{% include p %}]",
+            "joop_sc.html": "[{{ joop.sc['first'] }}]",
+        })
+    )
+
+class Leaf(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "leaf.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        n: int = 0
+
+    class Data(HTMLComponent.Data):
+        n: int
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls(n = inputs.n)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class Node(Leaf):
+    _template_location = "node.html"
+
+    class Inputs(Leaf.Inputs):
+        pass
+
+    class Data(Leaf.Data):
+        pass
+
+    class SubComponents(HTMLComponent.SubComponents):
+        child: Leaf = None
+
+        def __post_init__(self):
+            self.child = Leaf()
+
+class Custom(Leaf):
+    _template_location = "custom.html"
+
+    def render(self, as_subcomponent = False, **kwargs):
+        return "[" + super().render(as_subcomponent, **kwargs) + "]"
+
+class Page(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "page.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        first: Node = None
+        hidden: Leaf = None
+        custom: Custom = None
+        second: Node = None
+
+        def __post_init__(self):
+            self.first = Node()
+            self.hidden = Leaf()
+            self.custom = Custom()
+            self.second = Node()
+
+class IncrementalLeaf(Leaf):
+    _incremental = True
+
+class IncrementalNode(Node):
+    _incremental = True
+
+    class SubComponents(HTMLComponent.SubComponents):
+        child: Leaf = None
+
+class TestIterativeRender(unittest.TestCase):
+
+    def _page(self, component_type = Page):
+        _page = component_type()
+        _page.inputs = component_type.Inputs()
+        _page.subs = component_type.SubComponents()
+        return _page
+
+    def test_000_same_output(self):
+        _expected = self._page().render()
+        assert _expected == ("<main><div>0<i>0</i></div>[<b>custom</b>]"
+                             "<div>0<i>0</i></div></main>")
+        assert self._page().render_iterative() == _expected
+
+    def test_001_opt_in(self):
+        class IterativePage(Page):
+            _iterative = True
+
+        assert self._page(IterativePage).render() == self._page().render()
+
+    def test_002_deep_tree(self):
+        _depth = sys.getrecursionlimit() * 5
+        _node = IncrementalLeaf()
+        _node.inputs = IncrementalLeaf.Inputs(n = _depth)
+        _node.subs = IncrementalLeaf.SubComponents()
+        for _n in range(_depth - 1, -1, -1):
+            _parent = IncrementalNode()
+            _parent.inputs = IncrementalNode.Inputs(n = _n)
+            _parent.subs = IncrementalNode.SubComponents(child = _node)
+            _node = _parent
+        _res = _node.render_iterative()
+        assert _res.startswith("<div>0<div>1<div>2")
+        assert _res.count("<div>") == _depth
+        assert _res.endswith(f"<i>{_depth}</i>" + "</div>" * _depth)
+
+        # Clean components reuse their output; a change re-renders up to the root.
+        _node.subs.child.inputs = IncrementalNode.Inputs(n = -1)
+        assert _node.render_iterative().startswith("<div>0<div>-1<div>2")
+
+    def test_003_unresolvable_references(self):
+        with tempfile.TemporaryDirectory() as target:
+            EnvironmentFactory.compile_templates(environment, target, ["page.html", "node.html",
+                                                                       "leaf.html", "custom.html"])
+            _precompiled_env = EnvironmentFactory.create_environment(precompiled_path = target)
+            for _template_name, _env in (("dynamic_include.html", environment),
+                                         ("joop_sc.html", environment),
+                                         ("page.html", _precompiled_env)):
+                class DynamicPage(Page):
+                    _jinja_env = _env
+                    _template_location = _template_name
+
+                _expected = self._page(DynamicPage).render()
+                assert "<div>0<i>0</i></div>" in _expected
+                assert self._page(DynamicPage).render_iterative() == _expected
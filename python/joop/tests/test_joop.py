@@ -3,10 +3,16 @@
 """High-level test suite. Currently, verifies that the CLI works.."""
 
 
+import json
+import os
+import tempfile
 import unittest
 from click.testing import CliRunner
 
 from joop.cli import main
+from joop.web.html import HTMLComponent
+from joop.web.templater import EnvironmentFactory
+from joop.tests.test_templater import WEB_TEMPLATES_ROOT
 
 
 class TestJoop(unittest.TestCase):
@@ -27,3 +33,68 @@ class TestJoop(unittest.TestCase):
         help_result = runner.invoke(main, ['--help'])
         assert help_result.exit_code == 0
         assert '--help      Show this message and exit.' in help_result.output
+
+    def test_002_compile_templates(self):
+        """Test precompiling templates and loading them without their sources."""
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as target:
+            result = runner.invoke(main, ['compile-templates', target,
+                                          '--templates', str(WEB_TEMPLATES_ROOT),
+                                          '--module', 'joop.web.examples.table'])
+            assert result.exit_code == 0, result.output
+            assert 'Compiled' in result.output
+            env = EnvironmentFactory.create_environment(precompiled_path=target)
+            template = env.get_template('hello_name.html')
+            assert template.render(joop={'data': {'full_name': 'Justin Rushin'}}) == \
+                '<p>Hello, Justin Rushin!</p>'
+            # Templates of every registered component were compiled:
+            env.get_template('table/page.html')
+            env.get_template('table/alp_table.html')
+            # Autoescaping is fixed when compiling, so a mismatch is refused.
+            with self.assertRaises(ValueError):
+                EnvironmentFactory.create_environment(precompiled_path=target, autoescape=True)
+
+    def test_003_bench(self):
+        """Test the benchmark command and its machine-readable results."""
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as target:
+            output = os.path.join(target, "bench.json")
+            result = runner.invoke(main, ['bench', '-n', '5', '--warmup', '1',
+                                          '--templates', str(WEB_TEMPLATES_ROOT),
+                                          '--depth', '2', '--rows', '3', '-o', output])
+            assert result.exit_code == 0, result.output
+            with open(output) as f:
+                document = json.load(f)
+        names = [_result['name'] for _result in document['results']]
+        assert names[:4] == ['hello_world', 'hello_name', 'nested_tree', 'alpine_table']
+        for _result in document['results']:
+            assert _result['iterations'] == 5
+            assert _result['ops_per_sec'] > 0
+            assert _result['latencies']['p50'] <= _result['latencies']['p99']
+        assert document['parameters']['depth'] == 2
+        result = runner.invoke(main, ['bench', '-s', 'unknown'])
+        assert result.exit_code != 0
+        result = runner.invoke(main, ['bench', '-s', 'nested_tree', '--depth', '0'])
+        assert result.exit_code == 2, result.output
+        # The benchmark's components do not register their templates.
+        assert not [_name for _name in HTMLComponent.get_registered_templates()
+                    if _name.startswith("bench/")]
+
+    def test_004_compile_templates_autoescape(self):
+        """Test that precompiled templates escape values like templates from source."""
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as target:
+            result = runner.invoke(main, ['compile-templates', target, '--autoescape',
+                                          '--templates', str(WEB_TEMPLATES_ROOT),
+                                          '--module', 'joop.web.examples.table'])
+            assert result.exit_code == 0, result.output
+            env = EnvironmentFactory.create_environment(precompiled_path=target, autoescape=True)
+            template = env.get_template('hello_name.html')
+            assert template.render(joop={'data': {'full_name': '<script>'}}) == \
+                '<p>Hello, &lt;script&gt;!</p>'
+            with self.assertRaises(ValueError):
+                EnvironmentFactory.create_environment(precompiled_path=target)
+        with tempfile.TemporaryDirectory() as target:
+            # Directories without recorded options are refused too.
+            with self.assertRaises(ValueError):
+                EnvironmentFactory.create_environment(precompiled_path=target)
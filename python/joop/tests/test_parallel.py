@@ -0,0 +1,115 @@
+"""Unit tests for parallel subcomponent rendering."""
+
+import os
+import threading
+import unittest
+from unittest import mock
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent
+from joop.web.templater import EnvironmentFactory
+from joop.web.parallel import RENDER_WORKERS_ENV
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "a.html": "<a>",
+            "b.html": "<b>",
+            "c.html": "<c>",
+            "dashboard.html": "{{ subcomponent('a') }}{{ subcomponent('b') }}{{ subcomponent('c') }}",
+        })
+    )
+
+_render_threads = []
+
+class Panel(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "a.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _render_threads.append(threading.current_thread().name)
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class PanelB(Panel):
+    _template_location = "b.html"
+
+class PanelC(Panel):
+    _template_location = "c.html"
+
+class FailingPanel(Panel):
+
+    class Data(Panel.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            raise RuntimeError("panel failed")
+
+class Dashboard(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "dashboard.html"
+    _render_workers = 3
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        a: Panel
+        b: PanelB
+        c: PanelC
+
+class TestParallelRender(unittest.TestCase):
+
+    def _make_dashboard(self, component_type = Dashboard, a_type = Panel):
+        _dashboard = component_type()
+        _dashboard.inputs = component_type.Inputs()
+        _dashboard.subs = component_type.SubComponents(
+            a = a_type(parent = _dashboard),
+            b = PanelB(parent = _dashboard),
+            c = PanelC(parent = _dashboard)
+        )
+        return _dashboard
+
+    def setUp(self):
+        _render_threads.clear()
+
+    def test_000_parallel_render(self):
+        _dashboard = self._make_dashboard()
+        assert _dashboard.render() == "<a><b><c>"
+        assert list(_dashboard.subs._rendered_sc_html) == ["a", "b", "c"]
+        assert len(_render_threads) == 3
+        assert all(_name.startswith("joop-render") for _name in _render_threads)
+
+    def test_001_serial_by_default(self):
+        class SerialDashboard(Dashboard):
+            _render_workers = None
+
+        with mock.patch.dict(os.environ, {RENDER_WORKERS_ENV: ""}):
+            assert self._make_dashboard(SerialDashboard).render() == "<a><b><c>"
+        assert _render_threads == [threading.current_thread().name] * 3
+
+    def test_002_environment(self):
+        class EnvDashboard(Dashboard):
+            _render_workers = None
+
+        with mock.patch.dict(os.environ, {RENDER_WORKERS_ENV: "2"}):
+            assert self._make_dashboard(EnvDashboard).render() == "<a><b><c>"
+        assert all(_name.startswith("joop-render") for _name in _render_threads)
+
+    def test_003_exception_propagates(self):
+        _dashboard = self._make_dashboard(a_type = FailingPanel)
+        with self.assertRaisesRegex(RuntimeError, "panel failed"):
+            _dashboard.render()
@@ -0,0 +1,167 @@
+"""Unit tests for rendering one region of a page, as for HTMX partial updates."""
+
+import unittest
+from jinja2 import DictLoader
+
+from joop.http.methods import HttpMethod
+from joop.web import HTMLComponent, View
+from joop.web.templater import EnvironmentFactory
+
+try:
+    from flask import Flask
+    from joop.flask.flask_view import FlaskView
+    FLASK_AVAILABLE = True
+except ImportError:
+    FLASK_AVAILABLE = False
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "cell.html": "<td>{{ data('name') }}</td>",
+            "row.html": "<tr id=\"row\">{{ subcomponent('cell') }}</tr>",
+            "page.html": ("<main>{{ data('name') }}{{ subcomponent('header') }}"
+                          "<table>{{ subcomponent('row') }}</table></main>"),
+        })
+    )
+
+_from_inputs = []
+
+class Cell(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "cell.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+        name: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _from_inputs.append(cls.__qualname__)
+            return cls(name = cls.__qualname__.split(".")[0])
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class Header(Cell):
+
+    class Data(Cell.Data):
+        pass
+
+class Row(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "row.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(Cell.Data):
+        pass
+
+    class SubComponents(HTMLComponent.SubComponents):
+        cell: Cell = None
+
+        def __post_init__(self):
+            self.cell = Cell()
+
+class Page(Row):
+    _template_location = "page.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(Cell.Data):
+        pass
+
+    class SubComponents(HTMLComponent.SubComponents):
+        header: Header = None
+        row: Row = None
+
+        def __post_init__(self):
+            self.header = Header()
+            self.row = Row()
+
+class PageView(View):
+    _component_type = Page
+    _htmx = True
+    _fragments = {"row": "row", "first-cell": "row.cell"}
+
+    class Endpoint(View.Endpoint):
+        _url = "/page"
+        _name = "page"
+        _methods = [HttpMethod.GET.value]
+
+class TestPartialRender(unittest.TestCase):
+
+    def setUp(self):
+        _from_inputs.clear()
+
+    def _page(self):
+        _page = Page()
+        _page.inputs = Page.Inputs()
+        _page.subs = Page.SubComponents()
+        return _page
+
+    def test_000_resolve(self):
+        _page = self._page()
+        assert isinstance(_page.get_subcomponent("row.cell"), Cell)
+        assert _page.get_subcomponent("row.missing") is None
+        assert _page.get_subcomponent("header.cell") is None
+        assert _page.get_subcomponent("") is None
+
+    def test_001_fragment(self):
+        _full = self._page().render()
+        assert _full == ("<main>Page<td>Header</td>"
+                         "<table><tr id=\"row\"><td>Cell</td></tr></table></main>")
+        _from_inputs.clear()
+        _fragment = self._page().render_fragment("row")
+        assert _fragment == "<tr id=\"row\"><td>Cell</td></tr>"
+        assert _fragment in _full
+        # The page and the header never process their data.
+        assert _from_inputs == ["Row.Data", "Cell.Data"]
+        assert self._page().render_fragment("nothing") is None
+
+    @unittest.skipIf(not FLASK_AVAILABLE, "flask is not available")
+    def test_002_htmx_view(self):
+        class FlaskPageView(PageView, FlaskView):
+            pass
+
+        _app = Flask(__name__)
+        FlaskPageView.add_to_app(_app)
+        _client = _app.test_client()
+        response = _client.get("/page", headers={"HX-Request": "true", "HX-Target": "first-cell"})
+        self.assertEqual(response.get_data(as_text=True), "<td>Cell</td>")
+        self.assertIn("HX-Target", response.headers["Vary"])
+        response = _client.get("/page?fragment=row")
+        self.assertEqual(response.get_data(as_text=True), "<tr id=\"row\"><td>Cell</td></tr>")
+        # Paths that `_fragments` does not list get the whole page.
+        response = _client.get("/page?fragment=row.cell")
+        self.assertTrue(response.get_data(as_text=True).startswith("<main>"))
+        response = _client.get("/page", headers={"HX-Request": "true", "HX-Target": "header"})
+        self.assertTrue(response.get_data(as_text=True).startswith("<main>"))
+        _from_inputs.clear()
+        response = _client.get("/page", headers={"HX-Target": "row"})
+        self.assertTrue(response.get_data(as_text=True).startswith("<main>"))
+        self.assertEqual(len(_from_inputs), 4)
+
+    @unittest.skipIf(not FLASK_AVAILABLE, "flask is not available")
+    def test_003_htmx_etag(self):
+        class ConditionalPageView(PageView, FlaskView):
+            _etag = True
+
+        _app = Flask(__name__)
+        ConditionalPageView.add_to_app(_app)
+        _client = _app.test_client()
+        for _url, _headers in (("/page", {}), ("/page?fragment=row", {}),
+                               ("/page", {"HX-Request": "true", "HX-Target": "first-cell"})):
+            response = _client.get(_url, headers=_headers)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn("HX-Target", response.headers["Vary"])
+            _etag = response.headers["ETag"]
+            response = _client.get(_url, headers={**_headers, "If-None-Match": _etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.headers["ETag"], _etag)
+            self.assertIn("HX-Target", response.headers["Vary"])
+        # Whole pages and fragments of a page have their own ETags.
+        self.assertNotEqual(_client.get("/page").headers["ETag"],
+                            _client.get("/page?fragment=row").headers["ETag"])
@@ -0,0 +1,92 @@
+"""Unit tests for template pinning and invalidation."""
+
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+from jinja2 import FileSystemLoader
+
+from joop.web import HTMLComponent
+from joop.web.templater import EnvironmentFactory
+from joop.web.pinning import TemplateWatcher, invalidate_templates
+
+class TestTemplatePinning(unittest.TestCase):
+
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self._path = os.path.join(self._dir.name, "pinned.html")
+        self._mtime = time.time()
+        self._write("<p>one</p>")
+        self.env = EnvironmentFactory.create_environment(
+            loader=FileSystemLoader(self._dir.name), auto_reload=False)
+
+        class Pinned(HTMLComponent):
+            _jinja_env = self.env
+            _template_location = "pinned.html"
+
+            class Inputs(HTMLComponent.Inputs):
+                pass
+
+            class Data(HTMLComponent.Data):
+
+                @classmethod
+                def from_inputs(cls, inputs):
+                    return super()._from_inputs(inputs)
+
+            class SubComponents(HTMLComponent.SubComponents):
+                pass
+
+        self.Pinned = Pinned
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def _write(self, text):
+        with open(self._path, "w") as f:
+            f.write(text)
+        # Bump the modification time, in case the file system's resolution is coarse.
+        self._mtime += 10
+        os.utime(self._path, (self._mtime, self._mtime))
+
+    def _render(self):
+        _component = self.Pinned()
+        _component.inputs = self.Pinned.Inputs()
+        _component.subs = self.Pinned.SubComponents()
+        return _component.render()
+
+    def test_000_no_loader_work_once_pinned(self):
+        assert self._render() == "<p>one</p>"
+        with mock.patch.object(self.env, "get_template") as _get_template:
+            assert self._render() == "<p>one</p>"
+            _get_template.assert_not_called()
+
+    def test_001_invalidate(self):
+        assert self._render() == "<p>one</p>"
+        self._write("<p>two</p>")
+        assert self._render() == "<p>one</p>"
+        invalidate_templates(self.env, ["pinned.html"])
+        assert self._render() == "<p>two</p>"
+
+    def test_002_watcher(self):
+        _watcher = TemplateWatcher(self.env)
+        assert self._render() == "<p>one</p>"
+        assert not _watcher.check()
+        self._write("<p>two</p>")
+        assert _watcher.check()
+        assert self._render() == "<p>two</p>"
+
+    def test_003_auto_reload_not_pinned(self):
+        self.env.auto_reload = True
+        assert self._render() == "<p>one</p>"
+        self._write("<p>two</p>")
+        assert self._render() == "<p>two</p>"
+
+        class Pinned(self.Pinned):
+            _pin_template = True
+
+        self.Pinned = Pinned
+        self._write("<p>three</p>")
+        assert self._render() == "<p>three</p>"
+        self._write("<p>four</p>")
+        assert self._render() == "<p>three</p>"
@@ -0,0 +1,95 @@
+"""Unit tests for pooled component instances in views."""
+
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent, View
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "greeting.html": "<p>Hello, {{ data('name') }}!</p>{{ subcomponent('footer') }}",
+            "footer.html": "<footer></footer>",
+        })
+    )
+
+class Footer(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "footer.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class Greeting(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "greeting.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        name: str = ""
+
+    class Data(HTMLComponent.Data):
+        name: str
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            if inputs.name == "error":
+                raise ValueError(inputs.name)
+            return cls(name = inputs.name)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        footer: Footer = None
+
+        def __post_init__(self):
+            self.footer = Footer()
+
+class TestComponentPool(unittest.TestCase):
+
+    def setUp(self):
+        class GreetingView(View):
+            _component_type = Greeting
+            _pooled = True
+            _pool_size = 2
+
+        self.View = GreetingView
+
+    def test_000_reuse(self):
+        assert self.View.render(name = "a") == "<p>Hello, a!</p><footer></footer>"
+        _component = self.View._get_pool()[0]
+        _subs = _component.subs
+        assert self.View.render(name = "b") == "<p>Hello, b!</p><footer></footer>"
+        assert list(self.View._get_pool()) == [_component]
+        assert _component.subs is _subs
+        # Idle instances hold no request data, and each view class has its own pool.
+        assert _component.inputs is None and _component.data is None
+        assert _subs.footer.data is None
+        assert len(View._get_pool()) == 0
+
+    def test_001_failed_render_not_reused(self):
+        self.View.render(name = "a")
+        with self.assertRaises(ValueError):
+            self.View.render(name = "error")
+        assert len(self.View._get_pool()) == 0
+        assert self.View.render(name = "b") == "<p>Hello, b!</p><footer></footer>"
+
+    def test_002_stream(self):
+        _chunks = self.View.stream(name = "a")
+        assert len(self.View._get_pool()) == 0
+        assert "".join(_chunks) == "<p>Hello, a!</p><footer></footer>"
+        assert len(self.View._get_pool()) == 1
+
+    def test_003_concurrent(self):
+        _names = [str(i) for i in range(200)]
+        with ThreadPoolExecutor(max_workers = 8) as _executor:
+            _res = list(_executor.map(lambda _name: self.View.render(name = _name), _names))
+        assert _res == [f"<p>Hello, {_name}!</p><footer></footer>" for _name in _names]
+        assert len(self.View._get_pool()) <= self.View._pool_size
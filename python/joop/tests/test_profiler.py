@@ -0,0 +1,151 @@
+"""Unit tests for the render profiler."""
+
+import itertools
+import json
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent, RenderProfiler
+from joop.web.profiler import Span, start_span
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "item.html": "<li></li>",
+            "list.html": "<ul>{{ subcomponent('first') }}{{ subcomponent('second') }}</ul>",
+            "broken.html": "{{ subcomponent('first') }}{{ 1 // 0 }}",
+        })
+    )
+
+class Item(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "item.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class List(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "list.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        first: Item = None
+        second: Item = None
+
+        def __post_init__(self):
+            self.first = Item()
+            self.second = Item()
+
+def _shape(span):
+    return [f"{span['kind']}:{span['name']}", [_shape(_child) for _child in span['children']]]
+
+class TestRenderProfiler(unittest.TestCase):
+
+    def _render(self, component_type = List):
+        _list = component_type()
+        _list.inputs = component_type.Inputs()
+        _list.subs = component_type.SubComponents()
+        return _list.render()
+
+    def _profile(self, component_type = List):
+        _profiler = RenderProfiler("/list", clock = itertools.count().__next__)
+        with _profiler:
+            assert self._render(component_type) == "<ul><li></li><li></li></ul>"
+        return _profiler
+
+    def test_000_disabled(self):
+        assert start_span('component', "List") is None
+        with RenderProfiler(sample_rate = 0) as _profiler:
+            self._render()
+            assert start_span('component', "List") is None
+        assert not _profiler.sampled
+        assert _profiler.to_dict() is None
+        assert _profiler.to_collapsed() == ""
+
+    def test_001_tree(self):
+        _item = ["component:Item", [["from_inputs:Item", []],
+                                    ["load_template:item.html", []],
+                                    ["template:item.html", []]]]
+        _tree = self._profile().to_dict()
+        assert _shape(_tree) == ["request:/list", [
+            ["component:List", [["from_inputs:List", []],
+                                ["load_template:list.html", []],
+                                ["template:list.html", [_item, _item]]]]]]
+        _component = _tree['children'][0]
+        assert _component['template'] == "list.html"
+        assert _component['duration'] == _component['self_time'] + _component['child_time']
+        assert json.loads(self._profile().to_json()) == json.loads(json.dumps(_tree))
+
+    def test_002_collapsed(self):
+        _lines = self._profile().to_collapsed().splitlines()
+        _stack = "request:/list;component:List;template:list.html;component:Item"
+        # Both items share a stack, so their self times are summed.
+        assert [_line for _line in _lines if _line.startswith(_stack + " ")] == [_stack + " 8000000"]
+        assert all(int(_line.rsplit(" ", 1)[1]) > 0 for _line in _lines)
+
+    def test_003_concurrent(self):
+        class ConcurrentList(List):
+            _render_workers = 2
+
+        _tree = RenderProfiler()
+        with _tree:
+            self._render(ConcurrentList)
+        _component = _tree.to_dict()['children'][0]
+        # Subcomponents rendered on the render pool still nest under their parent.
+        assert [_child['name'] for _child in _component['children']].count("Item") == 2
+
+    def test_004_exception(self):
+        class BrokenList(List):
+            _template_location = "broken.html"
+
+        class IterativeBrokenList(BrokenList):
+            _iterative = True
+
+        _profiler = RenderProfiler("/list", clock = itertools.count().__next__)
+        with _profiler:
+            for _type in (BrokenList, IterativeBrokenList):
+                with self.assertRaises(ZeroDivisionError):
+                    self._render(_type)
+            assert self._render() == "<ul><li></li><li></li></ul>"
+        _tree = _profiler.root
+        # Failed renders end their spans, so later renders do not nest under them.
+        assert [_child.name.rsplit(".", 1)[-1] for _child in _tree.children] == [
+            "BrokenList", "IterativeBrokenList", "List"]
+        _pending = [_tree]
+        while _pending:
+            _span = _pending.pop()
+            assert _span.end is not None
+            _pending.extend(_span.children)
+
+    def test_005_concurrent_self_time(self):
+        _times = iter([0, 1, 2, 8, 9, 10])
+        _parent = Span('component', "List", None, _times.__next__, None)
+        _first = Span('component', "Item", None, _times.__next__, _parent)
+        _second = Span('component', "Item", None, _times.__next__, _parent)
+        _parent.children += [_first, _second]
+        _second.end = next(_times)
+        _first.end = next(_times)
+        _parent.end = next(_times)
+        # Overlapping children count once: 1 to 9, not 8 + 6.
+        assert _parent.child_time == 8
+        assert _parent.self_time == 2
+        _parent.end = 5
+        assert _parent.self_time == 0
@@ -0,0 +1,137 @@
+"""Unit tests for rendering only the subcomponents a template references."""
+
+import tempfile
+import unittest
+from jinja2 import DictLoader
+
+from joop.web import HTMLComponent
+from joop.web.templater import EnvironmentFactory
+
+environment = EnvironmentFactory.create_environment(
+        loader=DictLoader({
+            "panel.html": "<p>panel</p>",
+            "layout.html": ("{% if data('show') %}{{ subcomponent('hidden') }}{% endif %}"
+                            "{{ subcomponent('shown') }}"),
+            "include.html": "{% include 'layout.html' %}{{ subcomponent('footer') }}",
+            "dynamic.html": "{% for name in ['shown'] %}{{ subcomponent(name) }}{% endfor %}",
+            "part.html": "{{ subcomponent('shown') }}",
+            "dynamic_include.html": "{% set p = 'part.html' %}[{% include p %}]",
+            "joop_sc.html": "[{{ joop.sc['shown'] }}]",
+        })
+    )
+
+_rendered = []
+
+class Panel(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "panel.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        pass
+
+    class Data(HTMLComponent.Data):
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            _rendered.append(cls.__qualname__)
+            return super()._from_inputs(inputs)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        pass
+
+class HiddenPanel(Panel):
+
+    class Data(Panel.Data):
+        pass
+
+class Layout(HTMLComponent):
+    _jinja_env = environment
+    _template_location = "layout.html"
+
+    class Inputs(HTMLComponent.Inputs):
+        show: bool = False
+
+    class Data(HTMLComponent.Data):
+        show: bool
+
+        @classmethod
+        def from_inputs(cls, inputs):
+            return cls(show = inputs.show)
+
+    class SubComponents(HTMLComponent.SubComponents):
+        hidden: Panel = None
+        shown: Panel = None
+        unused: Panel = None
+
+        def __post_init__(self):
+            self.hidden = HiddenPanel()
+            self.shown = Panel()
+            self.unused = Panel()
+
+class TestReferencedSubComponents(unittest.TestCase):
+
+    def setUp(self):
+        _rendered.clear()
+
+    def _render(self, component_type = Layout, show = False):
+        _layout = component_type()
+        _layout.inputs = component_type.Inputs(show = show)
+        _layout.subs = component_type.SubComponents()
+        return _layout.render()
+
+    def test_000_template_analysis(self):
+        _names = EnvironmentFactory.get_subcomponent_names
+        assert _names(environment, environment.get_template("layout.html")) == {"hidden", "shown"}
+        assert _names(environment, environment.get_template("include.html")) == \
+            {"hidden", "shown", "footer"}
+        assert _names(environment, environment.get_template("dynamic.html")) is None
+
+    def test_001_hidden_not_rendered(self):
+        assert self._render() == "<p>panel</p>"
+        assert _rendered == ["Panel.Data"]
+        assert self._render(show = True) == "<p>panel</p><p>panel</p>"
+        assert _rendered == ["Panel.Data", "HiddenPanel.Data", "Panel.Data"]
+
+    def test_002_concurrent_renders_referenced_only(self):
+        class ConcurrentLayout(Layout):
+            _render_workers = 4
+
+        assert self._render(ConcurrentLayout) == "<p>panel</p>"
+        # The unused panel is skipped; the hidden one is referenced, so it is rendered.
+        assert sorted(_rendered) == ["HiddenPanel.Data", "Panel.Data"]
+
+    def test_003_unresolvable_references(self):
+        _names = EnvironmentFactory.get_subcomponent_names
+        for _template_name in ("dynamic_include.html", "joop_sc.html"):
+            assert _names(environment, environment.get_template(_template_name)) is None
+
+        class ConcurrentLayout(Layout):
+            _render_workers = 4
+
+        for _template_name in ("dynamic_include.html", "joop_sc.html"):
+            class DynamicLayout(ConcurrentLayout):
+                _template_location = _template_name
+
+            assert self._render(DynamicLayout) == "[<p>panel</p>]"
+
+    def test_004_precompiled_templates(self):
+        with tempfile.TemporaryDirectory() as target:
+            EnvironmentFactory.compile_templates(environment, target, ["layout.html", "panel.html"])
+            _env = EnvironmentFactory.create_environment(precompiled_path = target)
+            assert EnvironmentFactory.get_subcomponent_names(_env, _env.get_template("layout.html")) is None
+
+            class PrecompiledPanel(Panel):
+                _jinja_env = _env
+
+            class PrecompiledLayout(Layout):
+                _jinja_env = _env
+                _render_workers = 4
+
+                class SubComponents(Layout.SubComponents):
+
+                    def __post_init__(self):
+                        self.hidden = PrecompiledPanel()
+                        self.shown = PrecompiledPanel()
+                        self.unused = PrecompiledPanel()
+
+            assert self._render(PrecompiledLayout) == "<p>panel</p>"
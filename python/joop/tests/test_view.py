@@ -14,10 +14,16 @@ Classes:
 
 """
 
+import gzip
 import unittest
 
+from joop.http.methods import HttpMethod
+from joop.web.cache import RenderCache
+
 try:
+    from flask import Flask
     from joop.flask import app
+    from joop.flask.example import FlaskName
     APP_AVAILABLE = app is not None
 except ImportError:
     APP_AVAILABLE = False
@@ -36,6 +42,21 @@ class TestView(unittest.TestCase):
 
         test_000_hello():
             Tests the '/hello' endpoint to ensure it returns a 200 status code.
+
+        test_001_stream():
+            Tests that a streaming view sends the rendered page.
+
+        test_002_etag():
+            Tests that a conditional view answers a matching If-None-Match with a 304.
+
+        test_003_compressed():
+            Tests that a compressed view serves the variant Accept-Encoding allows.
+
+        test_004_query_args():
+            Tests that a view passes the query parameters it names to the inputs.
+
+        test_005_unsupported_options():
+            Tests that adding a view with response options that do not combine raises.
     """
 
     def setUp(self):
@@ -44,3 +65,85 @@ class TestView(unittest.TestCase):
     def test_000_hello(self):
         response = self.client.get('/hello') 
         self.assertEqual(response.status_code, 200)
+
+    def test_001_stream(self):
+        class StreamingName(FlaskName):
+            _stream = True
+
+        _app = Flask(__name__)
+        StreamingName.add_to_app(_app)
+        response = _app.test_client().get('/hello/Justin/Rushin')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.get_data(as_text=True), "<p>Hello, Justin Rushin!</p>")
+
+    def test_002_etag(self):
+        class ConditionalName(FlaskName):
+            _etag = True
+
+        _app = Flask(__name__)
+        ConditionalName.add_to_app(_app)
+        _client = _app.test_client()
+        response = _client.get('/hello/Justin/Rushin')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_data(as_text=True), "<p>Hello, Justin Rushin!</p>")
+        _etag = response.headers["ETag"]
+        response = _client.get('/hello/Justin/Rushin', headers={"If-None-Match": _etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(as_text=True), "")
+        response = _client.get('/hello/Justin/Case', headers={"If-None-Match": _etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], _etag)
+
+    def test_003_compressed(self):
+        class CompressedName(FlaskName):
+            _compressed_cache = RenderCache(max_entries=16)
+            _compress_min_size = 0
+            _etag = True
+
+        _app = Flask(__name__)
+        CompressedName.add_to_app(_app)
+        _client = _app.test_client()
+        _url = '/hello/Justin/' + 'Rushin' * 100
+        _html = "<p>Hello, Justin " + "Rushin" * 100 + "!</p>"
+        response = _client.get(_url, headers={"Accept-Encoding": "gzip"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertEqual(response.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(gzip.decompress(response.get_data()).decode(), _html)
+        _etag = response.headers["ETag"]
+        response = _client.get(_url)
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(response.get_data(as_text=True), _html)
+        response = _client.get(_url,
+                               headers={"Accept-Encoding": "gzip", "If-None-Match": _etag})
+        self.assertEqual(response.status_code, 304)
+        # Rendered and compressed once; the other requests were cache hits.
+        self.assertEqual(CompressedName._compressed_cache.stats()['misses'], 1)
+
+    def test_004_query_args(self):
+        class QueryName(FlaskName):
+            _query_args = ("last_name",)
+
+            class Endpoint(FlaskName.Endpoint):
+                _url = "/hi/<string:first_name>"
+                _name = "hi"
+                _methods = [HttpMethod.GET.value]
+
+        _app = Flask(__name__)
+        QueryName.add_to_app(_app)
+        _client = _app.test_client()
+        response = _client.get('/hi/Justin?last_name=Case&other=ignored')
+        self.assertEqual(response.get_data(as_text=True), "<p>Hello, Justin Case!</p>")
+        response = _client.get('/hi/Justin?first_name=Other&last_name=Case')
+        self.assertEqual(response.get_data(as_text=True), "<p>Hello, Justin Case!</p>")
+
+    def test_005_unsupported_options(self):
+        _options = [{"_stream": True, "_etag": True},
+                    {"_as_async": True, "_etag": True},
+                    {"_stream": True, "_htmx": True},
+                    {"_htmx": True, "_compressed_cache": RenderCache(max_entries=16)}]
+        for _attrs in _options:
+            _view = type("CombinedName", (FlaskName,), _attrs)
+            with self.assertRaises(ValueError):
+                _view.add_to_app(Flask(__name__))
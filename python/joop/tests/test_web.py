@@ -3,7 +3,8 @@
 We're testing both components, their templates, and the rendering here.
 """
 
-from joop.web import HTMLComponent
+from joop.web import HTMLComponent, DataView, deep_field
+from joop.web.component import get_field_plan
 import unittest
 from dataclasses import is_dataclass, dataclass, asdict
 from joop.tests.test_templater import environment
@@ -73,3 +74,49 @@ class TestHTMLComponent(unittest.TestCase):
         hello_super_html = self.hello_super.render()
         _tgt_html = """<p>I'm a supercomponent! And I say:</p>\n<p>Hello, World!</p>"""
         assert hello_super_html == _tgt_html
+
+    def test_004_data_view(self):
+        @dataclass
+        class Nested:
+            value: int = 1
+
+        @dataclass
+        class MyData:
+            rows: list
+            nested: Nested = deep_field(default_factory=Nested)
+
+        _rows = [Nested(), Nested()]
+        _view = DataView(MyData(rows = _rows))
+        # Fields are handed over as-is, not copied:
+        assert _view['rows'] is _rows
+        # ...unless they ask for deep conversion.
+        assert _view['nested'] == {'value': 1}
+        assert dict(_view) == {'rows': _rows, 'nested': {'value': 1}}
+        assert _view.get('missing', "") == ""
+        with self.assertRaises(TypeError):
+            _view['rows'] = []
+
+    def test_005_stream(self):
+        _hello = MyHello(parent=self.hello_super)
+        self.hello_super.subs = MyHelloSuper.SubComponents(
+            my_hello = _hello
+        )
+        _chunks = self.hello_super.stream()
+        # The parent's markup is sent before the subcomponent is rendered.
+        assert next(_chunks) == "<p>I'm a supercomponent! And I say:</p>\n"
+        assert not hasattr(_hello, 'data')
+        assert "".join(_chunks) == "<p>Hello, World!</p>"
+        assert self.hello_super.subs._rendered_sc_html == {'my_hello': "<p>Hello, World!</p>"}
+
+    def test_006_field_plan(self):
+        _plan = get_field_plan(MyHelloName.Inputs)
+        # Compiled when the component class was created.
+        assert _plan is get_field_plan(MyHelloName.Inputs)
+        assert _plan.names == ("first_name", "last_name")
+        assert _plan.get_values(self.hello_name.inputs) == ("Justin", "Rushin")
+        assert _plan.as_dict(self.hello_name.inputs) == {'first_name': "Justin",
+                                                         'last_name': "Rushin"}
+        assert get_field_plan(MyHello.Inputs).get_values(self.hello.inputs) == ()
+        _hello = MyHello()
+        self.hello_super.subs = MyHelloSuper.SubComponents(my_hello = _hello)
+        assert self.hello_super.subs.get_all == {'my_hello': _hello}
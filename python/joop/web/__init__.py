@@ -6,9 +6,20 @@ Modules:
     component: Define web UI or API components.
     html: Where components get rendered to HTML.
     view: Register components to webservers, set up views routes, etc.
+    cache: Cache rendered output of components.
+    pinning: Pin compiled templates to components, and invalidate them.
+    fragment_cache: Cache regions of templates with the `cache` tag.
+    flatten: Render whole component trees in one template pass.
+    profiler: Record per-component timing trees of renders.
+    etag: Compute ETags of component output without rendering it.
+    compression: Compress rendered output once, for every content coding.
 
 """
 
-from joop.web.component import Component #, JSONComponent
+from joop.web.component import Component, DataView, deep_field #, JSONComponent
 from joop.web.html import HTML, HTMLComponent
 from joop.web.view import View
+from joop.web.cache import RenderCache
+from joop.web.pinning import invalidate_templates, watch_templates
+from joop.web.fragment_cache import DiskFragmentCache
+from joop.web.profiler import RenderProfiler
@@ -0,0 +1,223 @@
+"""Render caching for joop components.
+
+Rendering a component means running `Data.from_inputs`, rendering its subcomponents and
+    then its template. For components whose output is fully determined by their inputs,
+    all of that work can be skipped when the same inputs were rendered recently.
+
+Classes:
+    RenderCache:
+        A thread-safe, size-bounded LRU cache with optional TTL, byte accounting and
+        hit/miss counters.
+
+Functions:
+    make_key(value) -> Hashable:
+        Builds a stable, hashable key from an `Inputs` instance (or any nested value).
+
+Usage:
+    - Opt a component class in by assigning a cache to its `_render_cache` attribute:
+
+        class MyName(HelloName):
+            _render_cache = RenderCache(max_entries=1024, ttl=60)
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from dataclasses import is_dataclass
+from typing import Any, Callable, Optional
+
+from joop.web.component import is_frozen, get_field_plan
+
+# Types whose instances only compare equal to instances of the same type (unlike
+#   `1 == True == 1.0`), so they can be their own key.
+_EXACT_TYPES = (str, bytes, type(None))
+
+def make_key(value: Any) -> Hashable:
+    """
+    Build a stable, hashable key from a value.
+
+    Dataclasses (such as `Component.Inputs`) are keyed by their type and field values,
+    so two equal `Inputs` instances produce the same key; frozen ones (see
+    `Component._frozen`) whose fields are strings, bytes or None are hashable, and are
+    their own key. Lists, tuples, dicts and sets are converted recursively. Values whose
+    class defines a `_joop_digest` method (ex. `ColumnarResult.digest`) are keyed by
+    their digest. Other hashable values are keyed with their type, so `1`, `True` and
+    `1.0` get different keys. Any other unhashable value falls back to its `repr`.
+
+    Args:
+        value (Any): The value to build a key from.
+
+    Returns:
+        Hashable: A key suitable for use in a dictionary.
+    """
+    if type(value) in _EXACT_TYPES:
+        return value
+    if is_dataclass(value) and not isinstance(value, type):
+        _plan = get_field_plan(type(value))
+        _values = _plan.get_values(value)
+        if is_frozen(value) and all(type(_value) in _EXACT_TYPES for _value in _values):
+            return value
+        return (type(value), tuple(zip(_plan.names, map(make_key, _values))))
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(make_key(v) for v in value))
+    if isinstance(value, dict):
+        return (dict, tuple(sorted(((make_key(k), make_key(v)) for k, v in value.items()),
+                                   key=repr)))
+    if isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(make_key(v) for v in value))
+    _digest = getattr(type(value), '_joop_digest', None)
+    if _digest is not None:
+        return (type(value), _digest(value))
+    if isinstance(value, Hashable):
+        return (type(value), value)
+    return (type(value), repr(value))
+
+def _sizeof(value: Any) -> int:
+    """
+    The default byte accounting for cached values: UTF-8 length for strings,
+        raw length for bytes, `nbytes` for values that report it, zero otherwise.
+    """
+    if isinstance(value, str):
+        return len(value.encode("utf-8"))
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return getattr(value, 'nbytes', 0)
+
+class RenderCache:
+    """
+    A thread-safe LRU cache for rendered output.
+
+    Entries are evicted in least-recently-used order whenever the cache holds more than
+    `max_entries` entries or more than `max_bytes` bytes. Entries older than their TTL
+    are treated as misses and dropped on access.
+
+    Attributes:
+        max_entries (int): The maximum number of entries kept.
+        max_bytes (Optional[int]): The maximum total size of the cached values, if any.
+        ttl (Optional[float]): The default time-to-live of an entry in seconds, if any.
+        hits (int): The number of successful lookups.
+        misses (int): The number of failed (or expired) lookups.
+        evictions (int): The number of entries dropped to respect the bounds.
+        current_bytes (int): The total size of the cached values.
+
+    Methods:
+        get(key) -> Any:
+            Returns the cached value for the key, or None.
+
+        set(key, value, ttl=None):
+            Stores a value under the key.
+
+        clear():
+            Drops every entry (counters are kept).
+
+        stats() -> dict:
+            Returns the counters as a dictionary.
+    """
+
+    def __init__(self,
+                 max_entries: int = 1024,
+                 max_bytes: Optional[int] = None,
+                 ttl: Optional[float] = None,
+                 sizeof: Callable[[Any], int] = _sizeof):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries (int): The maximum number of entries kept.
+            max_bytes (Optional[int]): The maximum total size of the cached values.
+            ttl (Optional[float]): The default time-to-live of an entry in seconds.
+            sizeof (Callable[[Any], int]): Returns the size in bytes of a cached value.
+
+        Raises:
+            ValueError: If `max_entries` is smaller than 1.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1.")
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._entries = OrderedDict() # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        """
+        Return the cached value for the key, marking it as recently used.
+
+        Args:
+            key (Hashable): The key to look up.
+
+        Returns:
+            Any: The cached value, or None if it is missing or expired.
+        """
+        with self._lock:
+            _entry = self._entries.get(key)
+            if _entry is not None:
+                _value, _size, _expires_at = _entry
+                if _expires_at is None or _expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return _value
+                del self._entries[key]
+                self.current_bytes -= _size
+            self.misses += 1
+            return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """
+        Store a value under the key, evicting old entries as needed.
+
+        Values larger than `max_bytes` on their own are not stored.
+
+        Args:
+            key (Hashable): The key to store the value under.
+            value (Any): The value to store.
+            ttl (Optional[float]): The time-to-live in seconds, overriding the default.
+        """
+        _size = self._sizeof(value)
+        if self.max_bytes is not None and _size > self.max_bytes:
+            return
+        _ttl = self.ttl if ttl is None else ttl
+        _expires_at = None if _ttl is None else time.monotonic() + _ttl
+        with self._lock:
+            _old = self._entries.pop(key, None)
+            if _old is not None:
+                self.current_bytes -= _old[1]
+            self._entries[key] = (value, _size, _expires_at)
+            self.current_bytes += _size
+            while (len(self._entries) > self.max_entries or
+                   (self.max_bytes is not None and self.current_bytes > self.max_bytes)):
+                _, (_, _evicted_size, _) = self._entries.popitem(last=False)
+                self.current_bytes -= _evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop every entry. The hit, miss and eviction counters are kept."""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: The entry count, byte count, hits, misses and evictions.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
@@ -12,13 +12,36 @@ Classes:
     JSONComponent:
         A specialized component for handling JSON data. Implementation pending.
 
+    DataView:
+        A read-only, zero-copy mapping over the fields of a component's Data.
+
+    FieldPlan:
+        The fields of a dataclass, introspected once so renders need no reflection.
+
+Functions:
+    deep_field(**kwargs):
+        Declares a Data field that is deep-converted (like `dataclasses.asdict`) when read
+        through a DataView.
+
+    is_frozen(value) -> bool:
+        Whether a value is an instance of a frozen Inputs or Data class.
+
+    get_field_plan(cls) -> FieldPlan:
+        Returns the precomputed field plan of a dataclass.
+
 """
 
-from typing import Optional
-from dataclasses import dataclass, fields
+import copy
+import inspect
+import weakref
+from operator import attrgetter
+from typing import Any, Optional
+from collections.abc import Mapping
+from dataclasses import dataclass, field, fields, is_dataclass, asdict, FrozenInstanceError
 from abc import ABCMeta
 
 from joop.abstract import AbstractMethod
+from joop.web.profiler import start_span, stop_span, SPAN_FROM_INPUTS
 
 class Component(metaclass=ABCMeta):
     '''
@@ -31,24 +54,51 @@ class Component(metaclass=ABCMeta):
         inputs (Inputs): The input data for the component.
         data (Data): The processed data for the component.
         subs (SubComponents): The subcomponents of the component.
+        _incremental (bool): Whether the component belongs to a long-lived, incremental
+            tree. Such a component keeps its inputs and subcomponents between renders,
+            and is only re-rendered once it (or one of its descendants) is marked dirty;
+            otherwise its last output is reused. Set it on every component of the tree;
+            keyword arguments passed by a parent's `subcomponent()` call are ignored.
+        _compact (bool): Whether the Inputs, Data and SubComponents classes defined on the
+            component are generated with `__slots__`, so their instances carry no
+            `__dict__`. Assigning attributes that are not fields then raises. Classes
+            whose methods use zero-argument `super()` keep their `__dict__`.
+        _frozen (bool): Whether the Inputs and Data classes defined on the component are
+            frozen: fields cannot be reassigned once set, and instances are hashable, so
+            render caches use them as keys directly.
 
     Methods:
+        mark_dirty():
+            Marks the component and all of its ancestors as needing a re-render.
+
+        _clear_request_state():
+            Drops the inputs and data of the component and its subcomponents.
+
+        _clear_own_state():
+            Drops the inputs and data of the component.
+
         _process_inputs():
             Processes the inputs to generate the component's data.
 
+        _process_inputs_async():
+            Processes the inputs, awaiting `Data.from_inputs` if it is a coroutine.
+
         render() -> str:
             Abstract method to render the component as a string.
+
+        render_async() -> str:
+            Asynchronous counterpart of `render`.
     '''
 
     class Inputs(metaclass=ABCMeta):
         """Abstract base class for defining the input data structure of a component."""
-        pass
+        __slots__ = ()
 
     Inputs = dataclass(Inputs)
 
     class _Data(metaclass=ABCMeta):
         """Abstract base class for defining the internal data structure of a component."""
-        pass
+        __slots__ = ()
 
     _Data = dataclass(_Data)
 
@@ -62,7 +112,9 @@ class Component(metaclass=ABCMeta):
 
             from_inputs(inputs: Component.Inputs) -> Component.Data:
                 Abstract method to create a Data instance from the given Inputs.
+                May be a coroutine function, for components rendered with `render_async`.
         """
+        __slots__ = ()
 
         @classmethod
         def _from_inputs(cls, inputs: 'Component.Inputs') -> 'Component.Data':
@@ -94,13 +146,81 @@ class Component(metaclass=ABCMeta):
 
     class SubComponents(metaclass=ABCMeta):
         """Abstract base class for defining the subcomponents of a component."""
-        pass
+        __slots__ = ()
 
     SubComponents = dataclass(SubComponents)
 
-    inputs: Inputs
     data: Data
-    subs: SubComponents
+
+    _parent: Optional['Component'] = None
+    _compact: bool = False
+    _frozen: bool = False
+    _incremental: bool = False
+    _dirty: bool = True
+
+    @property
+    def inputs(self) -> Inputs:
+        """The input data for the component. Assigning new inputs marks the component dirty."""
+        return self._inputs
+
+    @inputs.setter
+    def inputs(self, value: Inputs):
+        self._inputs = value
+        if self._incremental:
+            self.mark_dirty()
+
+    @property
+    def subs(self) -> SubComponents:
+        """
+        The subcomponents of the component. Assigning them marks the component dirty, and
+        in an incremental tree makes it the parent of each subcomponent.
+        """
+        return self._subs
+
+    @subs.setter
+    def subs(self, value: SubComponents):
+        self._subs = value
+        if self._incremental:
+            if value is not None:
+                for _sub in get_field_plan(type(value)).get_values(value):
+                    if isinstance(_sub, Component):
+                        _sub._parent = self
+            self.mark_dirty()
+
+    def mark_dirty(self):
+        """
+        Mark the component and all of its ancestors as needing a re-render.
+
+        Only meaningful in an incremental tree: call it after changing a component's
+        inputs in place, instead of assigning new ones.
+        """
+        _node = self
+        while _node is not None:
+            _node._dirty = True
+            _node = _node._parent
+
+    def _clear_request_state(self):
+        """
+        Drop the inputs and data of the component and its subcomponents, so an instance
+        kept for reuse (ex. pooled by a View) does not hold on to a request's data.
+
+        Components in an incremental tree keep theirs, since they reuse them.
+        """
+        _pending = [self]
+        while _pending:
+            _component = _pending.pop()
+            if _component._incremental:
+                continue
+            _component._clear_own_state()
+            _subs = getattr(_component, '_subs', None)
+            if _subs is not None:
+                _pending.extend(_sub for _sub in get_field_plan(type(_subs)).get_values(_subs)
+                                if isinstance(_sub, Component))
+
+    def _clear_own_state(self):
+        """Drop the inputs and data of the component."""
+        self._inputs = None
+        self.data = None
 
     def __init__(self, parent: Optional['Component'] = None, *args, **kwargs):
         """
@@ -122,7 +242,25 @@ class Component(metaclass=ABCMeta):
         This method uses the `from_inputs` method of the Data class to create a
         Data instance from the component's inputs.
         """
-        self.data = self.Data.from_inputs(self.inputs)
+        _span = start_span(SPAN_FROM_INPUTS, type(self).__qualname__)
+        try:
+            self.data = self.Data.from_inputs(self.inputs)
+        finally:
+            stop_span(_span)
+
+    async def _process_inputs_async(self):
+        """
+        Process the inputs to generate the component's data, awaiting if needed.
+
+        Like `_process_inputs`, but awaits the result when `from_inputs` is a coroutine.
+        """
+        _span = start_span(SPAN_FROM_INPUTS, type(self).__qualname__)
+        try:
+            self.data = self.Data.from_inputs(self.inputs)
+            if inspect.isawaitable(self.data):
+                self.data = await self.data
+        finally:
+            stop_span(_span)
 
     def render(self) -> str:
         """
@@ -133,25 +271,193 @@ class Component(metaclass=ABCMeta):
 
         Returns:
             str: The rendered component as a string.
+
+        Raises:
+            TypeError: If `Data.from_inputs` is a coroutine; use `render_async` instead.
         """
         self._process_inputs()
+        if inspect.isawaitable(self.data):
+            if inspect.iscoroutine(self.data):
+                self.data.close() # Avoids a "never awaited" warning.
+            raise TypeError(f"{type(self).__name__}.Data.from_inputs is asynchronous; use render_async.")
 
     render.__isabstractmethod__ = True
 
+    async def render_async(self) -> str:
+        """
+        Asynchronous counterpart of `render`.
+
+        This method processes the inputs, awaiting `Data.from_inputs` if it is a
+        coroutine. Subclasses extend it to render the component as a string.
+
+        Returns:
+            str: The rendered component as a string.
+        """
+        await self._process_inputs_async()
+
     def __init_subclass__(cls, **kwargs):
         """
         Initialize a subclass of Component.
 
         This method ensures that the Data, Inputs, and SubComponents classes of the
-        subclass are decorated as dataclasses.
+        subclass are decorated as dataclasses, compact and/or frozen as configured,
+        and compiles their field plans.
 
         Args:
             **kwargs: Additional keyword arguments.
         """
         super().__init_subclass__(**kwargs)
-        cls.Data = dataclass(cls.Data)
-        cls.Inputs = dataclass(cls.Inputs)
-        cls.SubComponents = dataclass(cls.SubComponents)
+        cls.Data = _make_dataclass(cls.Data, cls._compact, cls._frozen)
+        cls.Inputs = _make_dataclass(cls.Inputs, cls._compact, cls._frozen)
+        cls.SubComponents = _make_dataclass(cls.SubComponents, cls._compact, False)
+        for _dataclass in (cls.Data, cls.Inputs, cls.SubComponents):
+            _field_plans[_dataclass] = FieldPlan(_dataclass)
+
+_FROZEN = '_joop_frozen'
+
+def _frozen_setattr(self, name: str, value: Any):
+    if name in self.__dataclass_fields__:
+        try:
+            object.__getattribute__(self, name)
+        except AttributeError:
+            pass
+        else:
+            raise FrozenInstanceError(f"cannot assign to field {name!r}")
+    object.__setattr__(self, name, value)
+
+def _frozen_delattr(self, name: str):
+    if name in self.__dataclass_fields__:
+        raise FrozenInstanceError(f"cannot delete field {name!r}")
+    object.__delattr__(self, name)
+
+def _uses_class_cell(cls: type) -> bool:
+    """
+    Whether a method of the class uses its `__class__` cell, ex. for zero-argument
+    `super()`. Re-creating the class (as adding `__slots__` does) would leave the cell
+    pointing to the old class.
+    """
+    _pending = list(cls.__dict__.values())
+    while _pending:
+        _value = _pending.pop()
+        _code = getattr(_value, '__code__', None)
+        if _code is not None and '__class__' in _code.co_freevars:
+            return True
+        # Methods wrapped by classmethod, staticmethod, property, AbstractMethod or
+        # functools.wraps.
+        for _attr in ('__func__', 'func', '__wrapped__', 'fget', 'fset', 'fdel'):
+            _inner = getattr(_value, _attr, None)
+            if callable(_inner):
+                _pending.append(_inner)
+    return False
+
+def _make_dataclass(cls: type, compact: bool, frozen: bool) -> type:
+    """
+    Decorate one of the Inputs, Data or SubComponents classes of a component.
+
+    Compact classes are generated with `__slots__`, except those whose methods use
+    zero-argument `super()`: they stay regular classes, since re-creating them would
+    break it. Frozen ones reject reassigning a field once set (dataclasses cannot freeze
+    a subclass of the non-frozen base classes), and are hashable. Classes that are
+    already dataclasses of their own, such as classes inherited from a parent component,
+    are left as they are.
+
+    Args:
+        cls (type): The class to decorate.
+        compact (bool): Whether to generate the class with `__slots__`.
+        frozen (bool): Whether to freeze the class.
+
+    Returns:
+        type: The dataclass; a new class when given `__slots__`.
+    """
+    if '__dataclass_fields__' in cls.__dict__:
+        return cls
+    if not compact and not frozen:
+        return dataclass(cls)
+    _slots = compact and '__slots__' not in cls.__dict__ and not _uses_class_cell(cls)
+    _res = dataclass(cls, slots = _slots, unsafe_hash = frozen)
+    if frozen:
+        _res.__setattr__ = _frozen_setattr
+        _res.__delattr__ = _frozen_delattr
+        setattr(_res, _FROZEN, True)
+    return _res
+
+def is_frozen(value: Any) -> bool:
+    """
+    Whether a value is an instance of a frozen Inputs or Data class.
+
+    Args:
+        value (Any): The value to check.
+
+    Returns:
+        bool: True for frozen instances (see `Component._frozen`).
+    """
+    return getattr(type(value), _FROZEN, False)
+
+class FieldPlan:
+    """
+    The fields of a dataclass, introspected once so renders need no reflection.
+
+    Attributes:
+        names (tuple[str, ...]): The field names, in declaration order.
+        name_set (frozenset[str]): The field names, for membership tests.
+        deep (frozenset[str]): The names of the fields declared with `deep_field`.
+        get_values (Callable[[Any], tuple]): Returns the field values of an instance,
+            in declaration order.
+    """
+    __slots__ = ('names', 'name_set', 'deep', 'get_values')
+
+    def __init__(self, cls: type):
+        """
+        Compile the plan of a dataclass.
+
+        Args:
+            cls (type): The dataclass.
+        """
+        _fields = fields(cls)
+        self.names = tuple(f.name for f in _fields)
+        self.name_set = frozenset(self.names)
+        self.deep = frozenset(f.name for f in _fields if f.metadata.get(_DEEP_FIELD))
+        if len(self.names) == 0:
+            self.get_values = lambda obj: ()
+        elif len(self.names) == 1:
+            _getter = attrgetter(self.names[0])
+            self.get_values = lambda obj: (_getter(obj),)
+        else:
+            self.get_values = attrgetter(*self.names)
+
+    def as_dict(self, obj: Any) -> dict[str, Any]:
+        """
+        Return the field values of an instance by name, without converting them.
+
+        Args:
+            obj (Any): The dataclass instance.
+
+        Returns:
+            dict[str, Any]: The field values by name.
+        """
+        return dict(zip(self.names, self.get_values(obj)))
+
+_field_plans = weakref.WeakKeyDictionary() # dataclass -> FieldPlan
+
+def get_field_plan(cls: type) -> FieldPlan:
+    """
+    Return the field plan of a dataclass.
+
+    The plans of the Inputs, Data and SubComponents classes of components are compiled
+    when the component class is created; others on first use.
+
+    Args:
+        cls (type): The dataclass.
+
+    Returns:
+        FieldPlan: The plan.
+    """
+    try:
+        return _field_plans[cls]
+    except KeyError:
+        pass
+    _res = _field_plans[cls] = FieldPlan(cls)
+    return _res
 
 class JSONComponent(Component):
     """
@@ -161,3 +467,77 @@ class JSONComponent(Component):
         Component: The base Component class.
     """
     pass
+
+_DEEP_FIELD = 'joop_deep'
+
+def deep_field(**kwargs):
+    """
+    Declare a Data field that is deep-converted when read through a DataView.
+
+    By default, Data fields are handed to the template as-is. Use this for the rare
+    field whose template needs plain dicts and lists, the way `dataclasses.asdict`
+    used to produce them.
+
+    Example usage:
+        class Data(HTMLComponent.Data):
+            settings: MySettings = deep_field(default_factory=MySettings)
+
+    Args:
+        **kwargs: Keyword arguments passed on to `dataclasses.field`.
+
+    Returns:
+        dataclasses.Field: The field definition.
+    """
+    _metadata = dict(kwargs.pop('metadata', None) or {})
+    _metadata[_DEEP_FIELD] = True
+    return field(metadata=_metadata, **kwargs)
+
+def _deep_convert(value: Any) -> Any:
+    """
+    Recursively convert a value the way `dataclasses.asdict` converts fields.
+    """
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (list, tuple)):
+        return type(value)(_deep_convert(v) for v in value)
+    if isinstance(value, dict):
+        return type(value)((_deep_convert(k), _deep_convert(v)) for k, v in value.items())
+    return copy.deepcopy(value)
+
+class DataView(Mapping):
+    """
+    A read-only, zero-copy mapping over the fields of a component's Data.
+
+    Field values are looked up on the Data instance when the template asks for them,
+    instead of copying the whole instance up front. Fields declared with `deep_field`
+    are deep-converted on access.
+
+    Attributes:
+        _data (Component.Data): The Data instance being viewed.
+        _plan (FieldPlan): The field plan of the Data class.
+    """
+    __slots__ = ('_data', '_plan')
+
+    def __init__(self, data: Component.Data):
+        """
+        Initialize the view.
+
+        Args:
+            data (Component.Data): The Data instance to view.
+        """
+        self._data = data
+        self._plan = get_field_plan(type(data))
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._plan.name_set:
+            raise KeyError(key)
+        _value = getattr(self._data, key)
+        if key in self._plan.deep:
+            return _deep_convert(_value)
+        return _value
+
+    def __iter__(self):
+        return iter(self._plan.names)
+
+    def __len__(self) -> int:
+        return len(self._plan.names)
@@ -6,7 +6,8 @@ The module also defines data access object (DAO) classes for handling row data.
 """
 
 from joop.web.html import HTMLComponent
-from joop.dao import DAO
+from joop.dao import DAO, Page
+import dataclasses
 import typing
 
 class MetaRowDAO(DAO):
@@ -53,8 +54,12 @@ class AlpineTableComponent(HTMLComponent):
         """
         Represents the input data structure for the `AlpineTableComponent`.
         Extend this class to define specific input fields for the table.
+
+        Attributes:
+            cursor (typing.Optional[str]): The cursor of the page to show, from the
+                `cursor` query parameter of the page links (see `Data._from_page`).
         """
-        pass
+        cursor : typing.Optional[str] = None
 
     class Data(HTMLComponent.Data):
         """
@@ -62,11 +67,19 @@ class AlpineTableComponent(HTMLComponent):
 
         Attributes:
             rows (typing.Iterable[MetaRowDAO]): The rows of data to be displayed in the table.
+                Any iterable is consumed once, as the template renders: a generator such as
+                `SQLDAO.iter_all` streams large tables in batches instead of loading them.
+                A `ColumnarResult` (see `SQLDAO.get_columnar`) is rendered from its columns.
             table_headers (typing.Any): The headers of the table, derived from the row type.
+            next_cursor (typing.Optional[str]): The cursor of the next page, if the rows
+                are one page of a table (see `SQLDAO.get_page`).
+            previous_cursor (typing.Optional[str]): The cursor of the previous page.
             _row_type: The type of row data used in the table.
         """
         rows : typing.Iterable[MetaRowDAO]
         table_headers: typing.Any
+        next_cursor : typing.Optional[str] = dataclasses.field(default = None, kw_only = True)
+        previous_cursor : typing.Optional[str] = dataclasses.field(default = None, kw_only = True)
         _row_type = None
 
         @classmethod
@@ -79,6 +92,27 @@ class AlpineTableComponent(HTMLComponent):
             """
             return cls._row_type.get_model_fields()
 
+        @classmethod
+        def _from_page(cls, page : Page, **kwargs) -> 'AlpineTableComponent.Data':
+            """
+            Create a `Data` instance showing one page of rows, with controls linking to
+            the neighbouring pages (with a `cursor` query parameter). A view serving the
+            table reads the parameter into `Inputs.cursor` when its `_query_args` has
+            `"cursor"`.
+
+            Args:
+                page (Page): The page, ex. from `SQLDAO.get_page`.
+                **kwargs: The values of the other fields.
+
+            Returns:
+                AlpineTableComponent.Data: An instance of the Data class for the page.
+            """
+            return cls(rows = page.rows,
+                       table_headers = cls._get_table_headers(),
+                       next_cursor = page.next_cursor,
+                       previous_cursor = page.previous_cursor,
+                       **kwargs)
+
         @classmethod
         def from_inputs(cls,
                         inputs : 'AlpineTableComponent.Inputs',
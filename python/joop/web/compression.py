@@ -0,0 +1,143 @@
+"""Pre-compressed rendered output for joop views.
+
+Compressing a large page (ex. an Alpine table) costs far more CPU than sending it, and
+    doing it on every request repeats the same work. A `CompressedBody` compresses
+    rendered output once, into every supported content coding, so a cache of them (see
+    `View._compressed_cache`) serves each request the variant its `Accept-Encoding`
+    allows without compressing anything.
+
+Classes:
+    CompressedBody:
+        Rendered output with its gzip and deflate variants.
+
+Functions:
+    choose_encoding(accept_encoding, available) -> str:
+        Chooses the content coding of a response from an `Accept-Encoding` header value.
+
+"""
+
+import gzip
+import zlib
+from typing import Iterable, Optional
+
+from joop.web.etag import make_etag
+
+IDENTITY = "identity"
+ENCODINGS = ("gzip", "deflate")
+
+def _compress(data: bytes, encoding: str, level: int) -> bytes:
+    """Compress data with a content coding."""
+    if encoding == "gzip":
+        # A fixed mtime keeps the output (and its ETag) the same across processes.
+        return gzip.compress(data, compresslevel=level, mtime=0)
+    if encoding == "deflate":
+        return zlib.compress(data, level) # HTTP "deflate" is the zlib format.
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+class CompressedBody:
+    """
+    Rendered output with its gzip and deflate variants.
+
+    Output smaller than `min_size` bytes is only kept as-is, since compressing it saves
+    little. A variant is only kept if it is smaller than the output.
+
+    Attributes:
+        variants (dict[str, bytes]): The body in each content coding, `identity` first.
+        etag (str): A strong ETag of the output (see `joop.web.etag.make_etag`).
+        nbytes (int): The total size of the variants, for cache byte accounting.
+
+    Methods:
+        get_etag(encoding) -> str:
+            Returns the ETag of a variant.
+    """
+    __slots__ = ('variants', 'etag', 'nbytes')
+
+    def __init__(self, html: str, encodings: Iterable[str] = ENCODINGS,
+                 level: int = 6, min_size: int = 256):
+        """
+        Compress rendered output.
+
+        Args:
+            html (str): The rendered output.
+            encodings (Iterable[str]): The content codings to compress into.
+            level (int): The compression level, from 1 (fastest) to 9 (smallest).
+            min_size (int): The size in bytes below which the output is not compressed.
+
+        Raises:
+            ValueError: If a content coding is not supported.
+        """
+        _data = html.encode("utf-8")
+        self.variants = {IDENTITY: _data}
+        if len(_data) >= min_size:
+            for _encoding in encodings:
+                _compressed = _compress(_data, _encoding, level)
+                if len(_compressed) < len(_data):
+                    self.variants[_encoding] = _compressed
+        self.etag = make_etag(html)
+        self.nbytes = sum(len(_variant) for _variant in self.variants.values())
+
+    def get_etag(self, encoding: str) -> str:
+        """
+        Return the ETag of a variant.
+
+        Each content coding is a different representation, so it gets its own strong ETag.
+
+        Args:
+            encoding (str): The content coding of the variant.
+
+        Returns:
+            str: The quoted ETag.
+        """
+        if encoding == IDENTITY:
+            return self.etag
+        return f'{self.etag[:-1]}-{encoding}"'
+
+def _parse_accept_encoding(accept_encoding: str) -> dict[str, float]:
+    """Parse an `Accept-Encoding` header value into qualities by content coding."""
+    _res = {}
+    for _item in accept_encoding.split(","):
+        _coding, *_params = (_part.strip() for _part in _item.split(";"))
+        if not _coding:
+            continue
+        _quality = 1.0
+        for _param in _params:
+            _name, _, _value = _param.partition("=")
+            if _name.strip().lower() == "q":
+                try:
+                    _quality = float(_value)
+                except ValueError:
+                    _quality = 0.0
+        _res[_coding.lower()] = _quality
+    return _res
+
+def choose_encoding(accept_encoding: Optional[str], available: Iterable[str]) -> str:
+    """
+    Choose the content coding of a response from an `Accept-Encoding` header value.
+
+    The available coding with the highest quality is chosen; ties go to compression,
+    then to the first coding available. `identity` is acceptable unless the header
+    excludes it, and is the fallback when nothing else is.
+
+    Args:
+        accept_encoding (Optional[str]): The header value, ex. `gzip, deflate;q=0.5`;
+            None if absent.
+        available (Iterable[str]): The content codings available, in order of preference.
+
+    Returns:
+        str: The chosen content coding, `identity` for the uncompressed output.
+    """
+    if not accept_encoding:
+        return IDENTITY
+    _qualities = _parse_accept_encoding(accept_encoding)
+    _default = _qualities.get("*", 0.0)
+    # identity is acceptable unless excluded explicitly, or by `*;q=0`.
+    _best = IDENTITY
+    _best_quality = _qualities.get(IDENTITY, 0.0 if _qualities.get("*") == 0 else 1.0)
+    for _coding in available:
+        if _coding == IDENTITY:
+            continue
+        _quality = _qualities.get(_coding, _default)
+        if _quality > 0 and (_quality > _best_quality or
+                             (_quality == _best_quality and _best == IDENTITY)):
+            _best, _best_quality = _coding, _quality
+    return _best
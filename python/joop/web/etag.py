@@ -0,0 +1,131 @@
+"""Entity tags (ETags) for rendered joop components.
+
+A component's output is fully determined by its `Data`, its template and the output of
+    its subcomponents. Digesting those gives a strong ETag without rendering anything, so
+    a view can answer a matching `If-None-Match` with `304 Not Modified` before running
+    a single template (see `HTMLComponent.get_etag` and `View.render_conditional`).
+
+Values are digested through their render cache key (see `joop.web.cache.make_key`), so
+    equal `Data` produce equal ETags across processes. A value whose `repr` is not stable
+    (ex. the default `object.__repr__`, which includes an address) only costs 304s.
+
+Functions:
+    make_etag(*parts) -> str:
+        Returns a strong ETag digesting the given values.
+
+    get_template_version(env, template) -> str:
+        Returns a digest of a template's source and of the templates it references.
+
+    etag_matches(if_none_match, etag) -> bool:
+        Checks an `If-None-Match` header value against an ETag.
+
+"""
+
+import hashlib
+import marshal
+import threading
+import weakref
+from typing import Any, Optional
+
+import jinja2
+from jinja2 import meta
+
+from joop.web.cache import make_key
+
+_template_versions = weakref.WeakKeyDictionary() # template -> version
+_template_versions_lock = threading.Lock()
+
+def make_etag(*parts: Any) -> str:
+    """
+    Return a strong ETag digesting the given values.
+
+    Args:
+        *parts (Any): The values determining the output, ex. a `Data` instance, or the
+            rendered output itself.
+
+    Returns:
+        str: The quoted ETag, ex. `"3f2a..."`.
+    """
+    _digest = hashlib.sha256(repr(make_key(parts)).encode("utf-8", "surrogatepass"))
+    return f'"{_digest.hexdigest()[:32]}"'
+
+def _get_source(env: jinja2.Environment, name: Optional[str]) -> Optional[str]:
+    """Return the source of a template, or None if the loader cannot provide it."""
+    if name is None or env.loader is None:
+        return None
+    try:
+        return env.loader.get_source(env, name)[0]
+    except Exception: # Ex. precompiled templates (`ModuleLoader`) have no source.
+        return None
+
+def _build_template_version(env: jinja2.Environment, template: jinja2.Template) -> str:
+    """
+    Digest the source of a template and of the templates it statically includes,
+    imports or extends.
+    """
+    _digest = hashlib.sha256()
+    _pending = [template.name]
+    _seen = set()
+    while _pending:
+        _name = _pending.pop()
+        if _name in _seen:
+            continue
+        _seen.add(_name)
+        _source = _get_source(env, _name)
+        if _source is None:
+            if _name == template.name:
+                # Digest the compiled code instead.
+                _digest.update(marshal.dumps(template.root_render_func.__code__))
+            continue
+        _digest.update(f"{_name}\0{_source}\0".encode("utf-8", "surrogatepass"))
+        try:
+            _pending.extend(_ref for _ref in meta.find_referenced_templates(env.parse(_source))
+                            if _ref is not None)
+        except jinja2.TemplateSyntaxError:
+            pass
+    return _digest.hexdigest()
+
+def get_template_version(env: jinja2.Environment, template: jinja2.Template) -> str:
+    """
+    Return a digest of a template's source and of the templates it references.
+
+    The digest is computed once per compiled template: reloaded templates (ex. after
+    `invalidate_templates`) get a new one.
+
+    Args:
+        env (jinja2.Environment): The environment of the template.
+        template (jinja2.Template): The compiled template.
+
+    Returns:
+        str: The version of the template.
+    """
+    try:
+        return _template_versions[template]
+    except KeyError:
+        pass
+    _res = _build_template_version(env, template)
+    with _template_versions_lock:
+        _template_versions[template] = _res
+    return _res
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an `If-None-Match` header value against an ETag.
+
+    Uses the weak comparison of RFC 9110: a `W/` prefix is ignored, and `*` matches
+    any ETag.
+
+    Args:
+        if_none_match (Optional[str]): The header value, ex. `"a", W/"b"`; None if absent.
+        etag (str): The quoted ETag of the current output.
+
+    Returns:
+        bool: True if the client's copy is current.
+    """
+    if not if_none_match:
+        return False
+    for _tag in if_none_match.split(","):
+        _tag = _tag.strip()
+        if _tag == "*" or _tag.removeprefix("W/") == etag:
+            return True
+    return False
@@ -0,0 +1,250 @@
+"""Flattened rendering of joop component trees.
+
+Rendering a component tree normally costs one `Template.render` call per node: a Jinja
+    context is created for each one, and each child's output is wrapped in `Markup` and
+    copied into its parent's. For a component opted in with `_flatten = True`, the
+    templates of its statically known subcomponents (and theirs, recursively) are
+    inlined into its own template as macros, so the whole tree renders in one pass.
+
+A subcomponent is inlined when its `SubComponents` field is annotated with an
+    `HTMLComponent` subclass that does not customize rendering (see
+    `HTMLComponent._can_inline`), and its template is self-contained: no `extends`,
+    `include`, `import`, `block` or `macro`, and `data` and `subcomponent` are only
+    called. Inside a macro, `data()` and `subcomponent()` read the macro's own `joop`
+    argument instead of the template context, so each inlined component keeps its own
+    scope. At render time, a subcomponent whose instance is not exactly of the annotated
+    type is rendered the usual way.
+
+Functions:
+    get_flat_template(env, component_type, pin=True) -> Optional[jinja2.Template]:
+        Returns the flattened template of a component class, building it on first use.
+
+"""
+
+import threading
+import typing
+import weakref
+from typing import Any, Callable, Optional
+
+import jinja2
+from jinja2 import nodes, TemplateNotFound
+from jinja2.visitor import NodeTransformer
+from markupsafe import Markup
+
+from joop.web.pinning import get_pinned_template
+from joop.web.templater import _JOOP_ROOT, _SUBCOMPONENT_FUNC
+
+_DATA_FUNC = 'data'
+_FLAT_DATA = '_joop_data'
+_FLAT_SUBCOMPONENT = '_joop_sc'
+_FLAT_INLINE = '_joop_inline'
+_FLAT_MACRO = '_joop_flat_{}'
+
+# Nodes that tie a template to its own context or to other templates.
+_ROOT_UNSUPPORTED = (nodes.Extends,)
+_INLINE_UNSUPPORTED = (nodes.Extends, nodes.Include, nodes.Import, nodes.FromImport,
+                       nodes.Block, nodes.Macro)
+
+_unpinned = weakref.WeakKeyDictionary() # env -> {component type: (template, uptodate functions)}
+_unpinned_lock = threading.Lock()
+
+class _NotFlattenable(Exception):
+    """Raised when a template cannot be flattened."""
+
+def _flat_data(joop: dict, key: str) -> Any:
+    """The `data()` of a flattened template, reading the given `joop` dictionary."""
+    return joop.get('data', {}).get(key, "")
+
+def _flat_subcomponent(joop: dict, subcomponent_name: str) -> Markup:
+    """The `subcomponent()` of a flattened template, reading the given `joop` dictionary."""
+    return Markup(joop.get('sc', {}).get(subcomponent_name, ""))
+
+def _make_inline(env: jinja2.Environment, macro_types: dict[str, type]) -> Callable:
+    """
+    Build the function rendering an inlined subcomponent through its macro.
+    """
+    def _inline(joop: dict, subcomponent_name: str, macro_name: str, macro) -> Markup:
+        _sc = joop.get('sc', {})
+        if subcomponent_name not in _sc:
+            return Markup("")
+
+        def _render(_sc_inst):
+            if type(_sc_inst) is not macro_types[macro_name] or _sc_inst._jinja_env is not env:
+                return _sc_inst.render(as_subcomponent = True)
+            return macro(_sc_inst._get_inline_joop())
+
+        return Markup(_sc.render_with(subcomponent_name, _render))
+
+    return _inline
+
+def _get_inline_types(component_type: type) -> dict[str, type]:
+    """
+    Find the subcomponent types declared by the `SubComponents` annotations of a class.
+    """
+    try:
+        _hints = typing.get_type_hints(component_type.SubComponents)
+    except Exception:
+        return {}
+    _res = {}
+    for _name, _hint in _hints.items():
+        _args = typing.get_args(_hint)
+        if typing.get_origin(_hint) is typing.Union and len(_args) == 2 and type(None) in _args:
+            _hint = _args[0] if _args[1] is type(None) else _args[1] # Optional[...]
+        if isinstance(_hint, type) and hasattr(_hint, '_can_inline'):
+            _res[_name] = _hint
+    return _res
+
+class _Flattener(NodeTransformer):
+    """
+    Rewrite a template AST for flattening, building the macros of inlined subcomponents.
+    """
+
+    def __init__(self, env: jinja2.Environment):
+        self.env = env
+        self.filename = None
+        self.macros = []
+        self.macro_names = {} # component type -> macro name
+        self.macro_types = {} # macro name -> component type
+        self._building = set()
+        self._inline_types = {}
+        self.uptodate = [] # the loader's uptodate functions of the sources read
+
+    def rewrite(self, component_type: type, unsupported: tuple) -> nodes.Template:
+        """
+        Parse and rewrite the template of a component class.
+
+        Raises:
+            _NotFlattenable: If the template cannot be flattened.
+        """
+        try:
+            _source, _filename, _uptodate = self.env.loader.get_source(self.env, component_type._template_location)
+        # `ModuleLoader` raises RuntimeError: precompiled templates have no source.
+        except (TemplateNotFound, TypeError, RuntimeError) as e:
+            raise _NotFlattenable() from e
+        if _uptodate is not None:
+            self.uptodate.append(_uptodate)
+        if self.filename is None:
+            self.filename = _filename
+        # The name keys the template's `{% cache %}` fragments.
+        _ast = self.env.parse(_source, component_type._template_location, _filename)
+        if any(True for _ in _ast.find_all(unsupported)):
+            raise _NotFlattenable()
+        if unsupported is _INLINE_UNSUPPORTED:
+            # Ex. `{% set sc = subcomponent %}` would read the template context.
+            _call_heads = {id(_call.node) for _call in _ast.find_all(nodes.Call)}
+            for _ref in _ast.find_all(nodes.Name):
+                if _ref.name in (_DATA_FUNC, _SUBCOMPONENT_FUNC) and id(_ref) not in _call_heads:
+                    raise _NotFlattenable()
+        _outer_types = self._inline_types
+        self._inline_types = _get_inline_types(component_type)
+        self._building.add(component_type)
+        try:
+            return self.visit(_ast)
+        finally:
+            self._building.discard(component_type)
+            self._inline_types = _outer_types
+
+    def _get_macro_name(self, component_type: type) -> Optional[str]:
+        """
+        Return the name of the macro rendering a subcomponent type, building it if needed.
+        Returns None if the type cannot be inlined.
+        """
+        if component_type in self.macro_names:
+            return self.macro_names[component_type]
+        if component_type in self._building or not component_type._can_inline(self.env):
+            return None
+        try:
+            _ast = self.rewrite(component_type, _INLINE_UNSUPPORTED)
+        except _NotFlattenable:
+            self.macro_names[component_type] = None
+            return None
+        _name = _FLAT_MACRO.format(len(self.macros))
+        self.macros.append(nodes.Macro(_name, [nodes.Name(_JOOP_ROOT, 'param')], [], _ast.body))
+        self.macro_names[component_type] = _name
+        self.macro_types[_name] = component_type
+        return _name
+
+    def visit_Call(self, node: nodes.Call) -> nodes.Node:
+        node = self.generic_visit(node)
+        if not isinstance(node.node, nodes.Name):
+            return node
+        _joop = nodes.Name(_JOOP_ROOT, 'load')
+        if node.node.name == _DATA_FUNC:
+            return nodes.Call(nodes.Name(_FLAT_DATA, 'load'), [_joop, *node.args],
+                              node.kwargs, node.dyn_args, node.dyn_kwargs).set_lineno(node.lineno)
+        if node.node.name != _SUBCOMPONENT_FUNC:
+            return node
+        if (len(node.args) == 1 and not node.kwargs and
+            isinstance(node.args[0], nodes.Const) and node.args[0].value in self._inline_types):
+            _macro_name = self._get_macro_name(self._inline_types[node.args[0].value])
+            if _macro_name is not None:
+                return nodes.Call(nodes.Name(_FLAT_INLINE, 'load'),
+                                  [_joop, node.args[0], nodes.Const(_macro_name),
+                                   nodes.Name(_macro_name, 'load')],
+                                  [], None, None).set_lineno(node.lineno)
+        return nodes.Call(nodes.Name(_FLAT_SUBCOMPONENT, 'load'), [_joop, *node.args],
+                          node.kwargs, node.dyn_args, node.dyn_kwargs).set_lineno(node.lineno)
+
+def _build_flat_template(env: jinja2.Environment, component_type: type,
+                         uptodate: Optional[list] = None) -> Optional[jinja2.Template]:
+    """
+    Build the flattened template of a component class.
+
+    Args:
+        env (jinja2.Environment): The environment to compile the template in.
+        component_type (type): The `HTMLComponent` class at the root of the tree.
+        uptodate (Optional[list]): Receives the loader's uptodate functions of the
+            templates read, which all return True while the result is current.
+
+    Returns:
+        Optional[jinja2.Template]: The template, or None if it cannot be flattened or
+        nothing could be inlined.
+    """
+    _flattener = _Flattener(env)
+    if uptodate is not None:
+        _flattener.uptodate = uptodate
+    try:
+        _ast = _flattener.rewrite(component_type, _ROOT_UNSUPPORTED)
+    except _NotFlattenable:
+        return None
+    if not _flattener.macros:
+        return None
+    _ast = nodes.Template([*_flattener.macros, *_ast.body]).set_lineno(1)
+    _ast.set_environment(env)
+    _code = env.compile(_ast, component_type._template_location, _flattener.filename)
+    _globals = env.make_globals({
+        _FLAT_DATA: _flat_data,
+        _FLAT_SUBCOMPONENT: _flat_subcomponent,
+        _FLAT_INLINE: _make_inline(env, _flattener.macro_types),
+    })
+    return env.template_class.from_code(env, _code, _globals)
+
+def get_flat_template(env: jinja2.Environment, component_type: type,
+                      pin: bool = True) -> Optional[jinja2.Template]:
+    """
+    Return the flattened template of a component class, building it on first use.
+
+    Pinned flattened templates are pinned like regular ones (see `joop.web.pinning`), so
+    `invalidate_templates` rebuilds them. Unpinned ones are rebuilt when any of the
+    templates they were built from changes, as `auto_reload` does for regular ones.
+
+    Args:
+        env (jinja2.Environment): The environment to compile the template in.
+        component_type (type): The `HTMLComponent` class at the root of the tree.
+        pin (bool): Whether to pin the template (see `HTML._should_pin`).
+
+    Returns:
+        Optional[jinja2.Template]: The flattened template, or None if the component's
+        template cannot be flattened or has no subcomponent to inline.
+    """
+    if pin:
+        return get_pinned_template(env, (_FLAT_MACRO, component_type),
+                                   lambda: _build_flat_template(env, component_type))
+    _cached = _unpinned.get(env, {}).get(component_type)
+    if _cached is not None and all(_uptodate() for _uptodate in _cached[1]):
+        return _cached[0]
+    _uptodate = []
+    _template = _build_flat_template(env, component_type, _uptodate)
+    with _unpinned_lock:
+        _unpinned.setdefault(env, {})[component_type] = (_template, _uptodate)
+    return _template
@@ -0,0 +1,180 @@
+"""Fragment caching for joop templates.
+
+Caching a whole component is not always possible: a page can be mostly dynamic while one
+    region (ex. the rows loop of a table) is expensive and rarely changes. The `cache`
+    block tag caches just that region:
+
+    {% cache 'rows-' ~ data('definition_name'), 300 %}
+        ... expensive markup ...
+    {% endcache %}
+
+The first argument is the key (any value, typically derived from `data(...)`), the
+    optional second one is the time-to-live in seconds. Keys are scoped to the template
+    they appear in.
+
+Every environment created by `EnvironmentFactory.create_environment` has the tag. Rendered
+    fragments are stored in the environment's `fragment_cache` backend: an in-process
+    `RenderCache` (LRU) by default, or a `DiskFragmentCache`.
+
+Classes:
+    FragmentCacheExtension:
+        The Jinja2 extension providing the `cache` block tag.
+
+    DiskFragmentCache:
+        A fragment cache backend storing fragments as files in a local directory.
+
+"""
+
+import os
+import time
+import hashlib
+import tempfile
+from typing import Any, Hashable, Optional, Union
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from joop.web.cache import RenderCache, make_key
+
+class FragmentCacheExtension(Extension):
+    """
+    The Jinja2 extension providing the `{% cache key, ttl %}...{% endcache %}` block tag.
+
+    Adds a `fragment_cache` attribute to the environment, holding the backend. Any
+    object with `get(key)` and `set(key, value, ttl=None)` methods can be a backend.
+    """
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=RenderCache())
+
+    def parse(self, parser):
+        _lineno = next(parser.stream).lineno
+        _args = [nodes.Const(parser.name), parser.parse_expression()]
+        if parser.stream.skip_if("comma"):
+            _args.append(parser.parse_expression())
+        else:
+            _args.append(nodes.Const(None))
+        _body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_cache_support", _args),
+                               [], [], _body).set_lineno(_lineno)
+
+    def _cache_support(self, template_name: Optional[str], key: Any,
+                       ttl: Optional[float], caller) -> Markup:
+        """
+        Return the cached fragment, rendering and storing it on a miss.
+        """
+        if self.environment.is_async:
+            return self._cache_support_async(template_name, key, ttl, caller)
+        _key = make_key((template_name, key))
+        _backend = self.environment.fragment_cache
+        _res = _backend.get(_key)
+        if _res is None:
+            _res = caller()
+            _backend.set(_key, str(_res), ttl)
+        return Markup(_res)
+
+    async def _cache_support_async(self, template_name: Optional[str], key: Any,
+                                   ttl: Optional[float], caller) -> Markup:
+        _key = make_key((template_name, key))
+        _backend = self.environment.fragment_cache
+        _res = _backend.get(_key)
+        if _res is None:
+            _res = await caller()
+            _backend.set(_key, str(_res), ttl)
+        return Markup(_res)
+
+class DiskFragmentCache:
+    """
+    A fragment cache backend storing fragments as files in a local directory.
+
+    Fragments survive restarts and are shared by every process using the directory.
+    Expired fragments are removed when they are next read.
+
+    Attributes:
+        directory (str): The directory holding the fragments.
+        ttl (Optional[float]): The default time-to-live of a fragment in seconds, if any.
+
+    Methods:
+        get(key) -> Optional[str]:
+            Returns the cached fragment for the key, or None.
+
+        set(key, value, ttl=None):
+            Stores a fragment under the key.
+
+        clear():
+            Removes every fragment.
+    """
+    _suffix = ".fragment"
+
+    def __init__(self, directory: Union[str, os.PathLike], ttl: Optional[float] = None):
+        """
+        Initialize the backend, creating the directory if needed.
+
+        Args:
+            directory (Union[str, os.PathLike]): The directory to store fragments in.
+            ttl (Optional[float]): The default time-to-live of a fragment in seconds.
+        """
+        self.directory = os.fspath(directory)
+        self.ttl = ttl
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: Hashable) -> str:
+        _digest = hashlib.sha256(repr(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, _digest + self._suffix)
+
+    def get(self, key: Hashable) -> Optional[str]:
+        """
+        Return the cached fragment for the key.
+
+        Args:
+            key (Hashable): The key to look up.
+
+        Returns:
+            Optional[str]: The fragment, or None if it is missing or expired.
+        """
+        _path = self._path(key)
+        try:
+            with open(_path, "r", encoding="utf-8", newline="") as f:
+                _expires_at = f.readline().rstrip("\n")
+                _value = f.read()
+        except OSError:
+            return None
+        if _expires_at and float(_expires_at) <= time.time():
+            try:
+                os.remove(_path)
+            except OSError:
+                pass
+            return None
+        return _value
+
+    def set(self, key: Hashable, value: str, ttl: Optional[float] = None):
+        """
+        Store a fragment under the key. The file is replaced atomically.
+
+        Args:
+            key (Hashable): The key to store the fragment under.
+            value (str): The fragment.
+            ttl (Optional[float]): The time-to-live in seconds, overriding the default.
+        """
+        _ttl = self.ttl if ttl is None else ttl
+        _expires_at = "" if _ttl is None else repr(time.time() + _ttl)
+        _fd, _tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(_fd, "w", encoding="utf-8", newline="") as f:
+                f.write(_expires_at + "\n" + value)
+            os.replace(_tmp_path, self._path(key))
+        except BaseException:
+            os.remove(_tmp_path)
+            raise
+
+    def clear(self):
+        """Remove every fragment."""
+        for _name in os.listdir(self.directory):
+            if _name.endswith(self._suffix):
+                try:
+                    os.remove(os.path.join(self.directory, _name))
+                except OSError:
+                    pass
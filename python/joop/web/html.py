@@ -12,13 +12,31 @@ Classes:
         A component class that extends both Component and HTML to provide
         functionality for rendering HTML components with subcomponents and data.
 
+    ProcessedTree:
+        A component tree whose data is processed and templates are loaded, ready to be
+        digested into an ETag or rendered.
+
+    LazyRenderedSubComponents:
+        A mapping that renders each subcomponent the first time a template asks for it.
+
 """
 
 import jinja2
-from typing import Optional
-from dataclasses import asdict, fields
-from joop.web.component import Component
+import asyncio
+from functools import partial
+from typing import Callable, Collection, Iterator, Optional
+from collections.abc import Mapping
+from joop.web.component import Component, DataView, get_field_plan
 from joop.web.j_env import get_joop_env
+from joop.web.cache import RenderCache, make_key
+from joop.web.etag import make_etag, get_template_version
+from joop.web.parallel import get_render_workers_from_env, render_concurrently
+from joop.web.pinning import get_pinned_template
+from joop.web.flatten import get_flat_template
+from joop.web.profiler import (
+    Span, start_span, stop_span, SPAN_COMPONENT, SPAN_LOAD_TEMPLATE, SPAN_TEMPLATE
+)
+from joop.web.templater import EnvironmentFactory
 
 class HTML():
     """
@@ -33,6 +51,10 @@ class HTML():
     Attributes:
         _template_location (str): The location of the Jinja2 template file.
         _jinja_env (Optional[jinja2.Environment]): The Jinja2 environment used for rendering.
+        _pin_template (Optional[bool]): Whether the template is resolved once per
+            environment and pinned (see `joop.web.pinning`), instead of asking the
+            environment every time. If None, templates are pinned unless the environment
+            has `auto_reload` set (Jinja's default), so template edits keep showing up.
 
     Methods:
         __init__(j_env: Optional[jinja2.Environment] = None):
@@ -40,9 +62,13 @@ class HTML():
 
         _get_template() -> jinja2.Template:
             Retrieves the Jinja2 template based on the template location.
+
+        _should_pin() -> bool:
+            Whether the component's templates are pinned.
     """
     _template_location: None
     _jinja_env: Optional[jinja2.Environment] = None
+    _pin_template: Optional[bool] = None
 
     def __init__(self, j_env: Optional[jinja2.Environment] = None):
         """
@@ -62,13 +88,26 @@ class HTML():
         if self._jinja_env is None:
             raise ValueError("A Jinja2 environment must be provided either as a class property or during initialization.")
 
+    def _should_pin(self) -> bool:
+        """
+        Whether the component's templates are pinned: `_pin_template`, or by default
+        whether the environment does not `auto_reload`.
+        """
+        if self._pin_template is None:
+            return not self._jinja_env.auto_reload
+        return self._pin_template
+
     def _get_template(self) -> jinja2.Template:
         """
         Retrieve the Jinja2 template based on the template location.
 
+        Pinned templates are only resolved again after `joop.web.pinning.invalidate_templates`.
+
         Returns:
             jinja2.Template: The Jinja2 template object.
         """
+        if self._should_pin():
+            return get_pinned_template(self._jinja_env, self._template_location)
         _res = self._jinja_env.get_template(self._template_location)
         return _res
     
@@ -82,17 +121,85 @@ class HTMLComponent(Component, HTML):
 
     Attributes:
         _loaded_template (jinja2.Template): The loaded Jinja2 template for the component.
+        _render_cache (Optional[RenderCache]): Opt-in cache of rendered output, keyed on
+            the inputs and the template. Only use it for components whose output (including
+            their default subcomponents) is fully determined by their inputs.
+        _render_workers (Optional[int]): The maximum number of subcomponents rendered
+            concurrently. Defaults to the `JOOP_RENDER_WORKERS` environment variable;
+            0 or 1 renders them serially.
+        _last_render (Optional[str]): The last output, kept for components in an
+            incremental tree (see `Component._incremental`).
+        _iterative (bool): Whether `render` walks the component tree with an explicit
+            stack instead of recursing (see `render_iterative`), for very deep trees.
+        _flatten (bool): Whether `render` and `stream` inline the templates of statically
+            known subcomponents into this component's template, rendering the whole tree
+            in one template pass (see `joop.web.flatten`). Ignored for async environments
+            and concurrent renders.
+        _register (bool): Whether `get_registered_templates` lists the template of this
+            very class (subclasses set their own). False for throwaway classes, ex. the
+            benchmark's, whose templates are not meant to be compiled.
 
     Methods:
         __init__(j_env: Optional[jinja2.Environment] = None, parent: Optional[Component] = None):
             Initializes the HTMLComponent with a Jinja2 environment and an optional parent component.
 
-        _load_template():
+        _load_template(flatten: bool = False):
             Loads the Jinja2 template for the component.
 
+        _can_inline(env: jinja2.Environment) -> bool:
+            Whether the class can be inlined into a parent's flattened template.
+
+        _get_inline_joop() -> dict:
+            Prepares the component for rendering inside a parent's flattened template.
+
+        _get_joop_context(rendered_subs: Mapping[str, str]) -> dict:
+            Fills the `joop` template variable for a render.
+
+        _clear_own_state():
+            Drops the inputs and data of the component, and the output of its subcomponents.
+
+        _render_cache_key() -> Hashable:
+            Builds the render cache key for the current inputs.
+
+        _begin_render(as_subcomponent: bool, kwargs: dict) -> Optional[str]:
+            Prepares the inputs for a render, and looks for output that can be reused as-is.
+
+        _end_render(html: str) -> str:
+            Stores the output of a render for reuse, where enabled.
+
+        _stop_profile_span():
+            Stops the profiler span of the component's render, if any is running.
+
+        _get_render_workers() -> int:
+            Resolves the maximum number of concurrent subcomponent renders.
+
         render(as_subcomponent: bool = False, **kwargs) -> str:
             Renders the component as a string, optionally as a subcomponent.
 
+        render_iterative(as_subcomponent: bool = False, **kwargs) -> str:
+            Renders the component as a string without recursing through the component tree.
+
+        process_tree() -> Optional[ProcessedTree]:
+            Processes the data of the component tree and loads its templates, without rendering.
+
+        get_etag() -> Optional[str]:
+            Computes a strong ETag of the component's output without rendering it.
+
+        get_subcomponent(path: str) -> Optional[Component]:
+            Resolves a dotted subcomponent path, ex. `table.rows`, in the component tree.
+
+        render_fragment(path: str) -> Optional[str]:
+            Renders only the subcomponent at a dotted path, as it renders in the whole page.
+
+        render_async(as_subcomponent: bool = False, **kwargs) -> str:
+            Renders the component on the running event loop, optionally as a subcomponent.
+
+        stream(as_subcomponent: bool = False, **kwargs) -> Iterator[str]:
+            Renders the component as a stream of HTML chunks, optionally as a subcomponent.
+
+        get_registered_templates() -> list[str]:
+            Returns the template locations of this class and every subclass defined so far.
+
     Nested Classes:
         SubComponents:
             A class for managing subcomponents of the HTMLComponent.
@@ -101,11 +208,17 @@ class HTMLComponent(Component, HTML):
                 get_all -> dict[str, 'Component']:
                     Retrieves all subcomponents as a dictionary.
 
-                render():
+                render(max_workers: int = 0, names=None):
                     Renders all subcomponents and stores their HTML output.
 
-                get_rendered() -> dict[str, str]:
+                get_rendered(max_workers: int = 0, names=None) -> dict[str, str]:
                     Returns the rendered HTML output of all subcomponents.
+
+                get_rendered_async(names=None) -> dict[str, str]:
+                    Renders all subcomponents concurrently on the running event loop.
+
+                get_rendered_lazy() -> LazyRenderedSubComponents:
+                    Returns a mapping that renders subcomponents on first access.
     """
 
     class SubComponents(Component.SubComponents):
@@ -116,12 +229,19 @@ class HTMLComponent(Component, HTML):
             get_all -> dict[str, 'Component']:
                 Retrieves all subcomponents as a dictionary.
 
-            render():
+            render(max_workers: int = 0, names=None):
                 Renders all subcomponents and stores their HTML output.
 
-            get_rendered() -> dict[str, str]:
+            get_rendered(max_workers: int = 0, names=None) -> dict[str, str]:
                 Returns the rendered HTML output of all subcomponents.
+
+            get_rendered_async(names=None) -> dict[str, str]:
+                Renders all subcomponents concurrently on the running event loop.
+
+            get_rendered_lazy() -> LazyRenderedSubComponents:
+                Returns a mapping that renders subcomponents on first access.
         """
+        __slots__ = ('_rendered_sc_html',)
 
         @property
         def get_all(self) -> dict[str, 'Component']:
@@ -132,33 +252,91 @@ class HTMLComponent(Component, HTML):
                 dict[str, Component]: A dictionary where keys are subcomponent names
                 and values are the subcomponent instances.
             """
-            return {field.name: getattr(self, field.name) for field in fields(self)}
+            return get_field_plan(type(self)).as_dict(self)
 
-        def render(self):
+        def _get_selected(self, names: Optional[Collection[str]] = None) -> dict[str, 'Component']:
+            """
+            Retrieve the named subcomponents (all if `names` is None) in declaration order.
+            """
+            _all = self.get_all
+            if names is None:
+                return _all
+            return {_sc_name: _sc_inst for _sc_name, _sc_inst in _all.items() if _sc_name in names}
+
+        def render(self, max_workers: int = 0, names: Optional[Collection[str]] = None):
             """
             Render all subcomponents and store their HTML output.
 
             This method iterates through all subcomponents, renders each one, and
-            stores the resulting HTML in a dictionary.
+            stores the resulting HTML in a dictionary. With `max_workers` above 1,
+            up to that many subcomponents are rendered concurrently on the shared
+            render pool; the dictionary keeps the declaration order either way.
+
+            Args:
+                max_workers (int): The maximum number of concurrent subcomponent renders.
+                names (Optional[Collection[str]]): Only render these subcomponents.
             """
+            if max_workers > 1:
+                self._rendered_sc_html = render_concurrently(
+                    {_sc_name: partial(_sc_inst.render, as_subcomponent = True)
+                     for _sc_name, _sc_inst in self._get_selected(names).items()},
+                    max_workers)
+                return
             self._rendered_sc_html = {}
-            for _sc_name, _sc_inst in self.get_all.items():
+            for _sc_name, _sc_inst in self._get_selected(names).items():
                 self._rendered_sc_html[_sc_name] = _sc_inst.render(as_subcomponent = True)
 
-        def get_rendered(self) -> dict[str, str]:
+        def get_rendered(self, max_workers: int = 0,
+                         names: Optional[Collection[str]] = None) -> dict[str, str]:
             """
             Return the rendered HTML output of all subcomponents.
 
             This method ensures that all subcomponents are rendered and returns
             their HTML output as a dictionary.
 
+            Args:
+                max_workers (int): The maximum number of concurrent subcomponent renders.
+                names (Optional[Collection[str]]): Only render these subcomponents.
+
+            Returns:
+                dict[str, str]: A dictionary where keys are subcomponent names and
+                values are their rendered HTML output.
+            """
+            self.render(max_workers, names)
+            return self._rendered_sc_html
+
+        async def get_rendered_async(self, names: Optional[Collection[str]] = None) -> dict[str, str]:
+            """
+            Render all subcomponents concurrently on the running event loop.
+
+            Sibling subcomponents are gathered with `asyncio.gather`; their HTML
+            output is stored in declaration order.
+
+            Args:
+                names (Optional[Collection[str]]): Only render these subcomponents.
+
             Returns:
                 dict[str, str]: A dictionary where keys are subcomponent names and
                 values are their rendered HTML output.
             """
-            self.render()
+            _all = self._get_selected(names)
+            _res = await asyncio.gather(
+                *(_sc_inst.render_async(as_subcomponent = True) for _sc_inst in _all.values()))
+            self._rendered_sc_html = dict(zip(_all, _res))
             return self._rendered_sc_html
 
+        def get_rendered_lazy(self) -> 'LazyRenderedSubComponents':
+            """
+            Return a mapping that renders subcomponents on first access.
+
+            Nothing is rendered up front; each subcomponent is rendered when the
+            template reaches its `subcomponent()` call.
+
+            Returns:
+                LazyRenderedSubComponents: The lazily rendered HTML output of all subcomponents.
+            """
+            return LazyRenderedSubComponents(self)
+
     def __init__(self, j_env: Optional[jinja2.Environment] = None, parent: Optional[Component] = None):
         """
         Initialize the HTMLComponent with a Jinja2 environment and an optional parent component.
@@ -170,15 +348,250 @@ class HTMLComponent(Component, HTML):
         super().__init__(parent=parent, j_env=j_env)  # Pass both arguments to super()
 
     _loaded_template: jinja2.Template
-    
-    def _load_template(self):
+    _render_cache: Optional[RenderCache] = None
+    _render_workers: Optional[int] = None
+    _pending_cache_key = None
+    _last_render: Optional[str] = None
+    _flatten: bool = False
+    _joop_context: Optional[dict] = None
+    _profile_span: Optional[Span] = None
+    _iterative: bool = False
+    _register: bool = True
+
+    def _load_template(self, flatten : bool = False):
         """
         Load the Jinja2 template for the component.
 
         This method retrieves the template using the _get_template method and
         stores it in the _loaded_template attribute.
+
+        Args:
+            flatten (bool): Load the flattened template of the component tree instead,
+                if it can be used (see `_flatten`).
+        """
+        _span = start_span(SPAN_LOAD_TEMPLATE, self._template_location)
+        try:
+            _template = None
+            if flatten and not self._jinja_env.is_async and self._get_render_workers() <= 1:
+                _template = get_flat_template(self._jinja_env, type(self), pin = self._should_pin())
+            if _template is None:
+                _template = self._get_template()
+            self._loaded_template = _template
+        finally:
+            stop_span(_span)
+
+    @classmethod
+    def _can_inline(cls, env : jinja2.Environment) -> bool:
+        """
+        Whether the class can be inlined into a parent's flattened template.
+
+        Components that customize rendering, cache their output or belong to an
+        incremental tree are rendered the usual way.
+
+        Args:
+            env (jinja2.Environment): The environment of the flattened template.
+
+        Returns:
+            bool: True if the class's template can be inlined.
+        """
+        return (cls.render is HTMLComponent.render and
+                cls._jinja_env is env and
+                isinstance(cls._template_location, str) and
+                cls._render_cache is None and
+                not cls._incremental)
+
+    def _get_inline_joop(self) -> dict:
         """
-        self._loaded_template = self._get_template()
+        Prepare the component for rendering inside a parent's flattened template.
+
+        Like rendering it as a subcomponent, up to the template render.
+
+        Returns:
+            dict: The `joop` argument of the component's macro.
+        """
+        self.inputs = self.Inputs()
+        super().render()
+        self.subs = self.SubComponents()
+        return self._get_joop_context(self.subs.get_rendered_lazy())
+
+    def _get_joop_context(self, rendered_subs : Mapping[str, str]) -> dict:
+        """
+        Fill the `joop` template variable for a render.
+
+        The dictionary is created once per instance and refilled on each render, so
+        reused instances (ex. pooled by a View) do not allocate it again.
+
+        Args:
+            rendered_subs (Mapping[str, str]): The rendered HTML output of the subcomponents.
+
+        Returns:
+            dict: The `joop` template variable.
+        """
+        _res = self._joop_context
+        if _res is None:
+            _res = self._joop_context = {}
+        _res['sc'] = rendered_subs
+        _res['data'] = DataView(self.data)
+        return _res
+
+    def _clear_own_state(self):
+        """Drop the inputs and data of the component, and the output of its subcomponents."""
+        super()._clear_own_state()
+        if self._joop_context is not None:
+            self._joop_context.clear()
+        if getattr(self, '_subs', None) is not None:
+            self._subs._rendered_sc_html = {}
+
+    def _render_cache_key(self):
+        """
+        Build the render cache key for the current inputs.
+
+        The key covers the component class, the template identity and the inputs.
+
+        Returns:
+            Hashable: The render cache key.
+        """
+        return (type(self), self._template_location, id(self._jinja_env), make_key(self.inputs))
+
+    def _begin_render(self, as_subcomponent : bool, kwargs : dict) -> Optional[str]:
+        """
+        Prepare the inputs for a render, and look for output that can be reused as-is.
+
+        Args:
+            as_subcomponent (bool): Whether the component is rendered as a subcomponent.
+            kwargs (dict): The keyword arguments for the subcomponent's inputs.
+
+        Returns:
+            Optional[str]: The last output of a clean component in an incremental tree,
+            or a render cache hit. None if the component has to be rendered.
+        """
+        if as_subcomponent == True and not self._incremental:
+            self.inputs = self.Inputs(**kwargs)
+        _span = start_span(SPAN_COMPONENT, type(self).__qualname__, self._template_location)
+        if _span is not None:
+            self._profile_span = _span
+        if self._incremental and not self._dirty:
+            _res = self._last_render
+        else:
+            self._pending_cache_key = None
+            if self._render_cache is None:
+                return None
+            self._pending_cache_key = self._render_cache_key()
+            _res = self._render_cache.get(self._pending_cache_key)
+            if _res is not None and self._incremental:
+                self._last_render = _res
+                self._dirty = False
+        if _res is not None and _span is not None:
+            _span.cached = True
+            self._profile_span = None
+            stop_span(_span)
+        return _res
+
+    def _reset_subs(self, as_subcomponent : bool):
+        """
+        Reset a subcomponent's subcomponents to their defaults before rendering it.
+
+        Components in an incremental tree keep their subcomponents.
+
+        Args:
+            as_subcomponent (bool): Whether the component is rendered as a subcomponent.
+        """
+        if as_subcomponent == True and not self._incremental:
+            self.subs = self.SubComponents()
+
+    def _end_render(self, html : str) -> str:
+        """
+        Store the output of a render for reuse, where enabled.
+
+        Args:
+            html (str): The rendered HTML output.
+
+        Returns:
+            str: The same HTML output.
+        """
+        if self._pending_cache_key is not None:
+            self._render_cache.set(self._pending_cache_key, html)
+        if self._incremental:
+            self._last_render = html
+            self._dirty = False
+        self._stop_profile_span()
+        return html
+
+    def _stop_profile_span(self):
+        """
+        Stop the profiler span of the component's render, if any is running.
+
+        Render paths call it when they end, including by an exception, so the span
+        and the spans inside it do not stay current.
+        """
+        if self._profile_span is not None:
+            stop_span(self._profile_span)
+            self._profile_span = None
+
+    def _get_subcomponent_names(self) -> Optional[frozenset[str]]:
+        """
+        Find the subcomponent names the loaded template can render.
+
+        Returns:
+            Optional[frozenset[str]]: The names, or None when they cannot be determined.
+        """
+        return EnvironmentFactory.get_subcomponent_names(self._jinja_env, self._loaded_template)
+
+    def _get_rendered_subs(self):
+        """
+        Render the subcomponents for the loaded template.
+
+        Serial renders are lazy: a subcomponent is rendered when the template calls
+        `subcomponent()` for it, so one hidden in a false `{% if %}` branch is never
+        rendered. Concurrent renders happen up front, limited to the subcomponents
+        the template references.
+
+        Returns:
+            Mapping[str, str]: The rendered HTML output of the subcomponents by name.
+        """
+        _workers = self._get_render_workers()
+        if _workers > 1:
+            return self.subs.get_rendered(_workers, self._get_subcomponent_names())
+        return self.subs.get_rendered_lazy()
+
+    @classmethod
+    def get_registered_templates(cls) -> list[str]:
+        """
+        Return the template locations of this class and every subclass defined so far.
+
+        Components are registered by defining them, so import the modules that define
+        them first. Classes that set `_register = False` are left out, but not their
+        subclasses.
+
+        Returns:
+            list[str]: The sorted, distinct template locations.
+        """
+        _res = set()
+        _pending = [cls]
+        _seen = set()
+        while _pending:
+            _cls = _pending.pop()
+            if _cls in _seen:
+                continue
+            _seen.add(_cls)
+            if (_cls.__dict__.get('_register', True) and
+                isinstance(getattr(_cls, '_template_location', None), str)):
+                _res.add(_cls._template_location)
+            _pending.extend(_cls.__subclasses__())
+        return sorted(_res)
+
+    @classmethod
+    def _get_render_workers(cls) -> int:
+        """
+        Resolve the maximum number of concurrent subcomponent renders.
+
+        Returns:
+            int: `_render_workers` if set on the class, otherwise the value of the
+            `JOOP_RENDER_WORKERS` environment variable.
+        """
+        if cls._render_workers is not None:
+            return cls._render_workers
+        return get_render_workers_from_env()
 
     def render(self, as_subcomponent : bool = False, **kwargs) -> str:
         """
@@ -186,6 +599,10 @@ class HTMLComponent(Component, HTML):
 
         This method prepares the component for rendering, loads the template,
         and renders the HTML output using the provided data and subcomponents.
+        If the class has a `_render_cache`, a cached rendering of equal inputs
+        is returned without processing inputs or rendering the template.
+        Only the subcomponents the template references are rendered (see
+        `_get_rendered_subs`).
 
         Args:
             as_subcomponent (bool): Whether to render the component as a subcomponent.
@@ -194,18 +611,427 @@ class HTMLComponent(Component, HTML):
         Returns:
             str: The rendered HTML output.
         """
-        if as_subcomponent == True:
-            self.inputs = self.Inputs(**kwargs)
-        super().render()
-        if as_subcomponent == True:
-            self.subs = self.SubComponents()
-        self._load_template()
-        _joop = {
-                'sc' : self.subs.get_rendered(),
-                'data' : asdict(self.data)
-            } 
-        return self._loaded_template.render(
-            joop = _joop
-        )
-
-    # render.__isabstractmethod__ = True
\ No newline at end of file
+        if self._iterative:
+            return self.render_iterative(as_subcomponent, **kwargs)
+        try:
+            _res = self._begin_render(as_subcomponent, kwargs)
+            if _res is not None:
+                return _res
+            super().render()
+            self._reset_subs(as_subcomponent)
+            self._load_template(flatten = self._flatten)
+            _joop = self._get_joop_context(self._get_rendered_subs())
+            _span = start_span(SPAN_TEMPLATE, self._template_location)
+            try:
+                _res = self._loaded_template.render(
+                    joop = _joop
+                )
+            finally:
+                stop_span(_span)
+            return self._end_render(_res)
+        finally:
+            self._stop_profile_span()
+
+    # render.__isabstractmethod__ = True
+
+    def render_iterative(self, as_subcomponent : bool = False, **kwargs) -> str:
+        """
+        Render the component as a string without recursing through the component tree.
+
+        The tree is walked with an explicit stack: each component processes its inputs
+        and loads its template on the way down, and renders its template once all of
+        its subcomponents are rendered, on the way up. The Python stack stays flat
+        however deep the tree is. The output is identical to `render`'s.
+
+        Subcomponents are rendered up front, limited to the ones the template references
+        (see `_get_subcomponent_names`); all of them when the references cannot be
+        determined. Subcomponents that customize `render` are rendered with it.
+
+        Args:
+            as_subcomponent (bool): Whether to render the component as a subcomponent.
+            **kwargs: Additional keyword arguments for rendering.
+
+        Returns:
+            str: The rendered HTML output.
+        """
+        _root = _IterativeFrame(self, None, None, as_subcomponent, kwargs)
+        _stack = [_root]
+        _frame = None
+        try:
+            while _stack:
+                _frame = _stack.pop()
+                _component = _frame.component
+                if _frame.rendered is None:
+                    if _frame is not _root and (not isinstance(_component, HTMLComponent) or
+                                                type(_component).render is not HTMLComponent.render):
+                        _frame.deliver(_component.render(as_subcomponent = True))
+                        continue
+                    _res = _component._begin_render(_frame.as_subcomponent, _frame.kwargs)
+                    if _res is not None:
+                        _frame.deliver(_res)
+                        continue
+                    super(HTMLComponent, _component).render()
+                    _component._reset_subs(_frame.as_subcomponent)
+                    _component._load_template()
+                    _subs = _component.subs._get_selected(_component._get_subcomponent_names())
+                    _frame.rendered = dict.fromkeys(_subs)
+                    _stack.append(_frame)
+                    for _sc_name, _sc_inst in reversed(_subs.items()):
+                        _stack.append(_IterativeFrame(_sc_inst, _frame, _sc_name, True, {}))
+                    continue
+                _component.subs._rendered_sc_html = _frame.rendered
+                _joop = _component._get_joop_context(_frame.rendered)
+                _span = start_span(SPAN_TEMPLATE, _component._template_location)
+                try:
+                    _res = _component._loaded_template.render(joop = _joop)
+                finally:
+                    stop_span(_span)
+                _frame.deliver(_component._end_render(_res))
+        except BaseException:
+            # Stop the spans of the components being rendered, innermost first.
+            for _pending in ([_frame] if _frame is not None else []) + _stack[::-1]:
+                if isinstance(_pending.component, HTMLComponent):
+                    _pending.component._stop_profile_span()
+            raise
+        return _root.result
+
+    def get_subcomponent(self, path : str) -> Optional[Component]:
+        """
+        Resolve a dotted subcomponent path, ex. `table.rows`, in the component tree.
+
+        Subcomponents on the way get their default subcomponents, as they would when
+        rendered. No data is processed.
+
+        Args:
+            path (str): The subcomponent names from this component down, separated by dots.
+
+        Returns:
+            Optional[Component]: The subcomponent, or None if the path does not resolve.
+        """
+        _component = self
+        for _depth, _sc_name in enumerate(path.split(".")):
+            if _depth > 0 and isinstance(_component, HTMLComponent):
+                _component._reset_subs(as_subcomponent = True)
+            _subs = getattr(_component, 'subs', None)
+            if _subs is None or _sc_name not in get_field_plan(type(_subs)).name_set:
+                return None
+            _component = getattr(_subs, _sc_name)
+            if _component is None:
+                return None
+        return _component
+
+    def render_fragment(self, path : str) -> Optional[str]:
+        """
+        Render only the subcomponent at a dotted path, as it renders in the whole page.
+
+        Meant for partial page updates (ex. HTMX requests targeting one region): neither
+        this component nor the subcomponent's ancestors and siblings process their data.
+        The conditions of the templates above the subcomponent (ex. `{% if %}` around its
+        `subcomponent()` call) are not evaluated either, so only pass trusted paths.
+
+        Args:
+            path (str): The subcomponent names from this component down, separated by dots.
+
+        Returns:
+            Optional[str]: The HTML output of the subcomponent, or None if the path does
+            not resolve.
+        """
+        _component = self.get_subcomponent(path)
+        if _component is None:
+            return None
+        return _component.render(as_subcomponent = True)
+
+    def process_tree(self) -> Optional['ProcessedTree']:
+        """
+        Process the data of the component tree and load its templates, without rendering.
+
+        Every component of the tree the templates can reference runs `Data.from_inputs`
+        once; the returned tree can then be digested into an ETag, and rendered, from
+        that same data (see `ProcessedTree`).
+
+        Returns:
+            Optional[ProcessedTree]: The processed tree, or None if a component of the
+            tree customizes `render` (its output is then unknown until rendered).
+        """
+        _frames = []
+        _stack = [_IterativeFrame(self, None, None, False, {})]
+        while _stack:
+            _frame = _stack.pop()
+            _component = _frame.component
+            if (not isinstance(_component, HTMLComponent) or
+                type(_component).render is not HTMLComponent.render):
+                return None
+            if _frame.as_subcomponent == True and not _component._incremental:
+                _component.inputs = _component.Inputs()
+            super(HTMLComponent, _component).render()
+            _component._reset_subs(_frame.as_subcomponent)
+            _component._load_template()
+            _subs = _component.subs._get_selected(_component._get_subcomponent_names())
+            _frame.rendered = dict.fromkeys(_subs)
+            _frames.append(_frame)
+            for _sc_name, _sc_inst in reversed(_subs.items()):
+                _stack.append(_IterativeFrame(_sc_inst, _frame, _sc_name, True, {}))
+        return ProcessedTree(_frames)
+
+    def get_etag(self) -> Optional[str]:
+        """
+        Compute a strong ETag of the component's output without rendering it.
+
+        The output is determined by the component's class, its Data, its template and the
+        output of its subcomponents, so the ETag digests the Data and template version
+        (see `joop.web.etag.get_template_version`) of every component of the tree the
+        templates can reference. `Data.from_inputs` runs and templates are loaded, but no
+        template is rendered; use `process_tree` to render from the same data.
+
+        Returns:
+            Optional[str]: The quoted ETag, or None if a component of the tree customizes
+            `render` (its output is then unknown until rendered).
+        """
+        _tree = self.process_tree()
+        if _tree is None:
+            return None
+        return _tree.get_etag()
+
+    async def render_async(self, as_subcomponent : bool = False, **kwargs) -> str:
+        """
+        Render the component on the running event loop, optionally as a subcomponent.
+
+        The asynchronous counterpart of `render`: `Data.from_inputs` may be a coroutine,
+        sibling subcomponents are rendered concurrently, and the template is rendered
+        with `render_async` when the environment was created with `enable_async=True`.
+
+        Args:
+            as_subcomponent (bool): Whether to render the component as a subcomponent.
+            **kwargs: Additional keyword arguments for rendering.
+
+        Returns:
+            str: The rendered HTML output.
+        """
+        try:
+            _res = self._begin_render(as_subcomponent, kwargs)
+            if _res is not None:
+                return _res
+            await super().render_async()
+            self._reset_subs(as_subcomponent)
+            self._load_template()
+            _joop = self._get_joop_context(
+                await self.subs.get_rendered_async(self._get_subcomponent_names()))
+            _span = start_span(SPAN_TEMPLATE, self._template_location)
+            try:
+                if self._jinja_env.is_async:
+                    _res = await self._loaded_template.render_async(joop = _joop)
+                else:
+                    _res = self._loaded_template.render(joop = _joop)
+            finally:
+                stop_span(_span)
+            return self._end_render(_res)
+        finally:
+            self._stop_profile_span()
+
+    def stream(self, as_subcomponent : bool = False, **kwargs) -> Iterator[str]:
+        """
+        Render the component as a stream of HTML chunks, optionally as a subcomponent.
+
+        Chunks are yielded as the template renders (via `Template.generate`), so the
+        beginning of the page can be sent before the rest is rendered. Subcomponents are
+        rendered lazily, when the template reaches them.
+
+        Args:
+            as_subcomponent (bool): Whether to render the component as a subcomponent.
+            **kwargs: Additional keyword arguments for rendering.
+
+        Yields:
+            str: The rendered HTML output, chunk by chunk.
+        """
+        try:
+            _res = self._begin_render(as_subcomponent, kwargs)
+            if _res is not None:
+                yield _res
+                return
+            super().render()
+            self._reset_subs(as_subcomponent)
+            self._load_template(flatten = self._flatten)
+            _joop = self._get_joop_context(self.subs.get_rendered_lazy())
+            if (self._pending_cache_key is None and not self._incremental and
+                self._profile_span is None):
+                yield from self._loaded_template.generate(joop = _joop)
+                return
+            _chunks = []
+            for _chunk in self._loaded_template.generate(joop = _joop):
+                _chunks.append(_chunk)
+                yield _chunk
+            self._end_render("".join(_chunks))
+        finally:
+            self._stop_profile_span()
+
+class ProcessedTree:
+    """
+    A component tree whose data is processed and templates are loaded (see
+    `HTMLComponent.process_tree`), ready to be digested into an ETag or rendered.
+
+    Rendering it reuses the processed data, so `Data.from_inputs` does not run again,
+    and bypasses render caches, so the output always matches the ETag.
+
+    Methods:
+        get_etag() -> str:
+            Computes a strong ETag of the tree's output.
+
+        render() -> str:
+            Renders the tree from its processed data.
+    """
+    __slots__ = ('_frames',)
+
+    def __init__(self, frames: list['_IterativeFrame']):
+        """
+        Initialize the tree.
+
+        Args:
+            frames (list[_IterativeFrame]): The frames of the components, each before
+                its subcomponents.
+        """
+        self._frames = frames
+
+    def _walk_up(self) -> Iterator['_IterativeFrame']:
+        """Return the frames, each after its subcomponents, with their results emptied."""
+        for _frame in self._frames:
+            _frame.rendered = dict.fromkeys(_frame.rendered)
+        return reversed(self._frames)
+
+    def get_etag(self) -> str:
+        """
+        Compute a strong ETag of the tree's output.
+
+        Returns:
+            str: The quoted ETag.
+        """
+        for _frame in self._walk_up():
+            _component = _frame.component
+            _frame.deliver(make_etag(
+                type(_component).__module__, type(_component).__qualname__,
+                get_template_version(_component._jinja_env, _component._loaded_template),
+                _component.data, tuple(_frame.rendered.items())))
+        return self._frames[0].result
+
+    def render(self) -> str:
+        """
+        Render the tree from its processed data.
+
+        Returns:
+            str: The rendered HTML output of the root component.
+        """
+        for _frame in self._walk_up():
+            _component = _frame.component
+            _component._pending_cache_key = None
+            _component.subs._rendered_sc_html = _frame.rendered
+            _joop = _component._get_joop_context(_frame.rendered)
+            _span = start_span(SPAN_TEMPLATE, _component._template_location)
+            try:
+                _res = _component._loaded_template.render(joop = _joop)
+            finally:
+                stop_span(_span)
+            _frame.deliver(_component._end_render(_res))
+        return self._frames[0].result
+
+class _IterativeFrame:
+    """
+    A component on the explicit stack of `HTMLComponent.render_iterative` (or in a
+    `ProcessedTree`).
+
+    Attributes:
+        component (Component): The component to render.
+        parent (Optional[_IterativeFrame]): The frame of the parent component.
+        name (Optional[str]): The subcomponent name in the parent.
+        as_subcomponent (bool): Whether the component is rendered as a subcomponent.
+        kwargs (dict): The keyword arguments for the subcomponent's inputs.
+        rendered (Optional[dict[str, str]]): The HTML output (or ETag) of the
+            subcomponents by name, once they are being rendered.
+        result (Optional[str]): The HTML output (or ETag) of the component, for the root.
+    """
+    __slots__ = ('component', 'parent', 'name', 'as_subcomponent', 'kwargs',
+                 'rendered', 'result')
+
+    def __init__(self, component: Component, parent: Optional['_IterativeFrame'],
+                 name: Optional[str], as_subcomponent: bool, kwargs: dict):
+        self.component = component
+        self.parent = parent
+        self.name = name
+        self.as_subcomponent = as_subcomponent
+        self.kwargs = kwargs
+        self.rendered = None
+        self.result = None
+
+    def deliver(self, html: str):
+        """Hand the result of the component to its parent (or keep it, for the root)."""
+        if self.parent is None:
+            self.result = html
+        else:
+            self.parent.rendered[self.name] = html
+
+class LazyRenderedSubComponents(Mapping):
+    """
+    A mapping that renders each subcomponent the first time a template asks for it.
+
+    The rendered HTML is also stored in the subcomponents' `_rendered_sc_html`, so it
+    reads the same as after an eager render once the template is done.
+
+    Attributes:
+        _all (dict[str, Component]): The subcomponents by name.
+        _rendered (dict[str, str]): The HTML output of the subcomponents rendered so far.
+    """
+    __slots__ = ('_all', '_rendered')
+
+    def __init__(self, subs: HTMLComponent.SubComponents):
+        """
+        Initialize the mapping.
+
+        Args:
+            subs (HTMLComponent.SubComponents): The subcomponents to render.
+        """
+        self._all = subs.get_all
+        self._rendered = {}
+        subs._rendered_sc_html = self._rendered
+
+    def __getitem__(self, name: str) -> str:
+        try:
+            return self._rendered[name]
+        except KeyError:
+            pass
+        _sc_inst = self._all[name]
+        _res = self._rendered[name] = _sc_inst.render(as_subcomponent = True)
+        return _res
+
+    def render_with(self, name: str, render_function: Callable[[Component], str]) -> str:
+        """
+        Render a subcomponent with the given function, unless it was rendered already.
+
+        Used by flattened templates to render inlined subcomponents through their macro.
+
+        Args:
+            name (str): The name of the subcomponent.
+            render_function (Callable[[Component], str]): Renders the subcomponent instance.
+
+        Returns:
+            str: The rendered HTML output of the subcomponent.
+        """
+        try:
+            return self._rendered[name]
+        except KeyError:
+            pass
+        _res = self._rendered[name] = render_function(self._all[name])
+        return _res
+
+    def get(self, name: str, default = None):
+        # Overridden so that a KeyError raised while rendering is not mistaken for
+        #   a missing subcomponent.
+        if name not in self._all:
+            return default
+        return self[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._all
+
+    def __iter__(self):
+        return iter(self._all)
+
+    def __len__(self) -> int:
+        return len(self._all)
@@ -0,0 +1,143 @@
+"""Parallel rendering support for joop components.
+
+Sibling subcomponents are independent of each other, so components whose children do
+    I/O-bound work in `Data.from_inputs` can render those children concurrently.
+All concurrent rendering shares one bounded thread pool, which caps the total in-flight
+    work of the process. Rendering that already runs on a pool thread stays serial, so
+    nested components can never deadlock waiting on the pool.
+
+Variables:
+    RENDER_WORKERS_ENV:
+        The environment variable holding the default number of concurrent sibling renders
+        per component. Unset, 0 or 1 means serial rendering.
+
+    RENDER_POOL_SIZE_ENV:
+        The environment variable holding the size of the shared render thread pool.
+
+Functions:
+    get_render_workers_from_env() -> int:
+        Reads the default number of concurrent sibling renders from the environment.
+
+    get_render_pool() -> ThreadPoolExecutor:
+        Returns the shared render thread pool, creating it on first use.
+
+    in_render_pool() -> bool:
+        Whether the current thread is a render pool thread.
+
+    render_concurrently(renderers, max_workers) -> dict[str, str]:
+        Runs named render callables concurrently and returns their results in order.
+
+"""
+
+import os
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Optional
+
+RENDER_WORKERS_ENV = "JOOP_RENDER_WORKERS"
+RENDER_POOL_SIZE_ENV = "JOOP_RENDER_POOL_SIZE"
+_DEFAULT_POOL_SIZE = 16
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+_thread_state = threading.local()
+
+def _read_int_env(name: str, default: int) -> int:
+    """
+    Read a non-negative integer from the environment.
+
+    Raises:
+        ValueError: If the variable is set to something other than a non-negative integer.
+    """
+    _raw = os.environ.get(name)
+    if _raw is None or _raw.strip() == "":
+        return default
+    try:
+        _res = int(_raw)
+    except ValueError:
+        _res = -1
+    if _res < 0:
+        raise ValueError(f"{name} must be a non-negative integer, got {_raw!r}.")
+    return _res
+
+def get_render_workers_from_env() -> int:
+    """
+    Read the default number of concurrent sibling renders from `JOOP_RENDER_WORKERS`.
+
+    Returns:
+        int: The number of workers; 0 when unset.
+    """
+    return _read_int_env(RENDER_WORKERS_ENV, 0)
+
+def _mark_pool_thread():
+    _thread_state.in_pool = True
+
+def get_render_pool() -> ThreadPoolExecutor:
+    """
+    Return the shared render thread pool, creating it on first use.
+
+    Its size is read from `JOOP_RENDER_POOL_SIZE` (default 16).
+
+    Returns:
+        ThreadPoolExecutor: The shared render thread pool.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(
+                    max_workers=max(1, _read_int_env(RENDER_POOL_SIZE_ENV, _DEFAULT_POOL_SIZE)),
+                    thread_name_prefix="joop-render",
+                    initializer=_mark_pool_thread)
+    return _pool
+
+def in_render_pool() -> bool:
+    """
+    Whether the current thread is a render pool thread.
+
+    Returns:
+        bool: True if called from a render pool thread.
+    """
+    return getattr(_thread_state, 'in_pool', False)
+
+def render_concurrently(renderers: dict[str, Callable[[], str]],
+                        max_workers: int) -> dict[str, str]:
+    """
+    Run named render callables concurrently and return their results in order.
+
+    At most `max_workers` callables are in flight at once. The results are merged in
+    the order of `renderers`, regardless of completion order. If a callable raises, the
+    callables that have not started yet are cancelled and the exception is re-raised.
+    Falls back to serial rendering for a single callable, `max_workers` below 2, or when
+    already running on a render pool thread.
+
+    Args:
+        renderers (dict[str, Callable[[], str]]): Render callables by subcomponent name.
+        max_workers (int): The maximum number of callables in flight.
+
+    Returns:
+        dict[str, str]: The results by subcomponent name, in the order of `renderers`.
+    """
+    if max_workers < 2 or len(renderers) < 2 or in_render_pool():
+        return {_name: _render() for _name, _render in renderers.items()}
+
+    _executor = get_render_pool()
+    _pending = iter(renderers.items())
+    _futures: dict[str, Future] = {}
+    _in_flight = set()
+    try:
+        for _name, _render in _pending:
+            # Each render runs in a copy of the caller's context (ex. for profiling).
+            _future = _executor.submit(contextvars.copy_context().run, _render)
+            _futures[_name] = _future
+            _in_flight.add(_future)
+            while len(_in_flight) >= max_workers:
+                _done, _in_flight = wait(_in_flight, return_when=FIRST_COMPLETED)
+                for _future in _done:
+                    _future.result() # Raise early on failure.
+        return {_name: _future.result() for _name, _future in _futures.items()}
+    except BaseException:
+        for _future in _futures.values():
+            _future.cancel()
+        raise
@@ -0,0 +1,194 @@
+"""Template pinning for joop components.
+
+Jinja's `Environment.get_template` looks the template up in the loader cache on every
+    call and, with `auto_reload`, checks the template file for changes each time. joop
+    components resolve their template once per environment and pin the compiled
+    `jinja2.Template` instead, so rendering does no loader work at all.
+Pinned templates stay in use until they are invalidated, explicitly or by a
+    `TemplateWatcher` during development. Components only pin templates of environments
+    without `auto_reload` unless told otherwise (see `HTML._pin_template`).
+
+Classes:
+    TemplateWatcher:
+        A background thread that invalidates the pinned templates of an environment when
+        its template files change.
+
+Functions:
+    get_pinned_template(env, name, factory=None) -> jinja2.Template:
+        Returns the pinned template, resolving and pinning it on first use.
+
+    invalidate_templates(env=None, names=None):
+        Drops pinned templates so they are resolved again on next use. Derived templates
+        (keyed by anything but a template name) are always dropped.
+
+    watch_templates(env, interval=1.0) -> TemplateWatcher:
+        Starts a TemplateWatcher for the environment.
+
+Usage:
+    - In production, create the environment with `auto_reload=False` so templates are pinned.
+    - In development, keep `auto_reload`, or call `watch_templates(env)` once so edits to
+      pinned templates show up.
+    - After deploying new templates without a restart, call `invalidate_templates()`.
+
+"""
+
+import os
+import threading
+import weakref
+from typing import Any, Callable, Hashable, Iterable, Optional
+
+import jinja2
+
+_pinned = weakref.WeakKeyDictionary() # env -> {name: template}
+_pinned_lock = threading.Lock()
+
+def get_pinned_template(env: jinja2.Environment, name: Hashable,
+                        factory: Optional[Callable[[], Any]] = None) -> jinja2.Template:
+    """
+    Return the pinned template, resolving and pinning it on first use.
+
+    Args:
+        env (jinja2.Environment): The environment to resolve the template in.
+        name (Hashable): The name of the template.
+        factory (Optional[Callable[[], Any]]): Builds the template instead of the
+            environment, for templates derived from others (ex. flattened component
+            trees); the name is then any key that is not a template name.
+
+    Returns:
+        jinja2.Template: The compiled template.
+    """
+    try:
+        return _pinned[env][name]
+    except KeyError:
+        pass
+    _template = env.get_template(name) if factory is None else factory()
+    with _pinned_lock:
+        _pinned.setdefault(env, {})[name] = _template
+    return _template
+
+def invalidate_templates(env: Optional[jinja2.Environment] = None,
+                         names: Optional[Iterable[str]] = None):
+    """
+    Drop pinned templates so they are resolved again on next use.
+
+    The invalidated templates are also dropped from the environment's Jinja template
+    cache, so changed templates are reloaded even without `auto_reload`.
+
+    Args:
+        env (Optional[jinja2.Environment]): The environment to invalidate; all if None.
+        names (Optional[Iterable[str]]): The template names to invalidate; all if None.
+    """
+    with _pinned_lock:
+        _envs = list(_pinned.keys()) if env is None else [env]
+        for _env in _envs:
+            if names is None:
+                _pinned.pop(_env, None)
+                if _env.cache is not None:
+                    _env.cache.clear()
+                continue
+            _templates = _pinned.get(_env, {})
+            _names = set(names)
+            for _name in _names:
+                _templates.pop(_name, None)
+            if _env.cache is not None:
+                # Jinja keys its cache by (loader reference, name).
+                for _key in [_key for _key in _env.cache.keys() if _key[1] in _names]:
+                    del _env.cache[_key]
+            # Derived templates may be built from any of the invalidated ones.
+            for _name in [_name for _name in _templates if not isinstance(_name, str)]:
+                del _templates[_name]
+
+def _iter_search_paths(loader: Optional[jinja2.BaseLoader]) -> Iterable[str]:
+    """Yield the directories of every file system loader inside the given loader."""
+    if isinstance(loader, jinja2.FileSystemLoader):
+        yield from loader.searchpath
+    elif isinstance(loader, jinja2.ChoiceLoader):
+        for _loader in loader.loaders:
+            yield from _iter_search_paths(_loader)
+    elif isinstance(loader, jinja2.PrefixLoader):
+        for _loader in loader.mapping.values():
+            yield from _iter_search_paths(_loader)
+
+class TemplateWatcher(threading.Thread):
+    """
+    A background thread that invalidates the pinned templates of an environment when
+    its template files change.
+
+    It polls the modification times of the files under the environment's file system
+    loaders. Any change invalidates the whole environment, since templates can include
+    or extend each other. Meant for development; production should not need it.
+
+    Attributes:
+        env (jinja2.Environment): The environment being watched.
+        interval (float): The number of seconds between polls.
+
+    Methods:
+        check() -> bool:
+            Polls once and invalidates the environment if anything changed.
+
+        stop():
+            Stops the thread.
+    """
+
+    def __init__(self, env: jinja2.Environment, interval: float = 1.0):
+        """
+        Initialize the watcher. Call `start()` to begin polling.
+
+        Args:
+            env (jinja2.Environment): The environment to watch.
+            interval (float): The number of seconds between polls.
+        """
+        super().__init__(name="joop-template-watcher", daemon=True)
+        self.env = env
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._snapshot = self._take_snapshot()
+
+    def _take_snapshot(self) -> dict[str, float]:
+        _res = {}
+        for _search_path in _iter_search_paths(self.env.loader):
+            for _dir, _, _files in os.walk(_search_path):
+                for _file in _files:
+                    _path = os.path.join(_dir, _file)
+                    try:
+                        _res[_path] = os.stat(_path).st_mtime
+                    except OSError:
+                        pass
+        return _res
+
+    def check(self) -> bool:
+        """
+        Poll once and invalidate the environment if anything changed.
+
+        Returns:
+            bool: True if a template file was added, removed or modified.
+        """
+        _snapshot = self._take_snapshot()
+        if _snapshot == self._snapshot:
+            return False
+        self._snapshot = _snapshot
+        invalidate_templates(self.env)
+        return True
+
+    def run(self):
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        """Stop the thread."""
+        self._stopped.set()
+
+def watch_templates(env: jinja2.Environment, interval: float = 1.0) -> TemplateWatcher:
+    """
+    Start a TemplateWatcher for the environment.
+
+    Args:
+        env (jinja2.Environment): The environment to watch.
+        interval (float): The number of seconds between polls.
+
+    Returns:
+        TemplateWatcher: The running watcher.
+    """
+    _watcher = TemplateWatcher(env, interval)
+    _watcher.start()
+    return _watcher
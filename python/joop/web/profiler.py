@@ -0,0 +1,288 @@
+"""Render profiling for joop components.
+
+A `RenderProfiler` records a timing tree of everything rendered inside its `with`
+    block: each component render, its `Data.from_inputs`, its template loading and its
+    template render, nested the way they ran. Every span knows its component class and
+    template, and its self time versus the time spent in its children.
+
+The tree exports as JSON, or as collapsed stacks for flamegraph tools
+    (ex. `flamegraph.pl`, speedscope).
+
+When no profiler is active, each instrumentation point costs one global check. With a
+    `sample_rate` below 1, only a fraction of the requests are recorded, so a profiler can
+    stay in production:
+
+    with RenderProfiler(sample_rate=0.01, on_finish=report):
+        html = MyView.render(**kwargs)
+
+The current span is tracked in a context variable, so concurrent subcomponent renders
+    (threads or asyncio tasks) nest under the right parent.
+
+Classes:
+    Span:
+        One timed step of a render.
+
+    RenderProfiler:
+        A context manager recording the timing tree of the renders inside it.
+
+Functions:
+    start_span(kind, name, template=None) -> Optional[Span]:
+        Starts a span under the current one, if a profiler is recording.
+
+    stop_span(span):
+        Stops a span started with `start_span`.
+
+"""
+
+import contextvars
+import json
+import random
+import threading
+import time
+from typing import Any, Callable, Optional
+
+SPAN_REQUEST = 'request'
+SPAN_COMPONENT = 'component'
+SPAN_FROM_INPUTS = 'from_inputs'
+SPAN_LOAD_TEMPLATE = 'load_template'
+SPAN_TEMPLATE = 'template'
+
+_current_span = contextvars.ContextVar('joop_current_span', default=None)
+_recording = 0 # The number of profilers recording, in any thread.
+_recording_lock = threading.Lock()
+
+class Span:
+    """
+    One timed step of a render.
+
+    Attributes:
+        kind (str): What was timed: 'request', 'component', 'from_inputs',
+            'load_template' or 'template'.
+        name (str): The component class or template name.
+        template (Optional[str]): The template of the component, if any.
+        cached (bool): Whether the component's output was reused instead of rendered.
+        start (float): The start time, in seconds.
+        end (Optional[float]): The end time, in seconds; None while running.
+        children (list[Span]): The spans started while this one was running.
+    """
+    __slots__ = ('kind', 'name', 'template', 'cached', 'start', 'end', 'children',
+                 '_clock', '_parent')
+
+    def __init__(self, kind: str, name: str, template: Optional[str],
+                 clock: Callable[[], float], parent: Optional['Span']):
+        """
+        Start a span.
+
+        Args:
+            kind (str): What is timed.
+            name (str): The component class or template name.
+            template (Optional[str]): The template of the component, if any.
+            clock (Callable[[], float]): The clock to time the span with.
+            parent (Optional[Span]): The span this one runs in, if any.
+        """
+        self.kind = kind
+        self.name = name
+        self.template = template
+        self.cached = False
+        self.children = []
+        self._clock = clock
+        self._parent = parent
+        self.end = None
+        self.start = clock()
+
+    @property
+    def duration(self) -> float:
+        """The duration of the span in seconds (so far, while running)."""
+        return (self._clock() if self.end is None else self.end) - self.start
+
+    @property
+    def child_time(self) -> float:
+        """
+        The time spent in the span's children, in seconds. Children that ran
+        concurrently count their overlapping time once.
+        """
+        _res = 0.0
+        _covered = None # The end of the time covered so far.
+        for _start, _end in sorted((_child.start, _child.start + _child.duration)
+                                   for _child in self.children):
+            if _covered is None or _start > _covered:
+                _res += _end - _start
+                _covered = _end
+            elif _end > _covered:
+                _res += _end - _covered
+                _covered = _end
+        return _res
+
+    @property
+    def self_time(self) -> float:
+        """The time spent in the span itself, outside its children, in seconds."""
+        return max(self.duration - self.child_time, 0.0)
+
+    def to_dict(self) -> dict[str, Any]:
+        """
+        Convert the span and its children to plain dictionaries.
+
+        Returns:
+            dict[str, Any]: The span, with times in seconds.
+        """
+        _res = {
+            'kind': self.kind,
+            'name': self.name,
+            'duration': self.duration,
+            'self_time': self.self_time,
+            'child_time': self.child_time,
+            'children': [_child.to_dict() for _child in self.children],
+        }
+        if self.template is not None:
+            _res['template'] = self.template
+        if self.cached:
+            _res['cached'] = True
+        return _res
+
+def start_span(kind: str, name: str, template: Optional[str] = None) -> Optional[Span]:
+    """
+    Start a span under the current one, if a profiler is recording.
+
+    Args:
+        kind (str): What is timed.
+        name (str): The component class or template name.
+        template (Optional[str]): The template of the component, if any.
+
+    Returns:
+        Optional[Span]: The running span, or None when not recording.
+    """
+    if not _recording:
+        return None
+    _parent = _current_span.get()
+    if _parent is None:
+        return None
+    _res = Span(kind, name, template, _parent._clock, _parent)
+    _parent.children.append(_res)
+    _current_span.set(_res)
+    return _res
+
+def stop_span(span: Optional[Span]):
+    """
+    Stop a span started with `start_span`, making its parent current again.
+
+    Spans still running inside it, left behind by an exception, are stopped with it.
+
+    Args:
+        span (Optional[Span]): The span; None is ignored.
+    """
+    if span is None:
+        return
+    _end = span._clock()
+    _pending = [span]
+    while _pending:
+        _span = _pending.pop()
+        if _span.end is None:
+            _span.end = _end
+            _pending.extend(_span.children)
+    _current_span.set(span._parent)
+
+class RenderProfiler:
+    """
+    A context manager recording the timing tree of the renders inside it.
+
+    Attributes:
+        sample_rate (float): The probability that a `with` block is recorded.
+        sampled (bool): Whether the last `with` block was recorded.
+        root (Optional[Span]): The 'request' span of the last recorded `with` block.
+
+    Methods:
+        to_dict() -> Optional[dict]:
+            Returns the timing tree as plain dictionaries.
+
+        to_json(**kwargs) -> str:
+            Returns the timing tree as JSON.
+
+        to_collapsed() -> str:
+            Returns the self times as collapsed stacks, for flamegraph tools.
+    """
+
+    def __init__(self, name: str = SPAN_REQUEST, sample_rate: float = 1.0,
+                 on_finish: Optional[Callable[['RenderProfiler'], None]] = None,
+                 clock: Callable[[], float] = time.perf_counter):
+        """
+        Initialize the profiler.
+
+        Args:
+            name (str): The name of the root span, ex. the request path.
+            sample_rate (float): The probability that a `with` block is recorded.
+            on_finish (Optional[Callable[[RenderProfiler], None]]): Called with the
+                profiler after each recorded `with` block, ex. to report the tree.
+            clock (Callable[[], float]): The clock to time spans with, in seconds.
+        """
+        self.name = name
+        self.sample_rate = sample_rate
+        self.on_finish = on_finish
+        self.clock = clock
+        self.sampled = False
+        self.root = None
+        self._token = None
+
+    def __enter__(self) -> 'RenderProfiler':
+        global _recording
+        self.sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        if not self.sampled:
+            return self
+        self.root = Span(SPAN_REQUEST, self.name, None, self.clock, None)
+        self._token = _current_span.set(self.root)
+        with _recording_lock:
+            _recording += 1
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        global _recording
+        if not self.sampled:
+            return
+        self.root.end = self.clock()
+        _current_span.reset(self._token)
+        self._token = None
+        with _recording_lock:
+            _recording -= 1
+        if self.on_finish is not None:
+            self.on_finish(self)
+
+    def to_dict(self) -> Optional[dict[str, Any]]:
+        """
+        Return the timing tree as plain dictionaries.
+
+        Returns:
+            Optional[dict[str, Any]]: The tree, or None if nothing was recorded.
+        """
+        return None if self.root is None else self.root.to_dict()
+
+    def to_json(self, **kwargs) -> str:
+        """
+        Return the timing tree as JSON.
+
+        Args:
+            **kwargs: Keyword arguments passed on to `json.dumps`.
+
+        Returns:
+            str: The tree as JSON (`null` if nothing was recorded).
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def to_collapsed(self) -> str:
+        """
+        Return the self times as collapsed stacks, for flamegraph tools.
+
+        Each line is a semicolon-separated stack of `kind:name` frames followed by the
+        self time in microseconds; identical stacks are summed.
+
+        Returns:
+            str: The collapsed stacks, one per line.
+        """
+        _totals = {}
+        _pending = [((), self.root)] if self.root is not None else []
+        while _pending:
+            _stack, _span = _pending.pop()
+            _stack = (*_stack, f"{_span.kind}:{_span.name}")
+            _totals[_stack] = _totals.get(_stack, 0) + _span.self_time
+            _pending.extend((_stack, _child) for _child in reversed(_span.children))
+        return "".join(f"{';'.join(_stack)} {round(_time * 1e6)}\n"
+                       for _stack, _time in _totals.items()
+                       if round(_time * 1e6) > 0)
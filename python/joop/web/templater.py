@@ -9,9 +9,18 @@ Classes:
         A factory class for creating and configuring Jinja2 Environment instances.
 
         Methods:
-            create_environment(**kwargs):
+            create_environment(precompiled_path=None, fragment_cache=None, **kwargs):
                 Creates and configures a Jinja2 Environment instance.
-                Registers subcomponent and ata functions.
+                Registers subcomponent and ata functions, the row_dicts filter and the cache tag.
+
+            find_reachable_templates(env: JinjaEnvironment, template_names) -> list[str]:
+                Expands template names with every template they include, import or extend.
+
+            compile_templates(env: JinjaEnvironment, target, template_names, log_function=None) -> list[str]:
+                Compiles templates ahead of time into Python modules.
+
+            get_subcomponent_names(env: JinjaEnvironment, template: Template) -> Optional[frozenset[str]]:
+                Finds the subcomponent names a template can render.
 
             _get_joop(ctx: Context) -> dict:
                 Retrieves the 'joop' dictionary from the Jinja2 context.
@@ -22,19 +31,45 @@ Classes:
             data(ctx: Context, key: str) -> str:
                 Retrieves data associated with a key from the Jinja2 context.
 
+            row_dicts(rows: Iterable) -> Iterator[dict]:
+                Converts table rows to dictionaries batch by batch, as a template iterates them.
+
 Usage:
     - Use `EnvironmentFactory.create_environment()` to create a Jinja2 Environment.
     - Use `subcomponent` and `data` methods to access joop data and subcomponents within a rendered template.
 
 """
 
-from jinja2 import Environment as JinjaEnvironment, pass_context
+import itertools
+import json
+import os
+import weakref
+from typing import Any, Callable, Iterable, Iterator, Optional, Union
+from jinja2 import (
+    Environment as JinjaEnvironment, Template, pass_context, meta, nodes,
+    ModuleLoader, ChoiceLoader, TemplateNotFound, TemplateSyntaxError
+)
 from jinja2.runtime import Context
 from markupsafe import Markup
 
+from joop.web.fragment_cache import FragmentCacheExtension
+
 _JOOP_ROOT = 'joop'
 _SUBCOMPONENT_ROOT = 'sc'
 _DATA_ROOT = 'data'
+_SUBCOMPONENT_FUNC = 'subcomponent'
+
+# The file recording the options templates were compiled with, next to the modules.
+_COMPILE_OPTIONS_FILE = 'joop_compile_options.json'
+# Environment attributes that change the compiled code of a template.
+_COMPILE_OPTIONS = (
+    'is_async', 'trim_blocks', 'lstrip_blocks', 'keep_trailing_newline', 'newline_sequence',
+    'block_start_string', 'block_end_string', 'variable_start_string', 'variable_end_string',
+    'comment_start_string', 'comment_end_string', 'line_statement_prefix', 'line_comment_prefix',
+)
+
+# Template -> the subcomponent names it can render (None when unknown).
+_subcomponent_names = weakref.WeakKeyDictionary()
 
 class EnvironmentFactory:
     """
@@ -45,9 +80,18 @@ class EnvironmentFactory:
     and data.
 
     Methods:
-        create_environment(**kwargs):
+        create_environment(precompiled_path=None, fragment_cache=None, **kwargs):
             Creates and configures a Jinja2 Environment instance.
 
+        find_reachable_templates(env: JinjaEnvironment, template_names) -> list[str]:
+            Expands template names with every template they include, import or extend.
+
+        compile_templates(env: JinjaEnvironment, target, template_names, log_function=None) -> list[str]:
+            Compiles templates ahead of time into Python modules.
+
+        get_subcomponent_names(env: JinjaEnvironment, template: Template) -> Optional[frozenset[str]]:
+            Finds the subcomponent names a template can render.
+
         _get_joop(ctx: Context) -> dict:
             Retrieves the 'joop' dictionary from the Jinja2 context.
 
@@ -59,13 +103,22 @@ class EnvironmentFactory:
     """
 
     @staticmethod
-    def create_environment(**kwargs):
+    def create_environment(precompiled_path: Optional[Union[str, os.PathLike]] = None,
+                           fragment_cache: Optional[Any] = None,
+                           **kwargs):
         """Factory method to create and configure a Jinja2 Environment.
 
         Important: Registers the two main joop functions to the environment:
             'subcomponents' and 'data'.
+        Also registers the `{% cache key, ttl %}` fragment cache tag (see `joop.web.fragment_cache`).
 
         Args:
+            precompiled_path (Optional[Union[str, os.PathLike]]): A directory of templates
+                compiled with `compile_templates` (or `joop compile-templates`). They are
+                loaded through a `ModuleLoader`, without parsing any source at runtime.
+                A `loader` passed as well is used for templates that were not precompiled.
+            fragment_cache (Optional[Any]): The backend of the `cache` tag, ex. a
+                `DiskFragmentCache`. Defaults to an in-process `RenderCache`.
             **kwargs: Arbitrary keyword arguments to configure the Jinja2 Environment.
 
         Returns:
@@ -73,14 +126,241 @@ class EnvironmentFactory:
 
         Usage Example:
             env = EnvironmentFactory.create_environment(autoescape=True)
+
+            # For components rendered with `render_async`:
+            env = EnvironmentFactory.create_environment(enable_async=True)
+
+            # For templates compiled ahead of time:
+            env = EnvironmentFactory.create_environment(precompiled_path="build/templates")
+
+        Raises:
+            ValueError: If the templates in `precompiled_path` were compiled with other
+                options (ex. `autoescape`) than the environment's, or without recording
+                them (see `compile_templates`).
         """
+        if precompiled_path is not None:
+            _loader = ModuleLoader(precompiled_path)
+            if kwargs.get('loader') is not None:
+                _loader = ChoiceLoader([_loader, kwargs['loader']])
+            kwargs['loader'] = _loader
+        kwargs['extensions'] = [*kwargs.get('extensions', ()), FragmentCacheExtension]
         env = JinjaEnvironment(**kwargs)
+        if fragment_cache is not None:
+            env.fragment_cache = fragment_cache
         env.globals.update({
             'subcomponent': EnvironmentFactory.subcomponent,
             'data': EnvironmentFactory.data,
         })
+        env.filters['row_dicts'] = EnvironmentFactory.row_dicts
+        if precompiled_path is not None:
+            EnvironmentFactory._check_compile_options(env, precompiled_path)
         return env
 
+    @staticmethod
+    def find_reachable_templates(env: JinjaEnvironment, template_names: Iterable[str]) -> list[str]:
+        """
+        Expand template names with every template they include, import or extend.
+
+        Templates that the environment's loader cannot find are left out, as are
+        references that are only known at render time.
+
+        Args:
+            env (JinjaEnvironment): The environment whose loader provides the sources.
+            template_names (Iterable[str]): The names of the templates to start from.
+
+        Returns:
+            list[str]: The sorted names of every reachable template.
+        """
+        _pending = list(template_names)
+        _res = set()
+        while _pending:
+            _name = _pending.pop()
+            if _name in _res:
+                continue
+            try:
+                _source, _, _ = env.loader.get_source(env, _name)
+            except TemplateNotFound:
+                continue
+            _res.add(_name)
+            _pending.extend(_ref for _ref in meta.find_referenced_templates(env.parse(_source))
+                            if _ref is not None)
+        return sorted(_res)
+
+    @staticmethod
+    def compile_templates(env: JinjaEnvironment,
+                          target: Union[str, os.PathLike],
+                          template_names: Iterable[str],
+                          log_function: Optional[Callable[[str], None]] = None) -> list[str]:
+        """
+        Compile templates ahead of time into Python modules.
+
+        The given templates and every template reachable from them are compiled into
+        the `target` directory, to be loaded with
+        `create_environment(precompiled_path=target)`. Syntax errors abort the compilation.
+        Options such as `autoescape` are fixed in the compiled code, so they are recorded
+        next to the modules, and the loading environment must match them.
+
+        Args:
+            env (JinjaEnvironment): The environment whose loader provides the sources.
+            target (Union[str, os.PathLike]): The directory to write the modules to.
+            template_names (Iterable[str]): The names of the templates to start from.
+            log_function (Optional[Callable[[str], None]]): Receives progress messages.
+
+        Returns:
+            list[str]: The sorted names of the compiled templates.
+
+        Raises:
+            ValueError: If `target` holds templates compiled with other options.
+        """
+        _names = EnvironmentFactory.find_reachable_templates(env, template_names)
+        _options = EnvironmentFactory._get_compile_options(env, _names)
+        _recorded = EnvironmentFactory._read_compile_options(target)
+        if _recorded is not None:
+            _mismatched = EnvironmentFactory._compare_compile_options(_recorded, _options)
+            if _mismatched:
+                raise ValueError(f"{target} holds templates compiled with other options: "
+                                 f"{', '.join(_mismatched)}")
+            _options['autoescape'] = {**_recorded['autoescape'], **_options['autoescape']}
+        _to_compile = set(_names)
+        env.compile_templates(target,
+                              filter_func=lambda _name: _name in _to_compile,
+                              zip=None,
+                              log_function=log_function,
+                              ignore_errors=False)
+        with open(os.path.join(target, _COMPILE_OPTIONS_FILE), "w") as f:
+            json.dump(_options, f, indent=2, sort_keys=True)
+        return _names
+
+    @staticmethod
+    def _get_compile_options(env: JinjaEnvironment, template_names: Iterable[str]) -> dict:
+        """
+        Return the options of an environment that change the compiled code of templates.
+
+        `autoescape` may depend on the template name, so it is resolved per template.
+        """
+        _res = {_name: getattr(env, _name) for _name in _COMPILE_OPTIONS}
+        _res['autoescape'] = {_name: bool(env.autoescape(_name) if callable(env.autoescape)
+                                          else env.autoescape)
+                              for _name in template_names}
+        return _res
+
+    @staticmethod
+    def _read_compile_options(path: Union[str, os.PathLike]) -> Optional[dict]:
+        """Return the options recorded by `compile_templates` in a directory, if any."""
+        try:
+            with open(os.path.join(path, _COMPILE_OPTIONS_FILE)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _compare_compile_options(recorded: dict, options: dict) -> list[str]:
+        """
+        Return the names of the options that differ, for the templates in both.
+        """
+        _res = [_name for _name in _COMPILE_OPTIONS if recorded.get(_name) != options[_name]]
+        _autoescape = recorded.get('autoescape', {})
+        _res.extend(f"autoescape ({_name})" for _name, _value in options['autoescape'].items()
+                    if _name in _autoescape and _autoescape[_name] != _value)
+        return _res
+
+    @staticmethod
+    def _check_compile_options(env: JinjaEnvironment, path: Union[str, os.PathLike]):
+        """
+        Check that the templates in a directory were compiled with the environment's options.
+
+        Raises:
+            ValueError: If they were compiled with other options, or without recording them.
+        """
+        _recorded = EnvironmentFactory._read_compile_options(path)
+        if _recorded is None:
+            raise ValueError(f"{path} has no {_COMPILE_OPTIONS_FILE}: compile the templates "
+                             "with `EnvironmentFactory.compile_templates` (or "
+                             "`joop compile-templates`).")
+        _options = EnvironmentFactory._get_compile_options(env, _recorded.get('autoescape', {}))
+        _mismatched = EnvironmentFactory._compare_compile_options(_recorded, _options)
+        if _mismatched:
+            raise ValueError(f"The templates in {path} were compiled with other options than "
+                             f"the environment's: {', '.join(_mismatched)}. Compile them again "
+                             "with the same options.")
+
+    @staticmethod
+    def _find_subcomponent_names(env: JinjaEnvironment, template_name: str) -> Optional[frozenset[str]]:
+        """
+        Analyse the template, and every template it includes or extends, for
+        `subcomponent('name')` calls.
+
+        Returns:
+            Optional[frozenset[str]]: The names, or None if they cannot all be known: a
+            call's name is not a string constant, a template reads `joop` directly
+            (ex. `joop.sc['name']`), a referenced template is only known at render time
+            or cannot be found, or a source is not available (ex. precompiled templates).
+        """
+        if env.loader is None:
+            return None
+        _res = set()
+        _pending = [template_name]
+        _seen = set()
+        try:
+            while _pending:
+                _name = _pending.pop()
+                if _name in _seen:
+                    continue
+                _seen.add(_name)
+                _source, _, _ = env.loader.get_source(env, _name)
+                _ast = env.parse(_source, _name)
+                for _ref in meta.find_referenced_templates(_ast):
+                    # Ex. `{% include var %}`: we cannot know what it renders.
+                    if _ref is None:
+                        return None
+                    _pending.append(_ref)
+                _calls = [_call for _call in _ast.find_all(nodes.Call)
+                          if isinstance(_call.node, nodes.Name) and _call.node.name == _SUBCOMPONENT_FUNC]
+                _call_heads = {id(_call.node) for _call in _calls}
+                for _ref in _ast.find_all(nodes.Name):
+                    # Ex. `{% set sc = subcomponent %}` or `joop.sc[name]`: we cannot know
+                    #   what it renders.
+                    if _ref.name == _JOOP_ROOT or (_ref.name == _SUBCOMPONENT_FUNC and
+                                                   id(_ref) not in _call_heads):
+                        return None
+                for _call in _calls:
+                    if (len(_call.args) != 1 or _call.kwargs or
+                        not isinstance(_call.args[0], nodes.Const) or
+                        not isinstance(_call.args[0].value, str)):
+                        return None
+                    _res.add(_call.args[0].value)
+        # `ModuleLoader` raises RuntimeError: precompiled templates have no source.
+        except (TemplateNotFound, TemplateSyntaxError, TypeError, RuntimeError):
+            return None
+        return frozenset(_res)
+
+    @staticmethod
+    def get_subcomponent_names(env: JinjaEnvironment, template: Template) -> Optional[frozenset[str]]:
+        """
+        Find the subcomponent names a template can render.
+
+        The template's AST (and those of the templates it includes or extends) is
+        analysed once per template object; the result is cached until the template is
+        reloaded.
+
+        Args:
+            env (JinjaEnvironment): The environment whose loader provides the sources.
+            template (Template): The template to analyse.
+
+        Returns:
+            Optional[frozenset[str]]: The names of every subcomponent the template can
+            render, or None when they cannot be determined statically.
+        """
+        try:
+            return _subcomponent_names[template]
+        except KeyError:
+            pass
+        _res = None
+        if template.name is not None:
+            _res = EnvironmentFactory._find_subcomponent_names(env, template.name)
+        _subcomponent_names[template] = _res
+        return _res
+
     @staticmethod
     def _get_joop(ctx: Context) -> dict:
         """
@@ -134,6 +414,39 @@ class EnvironmentFactory:
         This function accesses the Jinja2 context to fetch data stored under a specific key.
         It ensures that the data is retrieved safely and returns an empty string if the key
         does not exist in the context.
+        Values are not copied: components hand over a read-only `DataView` of their Data.
         """
         _sc_val = EnvironmentFactory._get_joop(ctx).get(_DATA_ROOT, {}).get(key, "")
         return _sc_val
+
+    @staticmethod
+    def row_dicts(rows: Iterable) -> Iterator[dict]:
+        """
+        Convert table rows to dictionaries batch by batch, as a template iterates them.
+
+        Used as a filter, ex. `{% for row in data('rows') | row_dicts %}`. Each use
+        serializes the rows again, so Data keeps the rows themselves and can be iterated
+        (or digested into an ETag) any number of times.
+
+        Rows are recognized by their methods, so that templating does not depend on
+        `joop.dao`: a collection with its own `iter_dicts` (ex. a `ColumnarResult`)
+        converts itself, and rows are converted by the `iter_dicts` class method of the
+        first one's type (ex. `DAO.iter_dicts`).
+
+        Args:
+            rows (Iterable): DAO instances (see `DAO.iter_dicts`), or a `ColumnarResult`.
+
+        Returns:
+            Iterator[dict]: A dictionary per row, in order.
+        """
+        _iter_dicts = getattr(rows, 'iter_dicts', None)
+        if _iter_dicts is not None:
+            return _iter_dicts()
+        return EnvironmentFactory._iter_row_dicts(rows)
+
+    @staticmethod
+    def _iter_row_dicts(rows: Iterable) -> Iterator[dict]:
+        """Convert rows with the `iter_dicts` class method of the first one's type."""
+        _rows = iter(rows)
+        for _first in _rows:
+            yield from type(_first).iter_dicts(itertools.chain((_first,), _rows))
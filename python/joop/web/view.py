@@ -9,11 +9,18 @@ Classes:
 
 """
 
-from typing import List, Callable, Type
+import threading
+from collections import deque
+from typing import List, Callable, Iterator, Optional, Type, Union
 
 from joop.abstract import AbstractMethod
 from joop.http.methods import HttpMethod
 from joop.web.component import Component
+from joop.web.cache import RenderCache, make_key
+from joop.web.compression import CompressedBody, IDENTITY, choose_encoding
+from joop.web.etag import make_etag, etag_matches
+
+_pool_lock = threading.Lock()
 
 class View():
     """
@@ -32,9 +39,59 @@ class View():
         _get_default_subs (bool):
             Determines whether to automatically retrieve default subcomponents.
 
+        _query_args (tuple[str, ...]):
+            The names of the request's query parameters passed to the component's inputs,
+            ex. `("cursor",)` for a paginated table. URL arguments take precedence.
+
         _as_response (bool):
             Determines whether the view should render a response instead of a component.
 
+        _as_async (bool):
+            Determines whether the view is registered with its asynchronous render function.
+            (Flask requires the `flask[async]` extra for asynchronous views.)
+
+        _stream (bool):
+            Determines whether the view is registered as a streaming (chunked) response.
+
+        _pooled (bool):
+            Determines whether component instances are reused across requests. A pooled
+            instance keeps its subcomponents and render context between requests; only
+            its inputs are replaced, and it drops its inputs and data once released. Each
+            instance serves one request at a time. Only use
+            it for components whose requests do not modify their subcomponents.
+
+        _pool_size (int):
+            The maximum number of idle component instances kept for reuse.
+
+        _etag (bool):
+            Determines whether the view is registered with `render_conditional`: responses
+            carry an ETag, and a matching `If-None-Match` is answered with
+            `304 Not Modified` without rendering any template. With `_htmx` or
+            `_compressed_cache`, their responses carry the ETag instead.
+
+        _compressed_cache (Optional[RenderCache]):
+            Opt-in cache of rendered output, with its gzip and deflate variants, keyed on
+            the view arguments. When set, the view is registered with `render_compressed`.
+            Only use it for views whose output is determined by their arguments.
+
+        _compress_min_size (int):
+            The size in bytes below which cached output is not compressed.
+
+        _htmx (bool):
+            Determines whether the view is registered with `render_partial`: requests
+            targeting one region of the page (see `_get_fragment_path`) only render the
+            subcomponent in that region.
+
+        _fragments (dict[str, str]):
+            The dotted subcomponent paths of the regions of the page, by the element id
+            HTMX requests target (`HX-Target`). Only the listed regions are rendered alone:
+            rendering one skips the conditions of the templates above it, so requests
+            targeting anything else get the whole page.
+
+        _fragment_param (str):
+            The request parameter naming the region (an id of `_fragments`) explicitly,
+            for requests that are not from HTMX.
+
     Methods:
         _get_inputs(**kwargs):
             Retrieves the inputs for the component based on the provided keyword arguments.
@@ -42,9 +99,51 @@ class View():
         _get_subs(**kwargs):
             Retrieves the default subcomponents for the component.
 
+        _make_component(**kwargs):
+            Creates the component for a request, with its inputs and subcomponents.
+
+        _acquire_component(**kwargs):
+            Takes a component for a request from the pool, or creates one.
+
+        _release_component(component: Component):
+            Returns a rendered component to the pool.
+
         render(**kwargs):
             Renders the component and returns the rendered output as a string.
 
+        render_async(**kwargs):
+            Renders the component on the running event loop.
+
+        stream(**kwargs):
+            Renders the component as a stream of HTML chunks.
+
+        _stream_response(chunks: Iterator[str]):
+            Abstract method to wrap a stream of HTML chunks in a streaming response.
+
+        stream_response(**kwargs):
+            Renders the component as a streaming response.
+
+        _get_request_header(name: str) -> Optional[str]:
+            Abstract method to retrieve a header of the current request.
+
+        _make_response(body: str, status: int, headers: dict):
+            Abstract method to build a response.
+
+        render_conditional(**kwargs):
+            Renders the component as a response with an ETag, or answers `304 Not Modified`.
+
+        render_compressed(**kwargs):
+            Serves the cached, pre-compressed output the request's `Accept-Encoding` allows.
+
+        _get_request_arg(name: str) -> Optional[str]:
+            Abstract method to retrieve a query parameter of the current request.
+
+        _get_fragment_path() -> Optional[str]:
+            Retrieves the dotted subcomponent path the current request targets, if any.
+
+        render_partial(**kwargs):
+            Renders only the region of the page the request targets, or the whole page.
+
         _add_to_app(app: object, view_func: Callable):
             Abstract method to add the view to a web application.
 
@@ -67,6 +166,7 @@ class View():
 
     _args_to_inputs : bool = True
     _get_default_subs : bool = True
+    _query_args : tuple[str, ...] = ()
 
     '''
     aliases might be added later
@@ -84,10 +184,26 @@ class View():
                     raise KeyError(f"Key conflict: '{new_key}' already exists in kwargs.")
     '''
 
+    @classmethod
+    def _get_query_args(cls) -> dict:
+        """
+        Retrieve the query parameters of the request named in `_query_args`.
+
+        Returns:
+            dict: The values of the parameters the request has, by name.
+        """
+        _res = {}
+        for _name in cls._query_args:
+            _value = cls._get_request_arg(_name)
+            if _value is not None:
+                _res[_name] = _value
+        return _res
+
     @classmethod
     def _get_inputs(cls, **kwargs):
         """
-        Retrieve the inputs for the component based on the provided keyword arguments.
+        Retrieve the inputs for the component based on the provided keyword arguments
+        and the query parameters named in `_query_args`.
 
         Args:
             **kwargs: Keyword arguments to be mapped to the component's inputs.
@@ -97,6 +213,8 @@ class View():
         """
         _res = None
         if cls._args_to_inputs == True:
+            if cls._query_args:
+                kwargs = {**cls._get_query_args(), **kwargs}
             _res = cls._component_type.Inputs(**kwargs)
             # cls._process_kwargs_aliases(**kwargs)
         return _res
@@ -119,22 +237,378 @@ class View():
 
 
     @classmethod
-    def render(cls, **kwargs):
+    def _make_component(cls, **kwargs) -> Component:
         """
-        Render the component and return the rendered output as a string.
+        Create the component for a request, with its inputs and subcomponents.
 
         Args:
             **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
 
         Returns:
-            str: The rendered output of the component.
+            Component: The component, ready to be rendered.
         """
         _component = cls._component_type()
         _component.inputs = cls._get_inputs(**kwargs)
         _component.subs = cls._get_subs()
-        return _component.render()
+        return _component
+
+    _pooled : bool = False
+    _pool_size : int = 8
+
+    _pool : deque = deque()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each view class gets its own pool up front, so concurrent first requests
+        # cannot each create one.
+        cls._pool = deque()
+
+    @classmethod
+    def _get_pool(cls) -> deque:
+        """
+        Retrieve the idle component instances of this view class.
+        """
+        return cls._pool
+
+    @classmethod
+    def _acquire_component(cls, **kwargs) -> Component:
+        """
+        Take a component for a request from the pool, or create one.
+
+        Without `_pooled`, this is `_make_component`. A pooled component only gets
+        new inputs.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs.
+
+        Returns:
+            Component: The component, ready to be rendered.
+        """
+        if cls._pooled != True:
+            return cls._make_component(**kwargs)
+        try:
+            # deque.pop is atomic: no two requests can take the same instance.
+            _component = cls._get_pool().pop()
+        except IndexError:
+            return cls._make_component(**kwargs)
+        _component.inputs = cls._get_inputs(**kwargs)
+        return _component
+
+    @classmethod
+    def _release_component(cls, component : Component):
+        """
+        Return a rendered component to the pool.
+
+        Components whose render failed are not released, so they are never reused.
+        Released components drop their inputs and data (see
+        `Component._clear_request_state`).
+
+        Args:
+            component (Component): The component, done rendering.
+        """
+        if cls._pooled == True:
+            component._clear_request_state()
+            _pool = cls._get_pool()
+            with _pool_lock:
+                if len(_pool) < cls._pool_size:
+                    _pool.append(component)
+
+    @classmethod
+    def render(cls, **kwargs):
+        """
+        Render the component and return the rendered output as a string.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            str: The rendered output of the component.
+        """
+        _component = cls._acquire_component(**kwargs)
+        _res = _component.render()
+        cls._release_component(_component)
+        return _res
+
+    @classmethod
+    async def render_async(cls, **kwargs):
+        """
+        Render the component on the running event loop.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            str: The rendered output of the component.
+        """
+        _component = cls._acquire_component(**kwargs)
+        _res = await _component.render_async()
+        cls._release_component(_component)
+        return _res
+
+    @classmethod
+    def stream(cls, **kwargs) -> Iterator[str]:
+        """
+        Render the component as a stream of HTML chunks.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            Iterator[str]: The rendered output of the component, chunk by chunk.
+        """
+        if cls._pooled != True:
+            return cls._make_component(**kwargs).stream()
+        return cls._stream_pooled(cls._acquire_component(**kwargs))
+
+    @classmethod
+    def _stream_pooled(cls, component : Component) -> Iterator[str]:
+        """
+        Stream a pooled component, releasing it once the stream is exhausted.
+        """
+        yield from component.stream()
+        cls._release_component(component)
+
+    @classmethod
+    def _stream_response(cls, chunks : Iterator[str]):
+        """
+        Abstract method to wrap a stream of HTML chunks in a streaming response.
+
+        Args:
+            chunks (Iterator[str]): The rendered output, chunk by chunk.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in a subclass.
+        """
+        raise NotImplementedError("Abstract; not implemented")
+
+    _stream_response = AbstractMethod(_stream_response)
+
+    @classmethod
+    def stream_response(cls, **kwargs):
+        """
+        Render the component as a streaming response.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            object: The web framework's streaming response.
+        """
+        return cls._stream_response(cls.stream(**kwargs))
+
+    @classmethod
+    def _get_request_header(cls, name : str) -> Optional[str]:
+        """
+        Abstract method to retrieve a header of the current request.
+
+        Args:
+            name (str): The header name, ex. `If-None-Match`.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in a subclass.
+        """
+        raise NotImplementedError("Abstract; not implemented")
+
+    _get_request_header = AbstractMethod(_get_request_header)
+
+    @classmethod
+    def _make_response(cls, body : Union[str, bytes], status : int, headers : dict):
+        """
+        Abstract method to build a response.
+
+        Args:
+            body (Union[str, bytes]): The rendered output (empty for `304 Not Modified`),
+                encoded as the `Content-Encoding` header says when given as bytes.
+            status (int): The HTTP status code.
+            headers (dict): The response headers.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in a subclass.
+        """
+        raise NotImplementedError("Abstract; not implemented")
+
+    _make_response = AbstractMethod(_make_response)
+
+    @classmethod
+    def render_conditional(cls, **kwargs):
+        """
+        Render the component as a response with an ETag, or answer `304 Not Modified`.
+
+        The ETag is computed from the component tree's Data and templates before anything
+        is rendered (see `HTMLComponent.process_tree`), so a client whose `If-None-Match`
+        matches costs no template render. Otherwise the tree is rendered from the same
+        Data, bypassing render caches so that the output matches the ETag. Components
+        without such an ETag (ex. ones that customize `render`) are rendered and tagged
+        with a digest of their output, which still saves sending it.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            object: The web framework's response.
+        """
+        return cls._render_conditional(kwargs, {})
+
+    @classmethod
+    def _render_conditional(cls, kwargs : dict, headers : dict):
+        """
+        Render the component as a response with an ETag, or answer `304 Not Modified`
+        (see `render_conditional`).
+
+        Args:
+            kwargs (dict): Keyword arguments to be passed to the component's inputs and subcomponents.
+            headers (dict): Other headers of the response.
+
+        Returns:
+            object: The web framework's response.
+        """
+        _component = cls._acquire_component(**kwargs)
+        _process_tree = getattr(_component, 'process_tree', None)
+        _tree = _process_tree() if _process_tree is not None else None
+        if _tree is None:
+            _res = _component.render()
+            _etag = make_etag(_res)
+        else:
+            _etag = _tree.get_etag()
+            _res = (None if etag_matches(cls._get_request_header("If-None-Match"), _etag)
+                    else _tree.render())
+        cls._release_component(_component)
+        return cls._make_conditional_response(_res, _etag, headers)
+
+    @classmethod
+    def _make_conditional_response(cls, body : Optional[str], etag : str, headers : dict):
+        """
+        Answer `304 Not Modified` if the request's `If-None-Match` matches the ETag, or
+        send the body with it.
+
+        Args:
+            body (Optional[str]): The rendered output; None if it was not rendered
+                because the ETag matches.
+            etag (str): The quoted ETag of the output.
+            headers (dict): Other headers of the response.
+
+        Returns:
+            object: The web framework's response.
+        """
+        _headers = {**headers, "ETag": etag}
+        if etag_matches(cls._get_request_header("If-None-Match"), etag):
+            return cls._make_response("", 304, _headers)
+        return cls._make_response(body, 200, _headers)
+
+    _compressed_cache : Optional[RenderCache] = None
+    _compress_min_size : int = 256
+
+    @classmethod
+    def render_compressed(cls, **kwargs):
+        """
+        Serve the cached, pre-compressed output the request's `Accept-Encoding` allows.
+
+        On a cache miss, the component is rendered and compressed once into every content
+        coding (see `CompressedBody`); hits are served without rendering or compressing.
+        Responses vary on `Accept-Encoding`. With `_etag`, they also carry the ETag of
+        their variant, and a matching `If-None-Match` is answered with `304 Not Modified`.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            object: The web framework's response.
+        """
+        _key = (cls, make_key(kwargs), make_key(cls._get_query_args()))
+        _body = cls._compressed_cache.get(_key)
+        if _body is None:
+            _component = cls._acquire_component(**kwargs)
+            _res = _component.render()
+            cls._release_component(_component)
+            _body = CompressedBody(_res, min_size = cls._compress_min_size)
+            cls._compressed_cache.set(_key, _body)
+        _encoding = choose_encoding(cls._get_request_header("Accept-Encoding"), _body.variants)
+        _headers = {"Vary": "Accept-Encoding"}
+        if _encoding != IDENTITY:
+            _headers["Content-Encoding"] = _encoding
+        if cls._etag == True:
+            _headers["ETag"] = _body.get_etag(_encoding)
+            if etag_matches(cls._get_request_header("If-None-Match"), _headers["ETag"]):
+                return cls._make_response("", 304, _headers)
+        return cls._make_response(_body.variants[_encoding], 200, _headers)
+
+    _htmx : bool = False
+    _fragments : dict[str, str] = {}
+    _fragment_param : str = "fragment"
+
+    @classmethod
+    def _get_request_arg(cls, name : str) -> Optional[str]:
+        """
+        Abstract method to retrieve a query parameter of the current request.
+
+        Args:
+            name (str): The parameter name.
+
+        Raises:
+            NotImplementedError: If the method is not implemented in a subclass.
+        """
+        raise NotImplementedError("Abstract; not implemented")
+
+    _get_request_arg = AbstractMethod(_get_request_arg)
+
+    @classmethod
+    def _get_fragment_path(cls) -> Optional[str]:
+        """
+        Retrieve the dotted subcomponent path the current request targets, if any.
+
+        The `_fragment_param` parameter takes precedence; otherwise HTMX requests
+        (`HX-Request: true`) target the element id in their `HX-Target` header. Ids are
+        mapped to paths with `_fragments`; ids it does not list target nothing.
+
+        Returns:
+            Optional[str]: The subcomponent path, or None for a whole page request.
+        """
+        _target = cls._get_request_arg(cls._fragment_param)
+        if not _target and cls._get_request_header("HX-Request") == "true":
+            _target = cls._get_request_header("HX-Target")
+        if not _target:
+            return None
+        return cls._fragments.get(_target)
+
+    @classmethod
+    def render_partial(cls, **kwargs):
+        """
+        Render only the region of the page the request targets, or the whole page.
+
+        The targeted subcomponent is rendered as it is in the whole page (see
+        `HTMLComponent.render_fragment`), without processing the data of the page or of
+        the other subcomponents. Requests that target nothing, a region `_fragments` does
+        not list, or a path that does not resolve, get the whole page. Responses vary on the HTMX headers.
+
+        With `_etag`, whole pages are served as by `render_conditional`, and fragments
+        carry a digest of their output as ETag, so a matching `If-None-Match` is answered
+        with `304 Not Modified`.
+
+        Args:
+            **kwargs: Keyword arguments to be passed to the component's inputs and subcomponents.
+
+        Returns:
+            object: The web framework's response.
+        """
+        _path = cls._get_fragment_path()
+        _headers = {"Vary": "HX-Request, HX-Target"}
+        if _path is None and cls._etag == True:
+            return cls._render_conditional(kwargs, _headers)
+        _component = cls._acquire_component(**kwargs)
+        _res = None
+        if _path is not None and hasattr(_component, 'render_fragment'):
+            _res = _component.render_fragment(_path)
+        if _res is None:
+            _res = _component.render()
+        cls._release_component(_component)
+        if cls._etag == True:
+            return cls._make_conditional_response(_res, make_etag(_res), _headers)
+        return cls._make_response(_res, 200, _headers)
 
     _as_response : bool = False
+    _as_async : bool = False
+    _stream : bool = False
+    _etag : bool = False
 
     ''' To be implemented. For cases where specific response rendering logic is needed.
     @classmethod
@@ -184,6 +658,26 @@ class View():
             cls._component_type is None):
             raise NotImplementedError("Abstract; not implemented")
 
+    @classmethod
+    def _check_response_options(cls):
+        """
+        Check that the view's response options can be served together.
+
+        Raises:
+            ValueError: If more than one of `_as_async`, `_stream`, `_htmx` and
+                `_compressed_cache` is set, or `_etag` is set with `_as_async` or `_stream`.
+        """
+        _options = [_name for _name, _enabled in (
+                        ("_as_async", cls._as_async == True),
+                        ("_stream", cls._stream == True),
+                        ("_htmx", cls._htmx == True),
+                        ("_compressed_cache", cls._compressed_cache is not None),
+                    ) if _enabled]
+        if cls._etag == True and _options and _options[0] in ("_as_async", "_stream"):
+            _options.append("_etag")
+        if len(_options) > 1:
+            raise ValueError(f"{cls.__qualname__} cannot combine {', '.join(_options)}.")
+
     @classmethod
     def add_to_app(cls, app : object):
         """
@@ -192,17 +686,32 @@ class View():
         This method validates the view's configuration and registers it with the
         web application using the `_add_to_app` method.
 
+        `_etag` combines with `_htmx` (see `render_partial`) and with `_compressed_cache`
+        (see `render_compressed`). The other response options are exclusive.
+
         Args:
             app (object): The web application instance.
 
         Raises:
             NotImplementedError: If the view's configuration is incomplete or invalid.
+            ValueError: If the view combines response options that are not supported together.
         """
         cls._check_if_implemented()
+        cls._check_response_options()
 
         view_func = cls.render
         if cls._as_response == True:
             view_func = cls.render_response
+        elif cls._as_async == True:
+            view_func = cls.render_async
+        elif cls._stream == True:
+            view_func = cls.stream_response
+        elif cls._htmx == True:
+            view_func = cls.render_partial
+        elif cls._compressed_cache is not None:
+            view_func = cls.render_compressed
+        elif cls._etag == True:
+            view_func = cls.render_conditional
 
         cls._add_to_app(app, view_func)
 